@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite voor de website generator
+Meet doorvoer en latency percentielen per scenario en vergelijkt met een baseline
+
+Alles draait offline: output gaat naar een DictSink (in-memory) of naar een
+tijdelijke directory op tmpfs (/dev/shm) als die beschikbaar is.
+
+    python benchmark.py                          # alle scenario's, vergelijk met baseline
+    python benchmark.py --scenarios single services --iterations 50
+    python benchmark.py --save-baseline          # huidige meting als nieuwe baseline
+
+Zonder baseline (of zonder baseline voor een gekozen scenario) is de exit code
+1, zodat een CI job niet ongemerkt niets vergelijkt. --allow-missing-baseline
+maakt daar een waarschuwing van, bijvoorbeeld voor de eerste run op een nieuwe
+machine.
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+
+from final_python_generator import CompleteWebsiteGenerator, DictSink, run_batch
+
+BASELINE_FILE = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+SCENARIOS = ['single', 'batch-1', 'batch-100', 'batch-1000', 'services', 'regenerate']
+DEFAULT_THRESHOLD = 20.0
+SERVICE_COUNT = 10000
+
+def scratch_dir():
+    """Tijdelijke directory, bij voorkeur op tmpfs zodat disk I/O niet meetelt"""
+    shm = Path('/dev/shm')
+    return tempfile.mkdtemp(prefix='generator-bench-', dir=shm if shm.is_dir() else None)
+
+def percentile(samples, pct):
+    """Nearest-rank percentiel van een lijst metingen"""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def summarize(samples, units, unit):
+    """Latency percentielen (ms) en doorvoer (units per seconde)"""
+    total = sum(samples)
+    return {
+        'iterations': len(samples),
+        'unit': unit,
+        'throughput': round(units / total, 2) if total else None,
+        'mean_ms': round(total / len(samples) * 1000, 3),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p90_ms': round(percentile(samples, 90) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+def timed(function, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def bench_single(root, iterations):
+    """Eén complete site genereren naar een in-memory sink"""
+    def run():
+        generator = CompleteWebsiteGenerator('bench-site', root)
+        generator.run_generator(DictSink())
+    run()  # warm-up: template cache en imports
+    samples = timed(run, iterations)
+    return summarize(samples, len(samples), 'sites')
+
+def bench_batch(root, size):
+    """Fleet mode over een manifest met `size` sites (process pool, tmpfs output)"""
+    manifest = Path(root) / f'manifest-{size}.jsonl'
+    with open(manifest, 'w', encoding='utf-8') as f:
+        for i in range(size):
+            f.write(json.dumps({'name': f'site-{i:04d}', 'business_name': f'Bedrijf {i}',
+                                'git': 'skip'}) + '\n')
+    started = time.perf_counter()
+    results = run_batch(manifest, Path(root) / f'batch-{size}')
+    elapsed = time.perf_counter() - started
+    failed = [r for r in results if r['status'] != 'ok']
+    if failed:
+        raise RuntimeError(f"{len(failed)} sites mislukt, o.a. {failed[0]['name']}: {failed[0]['error']}")
+    stats = summarize([r['duration'] for r in results], size, 'sites')
+    # Doorvoer over de wall clock van de hele batch, niet de som per site
+    stats['throughput'] = round(size / elapsed, 2)
+    return stats
+
+def bench_services(root, iterations):
+    """generate_service_cards met een grote diensten lijst"""
+    generator = CompleteWebsiteGenerator('bench-services', root)
+    generator.config['services'] = [f'Dienst {i}' for i in range(SERVICE_COUNT)]
+    generator.generate_service_cards()
+    samples = timed(generator.generate_service_cards, iterations)
+    return summarize(samples, SERVICE_COUNT * len(samples), 'cards')
+
+def bench_regenerate(root, iterations):
+    """Opnieuw genereren zonder wijzigingen (incrementele fast path)"""
+    base_path = Path(root) / 'regenerate'
+    def run():
+        generator = CompleteWebsiteGenerator('bench-site', base_path)
+        generator.config['git'] = 'skip'
+        generator.run_generator()
+    run()
+    samples = timed(run, iterations)
+    return summarize(samples, len(samples), 'sites')
+
+def run_scenario(name, root, iterations):
+    if name == 'single':
+        return bench_single(root, iterations)
+    if name.startswith('batch-'):
+        return bench_batch(root, int(name.split('-', 1)[1]))
+    if name == 'services':
+        return bench_services(root, iterations)
+    if name == 'regenerate':
+        return bench_regenerate(root, iterations)
+    raise ValueError(f"onbekend scenario: {name}")
+
+def compare(results, baseline, threshold):
+    """Lijst regressies: p50 latency omhoog of doorvoer omlaag met meer dan threshold %"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        limit = 1 + threshold / 100
+        if previous['p50_ms'] and current['p50_ms'] > previous['p50_ms'] * limit:
+            regressions.append(f"{name}: p50 {previous['p50_ms']} -> {current['p50_ms']} ms")
+        if previous['throughput'] and current['throughput'] < previous['throughput'] / limit:
+            regressions.append(f"{name}: doorvoer {previous['throughput']} -> "
+                               f"{current['throughput']} {current['unit']}/s")
+    return regressions
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Benchmarks voor de website generator')
+    parser.add_argument('--scenarios', nargs='*', default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument('--iterations', type=int, default=20, help='Herhalingen per niet-batch scenario')
+    parser.add_argument('--baseline', default=str(BASELINE_FILE), help='Baseline JSON bestand')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Toegestane verslechtering in procenten')
+    parser.add_argument('--save-baseline', action='store_true', help='Sla deze meting op als baseline')
+    parser.add_argument('--allow-missing-baseline', action='store_true',
+                        help='Ontbrekende baseline is geen fout (exit 0)')
+    parser.add_argument('--json', metavar='PATH', help='Schrijf de resultaten ook als JSON')
+    args = parser.parse_args()
+    
+    root = scratch_dir()
+    results = {}
+    try:
+        for name in args.scenarios:
+            # Voortgang van de generator zelf onderdrukken
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = run_scenario(name, root, args.iterations)
+            stats = results[name]
+            print(f"   {name:12} {stats['throughput']:>10} {stats['unit']}/s  "
+                  f"p50 {stats['p50_ms']:9.3f} ms  p90 {stats['p90_ms']:9.3f} ms  "
+                  f"p99 {stats['p99_ms']:9.3f} ms  ({stats['iterations']}x)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+    
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else {}
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+        print(f"\n💾 Baseline opgeslagen in {baseline_path}")
+        return
+    
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else {}
+    missing = [name for name in results if not baseline.get(name)]
+    if missing:
+        marker = 'ℹ️ ' if args.allow_missing_baseline else '❌'
+        print(f"\n{marker} Geen baseline voor {', '.join(missing)} ({baseline_path}); draai met --save-baseline")
+        if not args.allow_missing_baseline:
+            sys.exit(1)
+    
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ Regressies boven {args.threshold:g}%:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print(f"\n✅ Geen regressies boven {args.threshold:g}%")
+
+if __name__ == "__main__":
+    main()
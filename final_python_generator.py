@@ -6,58 +6,3355 @@ Gebaseerd op bewezen base files met VS Code + Git + Netlify integratie
 """
 
 import os
+import io
+import re
+import csv
 import json
+import time
+import html
 import shutil
+import hashlib
+import gzip
+import zlib
+import struct
+import fnmatch
+import sqlite3
+import tarfile
+import tempfile
+import itertools
+import unicodedata
+import zipfile
+import contextlib
+import functools
+import importlib
+import posixpath
+import cProfile
+import pprint
+import tracemalloc
+import threading
+import multiprocessing
+from html.parser import HTMLParser
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from xml.sax.saxutils import escape as xml_escape
 from pathlib import Path
-from datetime import datetime
-import subprocess
+from urllib.parse import unquote
+from datetime import datetime, timezone
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import sys
 
+try:
+    from PIL import Image
+except ImportError:  # optioneel: zonder Pillow wordt de image pipeline overgeslagen
+    Image = None
+
+try:
+    from fontTools import subset as font_subset
+    from fontTools.ttLib import TTFont
+except ImportError:  # optioneel: zonder fontTools worden alleen .woff2 bronnen (ongesubset) gebruikt
+    font_subset = TTFont = None
+
+try:
+    import brotli
+except ImportError:  # optioneel: zonder brotli alleen .gz precompressie
+    brotli = None
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: netlify.toml wordt dan niet gecontroleerd
+    tomllib = None
+
+try:
+    import resource
+except ImportError:  # niet beschikbaar op Windows: max_rss blijft dan leeg
+    resource = None
+
+# Verhoog bij wijzigingen in de render logica: invalideert alle incrementele builds
+TEMPLATE_VERSION = '19'
+
+# Standaard templates; een theme directory kan elk bestand hieruit overschrijven
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+
+# Bestanden in het zoekpad die als template meetellen (plus namen zonder extensie,
+# zoals gitignore en htaccess); caches zoals __pycache__ en dotfiles nooit
+TEMPLATE_EXTENSIONS = ('.html', '.css', '.js', '.mjs', '.py', '.txt', '.md', '.toml', '.conf', '.json', '.xml')
+
+# Filters bruikbaar als {{ naam|filter }}
+TEMPLATE_FILTERS = {
+    'lower': str.lower,
+    'upper': str.upper,
+    'escape': html.escape,
+}
+
+# Hash manifest voor incrementele regeneratie (relatief aan project_path)
+BUILD_MANIFEST = '.generator-manifest.json'
+
+# Manifest kolommen die een andere naam hebben dan de config sleutel
+MANIFEST_ALIASES = {
+    'ga': 'ga_tracking_id',
+    'ga_id': 'ga_tracking_id',
+    'gtm': 'gtm_id',
+    'analytics': 'analytics_mode',
+    'business': 'business_name',
+}
+
+class CompiledTemplate:
+    """Template opgesplitst in literals en {{ placeholders }}, eenmalig geparsed"""
+    
+    PLACEHOLDER = re.compile(r'\{\{\s*(.+?)\s*\}\}')
+    
+    def __init__(self, name, source):
+        self.name = name
+        self.digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        self.parts = []
+        position = 0
+        for match in self.PLACEHOLDER.finditer(source):
+            self.parts.append(source[position:match.start()])
+            expression, *filters = [p.strip() for p in match.group(1).split('|')]
+            for f in filters:
+                if f not in TEMPLATE_FILTERS:
+                    raise ValueError(f"Onbekend filter '{f}' in template {name}")
+            self.parts.append((expression.split('.'), [TEMPLATE_FILTERS[f] for f in filters]))
+            position = match.end()
+        self.parts.append(source[position:])
+    
+    def render(self, context):
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            path, filters = part
+            value = context[path[0]]
+            for key in path[1:]:
+                value = value[key] if isinstance(value, dict) else getattr(value, key)
+            value = str(value)
+            for f in filters:
+                value = f(value)
+            out.append(value)
+        return ''.join(out)
+
+# Gecompileerde templates per absoluut pad, gedeeld door alle projecten in dit proces
+_COMPILED_TEMPLATES = {}
+_REGISTRIES = {}
+
+class TemplateRegistry:
+    """Zoekt templates op (theme eerst), compileert ze één keer en meet render tijd"""
+    
+    def __init__(self, theme_dir=None):
+        self.search_path = [Path(theme_dir)] if theme_dir else []
+        self.search_path.append(TEMPLATE_DIR)
+        self.resolved = {}
+        self.stats = {}
+        # Stappen renderen parallel (StepScheduler)
+        self.stats_lock = threading.Lock()
+    
+    def resolve(self, name):
+        if name not in self.resolved:
+            for directory in self.search_path:
+                candidate = directory / name
+                if candidate.is_file():
+                    self.resolved[name] = candidate.resolve()
+                    break
+            else:
+                raise FileNotFoundError(f"Template '{name}' niet gevonden in {self.search_path}")
+        return self.resolved[name]
+    
+    def get(self, name):
+        path = self.resolve(name)
+        compiled = _COMPILED_TEMPLATES.get(path)
+        if compiled is None:
+            try:
+                source = path.read_text(encoding='utf-8', errors='strict')
+            except UnicodeDecodeError as e:
+                raise ValueError(f"Template '{name}' ({path}) is geen UTF-8 tekst: {e}") from None
+            compiled = CompiledTemplate(name, source)
+            _COMPILED_TEMPLATES[path] = compiled
+        return compiled
+    
+    def render(self, name, context):
+        template = self.get(name)
+        started = time.perf_counter()
+        result = template.render(context)
+        elapsed = time.perf_counter() - started
+        with self.stats_lock:
+            stats = self.stats.setdefault(name, {'renders': 0, 'seconds': 0.0})
+            stats['renders'] += 1
+            stats['seconds'] += elapsed
+        return result
+    
+    def fingerprint(self, names):
+        """Hash over de bronnen van de gegeven templates (voor incrementele builds)"""
+        digest = hashlib.sha256()
+        for name in sorted(names):
+            digest.update(name.encode('utf-8'))
+            digest.update(self.get(name).digest.encode('ascii'))
+        return digest.hexdigest()
+    
+    def invalidate(self, paths=()):
+        """Vergeet gecompileerde versies van gewijzigde bestanden (watch mode)"""
+        for path in paths:
+            _COMPILED_TEMPLATES.pop(Path(path).resolve(), None)
+        # Een nieuw theme bestand kan een standaard template gaan overschrijven
+        self.resolved.clear()
+    
+    def template_name(self, path):
+        """Template naam van een bestand in het zoekpad (None als het er buiten valt)"""
+        path = Path(path).resolve()
+        for directory in self.search_path:
+            try:
+                return path.relative_to(directory.resolve()).as_posix()
+            except ValueError:
+                continue
+        return None
+    
+    def template_names(self):
+        """Alle beschikbare template namen (theme + standaard)"""
+        names = set()
+        for directory in self.search_path:
+            if directory.is_dir():
+                names.update(p.relative_to(directory).as_posix()
+                             for p in directory.rglob('*') if is_template_file(p, directory))
+        return names
+
+def is_template_file(path, directory):
+    """Echte template bronnen: geen __pycache__, dotfiles of andere extensies"""
+    parts = path.relative_to(directory).parts
+    if any(part.startswith('.') or part == '__pycache__' for part in parts):
+        return False
+    return path.is_file() and (path.suffix in TEMPLATE_EXTENSIONS or not path.suffix)
+
+def get_template_registry(theme_dir=None):
+    """Eén registry per theme directory per proces"""
+    key = str(Path(theme_dir).resolve()) if theme_dir else None
+    if key not in _REGISTRIES:
+        _REGISTRIES[key] = TemplateRegistry(theme_dir)
+    return _REGISTRIES[key]
+
+# Lengte van de content hash in asset bestandsnamen (main.3f9a1c2b.css)
+ASSET_HASH_LENGTH = 8
+
+# Bestanden waarin verwijzingen naar gehashte assets worden herschreven
+REWRITE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.webmanifest', '.xml', '.txt')
+
+# Na deze tekens kan een '/' in JavaScript alleen een regex literal openen
+JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of',
+                     'void', 'yield', 'delete', 'throw', 'new', 'await'}
+
+def _is_word_char(char):
+    return char.isalnum() or char in '_$'
+
+def _skip_quoted(source, i):
+    """Geeft de index direct na de string die op source[i] begint"""
+    quote = source[i]
+    i += 1
+    while i < len(source):
+        if source[i] == '\\':
+            i += 2
+            continue
+        if source[i] == quote:
+            return i + 1
+        if quote == '`' and source.startswith('${', i):
+            i = _skip_js_expression(source, i + 2)
+            continue
+        i += 1
+    return i
+
+def _skip_js_expression(source, i):
+    """Slaat een ${...} expressie in een template literal over, inclusief nesting"""
+    depth = 1
+    while i < len(source) and depth:
+        char = source[i]
+        if char in '"\'`':
+            i = _skip_quoted(source, i)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        i += 1
+    return i
+
+def minify_css(source):
+    """Verwijdert commentaar en overbodige whitespace uit CSS"""
+    out = []
+    i = 0
+    n = len(source)
+    while i < n:
+        char = source[i]
+        if char in '"\'':
+            end = _skip_quoted(source, i)
+            out.append(source[i:end])
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif char.isspace():
+            while i < n and source[i].isspace():
+                i += 1
+            previous = out[-1][-1:] if out else ''
+            following = source[i:i + 1]
+            if previous and previous not in '{};:,>' and following not in '{};,>':
+                out.append(' ')
+        else:
+            if char == '}' and out and out[-1] == ';':
+                out.pop()
+            out.append(char)
+            i += 1
+    return ''.join(out).strip()
+
+def minify_js(source):
+    """Verwijdert commentaar en inspringing uit JavaScript
+    
+    Conservatief: newlines blijven staan zodat automatic semicolon
+    insertion ongewijzigd werkt. Strings, template literals en regex
+    literals worden ongewijzigd overgenomen.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    last_word = ''
+    
+    def last_chars(count=1):
+        # Laatste tekens vóór de huidige positie; whitespace ertussen breekt de reeks
+        tail = ''
+        for chunk in reversed(out):
+            if chunk.isspace():
+                if tail:
+                    break
+                continue
+            tail = chunk + tail
+            if len(tail) >= count:
+                break
+        return tail[-count:]
+    
+    while i < n:
+        char = source[i]
+        if char in '"\'`':
+            end = _skip_quoted(source, i)
+            out.append(source[i:end])
+            i = end
+            last_word = ''
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            comment = source[i:n if end == -1 else end + 2]
+            i = n if end == -1 else end + 2
+            if '\n' in comment:
+                out.append('\n')
+        # Na een postfix ++/-- (i++ / 2) is een / een deling, geen regex literal
+        elif char == '/' and (last_chars() in JS_REGEX_PRECEDERS or last_chars() == ''
+                              or last_word in JS_REGEX_KEYWORDS) and last_chars(2) not in ('++', '--'):
+            j = i + 1
+            in_class = False
+            while j < n and source[j] != '\n':
+                if source[j] == '\\':
+                    j += 2
+                    continue
+                if source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                elif source[j] == '/' and not in_class:
+                    break
+                j += 1
+            j += 1
+            while j < n and _is_word_char(source[j]):
+                j += 1
+            out.append(source[i:j])
+            i = j
+            last_word = ''
+        elif char.isspace():
+            start = i
+            while i < n and source[i].isspace():
+                i += 1
+            previous = out[-1][-1] if out else ''
+            following = source[i:i + 1]
+            if '\n' in source[start:i]:
+                if previous and previous != '\n':
+                    out.append('\n')
+            elif (_is_word_char(previous) and _is_word_char(following)) or \
+                    (previous in '+-' and following == previous):
+                out.append(' ')
+        else:
+            if _is_word_char(char):
+                j = i
+                while j < n and _is_word_char(source[j]):
+                    j += 1
+                last_word = source[i:j]
+                out.append(last_word)
+                i = j
+            else:
+                out.append(char)
+                last_word = ''
+                i += 1
+    
+    lines = ''.join(out).split('\n')
+    return '\n'.join(line.strip() for line in lines if line.strip()) + '\n'
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+# Whitespace rond deze elementen is zichtbaar en blijft (ingekort tot één spatie) staan
+INLINE_ELEMENTS = {'a', 'abbr', 'b', 'bdi', 'bdo', 'br', 'button', 'cite', 'code', 'data', 'dfn',
+                   'em', 'i', 'img', 'input', 'kbd', 'label', 'mark', 'output', 'picture', 'q',
+                   's', 'samp', 'select', 'small', 'span', 'strong', 'sub', 'sup', 'svg',
+                   'textarea', 'time', 'u', 'var', 'wbr'}
+
+BOOLEAN_ATTRIBUTES = {'allowfullscreen', 'async', 'autofocus', 'autoplay', 'checked', 'controls',
+                      'default', 'defer', 'disabled', 'formnovalidate', 'hidden', 'inert', 'ismap',
+                      'itemscope', 'loop', 'multiple', 'muted', 'nomodule', 'novalidate', 'open',
+                      'playsinline', 'readonly', 'required', 'reversed', 'selected'}
+
+# Script types die JavaScript bevatten resp. JSON (ld+json, speculationrules, importmap)
+JS_SCRIPT_TYPES = {'', 'text/javascript', 'application/javascript', 'module', 'text/partytown'}
+JSON_SCRIPT_TYPES = {'application/json', 'application/ld+json', 'speculationrules', 'importmap'}
+
+_QUOTED_TAG = r'(?:"[^"]*"|\'[^\']*\'|[^>"\'])*'
+HTML_TOKEN = re.compile(r'<!--.*?-->|<(pre|textarea|script|style)\b' + _QUOTED_TAG + r'>.*?</\1\s*>'
+                        r'|</?[a-zA-Z!]' + _QUOTED_TAG + '>', re.S | re.I)
+TAG_NAME = re.compile(r'</?([a-zA-Z][\w-]*)')
+OPEN_TAG = re.compile('<' + _QUOTED_TAG + '>')
+TAG_ATTRIBUTE = re.compile(r'([^\s=/>]+)(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+))?')
+
+def _minify_tag(tag):
+    """Whitespace tussen attributen inkorten en boolean attributen zonder waarde"""
+    match = TAG_NAME.match(tag)
+    if not match or tag.startswith('</'):
+        return re.sub(r'\s+', ' ', tag).replace(' >', '>')
+    rest = tag[match.end():-1]
+    parts = [match.group(0)]
+    for attribute in TAG_ATTRIBUTE.finditer(rest):
+        name, value = attribute.groups()
+        if value is not None and name.lower() in BOOLEAN_ATTRIBUTES \
+                and value.strip('"\'').lower() in ('', name.lower()):
+            value = None
+        parts.append(f" {name}" if value is None else f" {name}={value}")
+    return ''.join(parts) + ('/>' if rest.rstrip().endswith('/') else '>')
+
+@functools.lru_cache(maxsize=256)
+def _minify_raw_text(name, tag, content):
+    """Inhoud van script/style minificeren; pre en textarea blijven letterlijk
+    
+    Gecached: dezelfde inline scripts (analytics, Web Vitals) staan op elke pagina.
+    """
+    name = name.lower()
+    if name == 'style':
+        content = minify_css(content)
+    elif name == 'script':
+        script_type = (re.search(r'\btype=["\']?([^"\'\s>]*)', tag) or [None, ''])[1].lower()
+        if script_type in JS_SCRIPT_TYPES and content.strip():
+            content = minify_js(content).strip()
+        elif script_type in JSON_SCRIPT_TYPES:
+            try:
+                content = json.dumps(json.loads(content), separators=(',', ':'), ensure_ascii=False)
+            except ValueError:
+                pass
+    return content
+
+def minify_html(document):
+    """Verwijdert commentaar en overbodige whitespace uit HTML
+    
+    Inhoud van <pre> en <textarea> blijft letterlijk staan, inline <script>
+    en <style> gaan door minify_js/minify_css. Whitespace naast inline
+    elementen wordt één spatie, tussen block elementen verdwijnt hij.
+    Conditional comments (<!--[if ...]>) blijven staan.
+    """
+    pieces = []  # (tag naam of None voor tekst, inhoud)
+    position = 0
+    for match in HTML_TOKEN.finditer(document):
+        if match.start() > position:
+            pieces.append((None, document[position:match.start()]))
+        position = match.end()
+        token = match.group(0)
+        if token.startswith('<!--'):
+            if token.startswith('<!--[if'):
+                pieces.append(('!', token))
+            continue
+        if match.group(1):
+            name = match.group(1)
+            tag = OPEN_TAG.match(token).group(0)
+            content = _minify_raw_text(name, tag, token[len(tag):token.rindex('</')])
+            pieces.append((name.lower(), f"{_minify_tag(tag)}{content}</{name}>"))
+            continue
+        name = TAG_NAME.match(token)
+        pieces.append((name.group(1).lower() if name else '!', _minify_tag(token)))
+    if position < len(document):
+        pieces.append((None, document[position:]))
+    
+    # Aangrenzende tekst (na het weglaten van commentaar) samenvoegen
+    merged = []
+    for piece in pieces:
+        if piece[0] is None and merged and merged[-1][0] is None:
+            merged[-1] = (None, merged[-1][1] + piece[1])
+        else:
+            merged.append(piece)
+    
+    out = []
+    for i, (name, content) in enumerate(merged):
+        if name is not None:
+            out.append(content)
+            continue
+        before = merged[i - 1][0] if i else None
+        after = merged[i + 1][0] if i + 1 < len(merged) else None
+        text = re.sub(r'\s+', ' ', content)
+        if before not in INLINE_ELEMENTS:
+            text = text.lstrip()
+        if after not in INLINE_ELEMENTS:
+            text = text.rstrip()
+        out.append(text)
+    return ''.join(out)
+
+# Inline <style> blokken die op meerdere pagina's staan gaan naar één gecachte stylesheet
+STYLE_BLOCK = re.compile(r'<style>(.*?)</style>', re.S | re.I)
+SHARED_STYLESHEET = 'assets/css/shared.css'
+
+def shared_style_blocks(documents, min_pages=2):
+    """Geminificeerde <style> inhoud die in minstens min_pages documenten voorkomt"""
+    counts = Counter()
+    for document in documents:
+        counts.update({minify_css(css) for css in STYLE_BLOCK.findall(document)})
+    return [css for css, count in counts.items() if count >= min_pages and css]
+
+def extract_shared_styles(document, shared, href='/' + SHARED_STYLESHEET):
+    """Vervangt gedeelde <style> blokken door één link naar de gedeelde stylesheet"""
+    linked = False
+    
+    def replace(match):
+        nonlocal linked
+        if minify_css(match.group(1)) not in shared:
+            return match.group(0)
+        if linked:
+            return ''
+        linked = True
+        return f'<link rel="stylesheet" href="{href}">'
+    
+    return STYLE_BLOCK.sub(replace, document) if shared else document
+
+class HtmlTag:
+    """Start tag in de transform pipeline
+    
+    Attributen staan (ongequote, in volgorde) in attrs; alleen een gewijzigde
+    tag wordt opnieuw geserialiseerd, de rest blijft byte voor byte gelijk.
+    """
+    
+    __slots__ = ('name', 'attrs', 'source', 'self_closing', 'dirty')
+    
+    def __init__(self, source):
+        self.source = source
+        match = TAG_NAME.match(source)
+        self.name = match.group(1).lower()
+        rest = source[match.end():-1]
+        self.self_closing = rest.rstrip().endswith('/')
+        self.attrs = {}
+        for attribute in TAG_ATTRIBUTE.finditer(rest):
+            name, value = attribute.groups()
+            if value is not None and value[:1] in '"\'':
+                value = value[1:-1]
+            self.attrs.setdefault(name.lower(), None if value is None else html.unescape(value))
+        self.dirty = False
+    
+    def get(self, name, default=None):
+        value = self.attrs.get(name, default)
+        return default if value is None else value
+    
+    def set(self, name, value=None):
+        if name not in self.attrs or self.attrs[name] != value:
+            self.attrs[name] = value
+            self.dirty = True
+    
+    def add_token(self, name, token):
+        """Voegt een token toe aan een lijst attribuut als rel of class"""
+        tokens = self.get(name, '').split()
+        if token not in tokens:
+            self.set(name, ' '.join(tokens + [token]))
+    
+    def classes(self):
+        return self.get('class', '').split()
+    
+    def __str__(self):
+        if not self.dirty:
+            return self.source
+        attributes = ''.join(f" {name}" if value is None else f' {name}="{html.escape(value)}"'
+                             for name, value in self.attrs.items())
+        return f"<{self.name}{attributes}{'/' if self.self_closing else ''}>"
+
+class HtmlTransform:
+    """Basis voor een transform in de HTML pipeline (zie transform_html)
+    
+    Per pagina een nieuwe instantie met context {page, config, first_party}.
+    start_tag mag de tag wijzigen; stack bevat de open voorouder tags.
+    """
+    
+    def __init__(self, context):
+        self.context = context
+        self.config = context.get('config', {})
+    
+    def start_tag(self, tag, stack):
+        pass
+    
+    def end_tag(self, name, stack):
+        pass
+
+# Naam -> transform klasse; plugins registreren zich met @html_transform('naam')
+# of worden in config['html_transforms'] als 'module:Klasse' opgegeven
+HTML_TRANSFORMS = {}
+
+def html_transform(name):
+    def register(cls):
+        HTML_TRANSFORMS[name] = cls
+        return cls
+    return register
+
+def resolve_transform(name):
+    if name in HTML_TRANSFORMS:
+        return HTML_TRANSFORMS[name]
+    module, _, attribute = name.partition(':')
+    if not attribute:
+        raise ValueError(f"Onbekende HTML transform '{name}', kies uit {', '.join(HTML_TRANSFORMS)} "
+                         f"of geef 'module:Klasse'")
+    return getattr(importlib.import_module(module), attribute)
+
+# Elementen met een optionele eind tag: naam -> (groep, grenzen). Een nieuwe tag
+# uit IMPLIED_END_TAGS sluit het bovenste open element uit de groep (en alles
+# daarboven), maar zoekt niet voorbij een grens element, net als de HTML parser
+_SCOPE = frozenset({'html', 'template', 'table', 'td', 'th', 'caption'})
+OPTIONAL_END_TAGS = {
+    'p': ({'p'}, _SCOPE | {'button'}),
+    'li': ({'li'}, _SCOPE | {'ul', 'ol', 'menu'}),
+    'dt': ({'dt', 'dd'}, _SCOPE | {'dl'}),
+    'dd': ({'dt', 'dd'}, _SCOPE | {'dl'}),
+    'option': ({'option'}, {'select', 'datalist', 'optgroup'}),
+    'optgroup': ({'optgroup'}, {'select'}),
+    'tr': ({'tr'}, {'table', 'thead', 'tbody', 'tfoot'}),
+    'td': ({'td', 'th'}, {'tr', 'table'}),
+    'th': ({'td', 'th'}, {'tr', 'table'}),
+    'tbody': ({'thead', 'tbody', 'tfoot'}, {'table'}),
+}
+
+# Block tags die een open <p> sluiten
+P_CLOSING_TAGS = {'address', 'article', 'aside', 'blockquote', 'details', 'dialog', 'div',
+                  'dl', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+                  'h4', 'h5', 'h6', 'header', 'hgroup', 'hr', 'main', 'menu', 'nav', 'ol', 'p',
+                  'pre', 'search', 'section', 'summary', 'table', 'ul'}
+
+# Start tag -> groepen uit OPTIONAL_END_TAGS die hij impliciet sluit
+IMPLIED_END_TAGS = dict.fromkeys(P_CLOSING_TAGS, ('p',))
+IMPLIED_END_TAGS.update({
+    'li': ('li', 'p'), 'dt': ('dt', 'p'), 'dd': ('dd', 'p'),
+    'option': ('option',), 'optgroup': ('option', 'optgroup'),
+    'tr': ('tr',), 'td': ('td',), 'th': ('th',),
+    'thead': ('tbody',), 'tbody': ('tbody',), 'tfoot': ('tbody',),
+})
+
+def _open_element_depth(stack, names, boundaries=()):
+    """Positie van het bovenste open element uit names, of None als een grens eerst komt"""
+    for depth in range(len(stack) - 1, -1, -1):
+        if stack[depth].name in names:
+            return depth
+        if stack[depth].name in boundaries:
+            return None
+    return None
+
+def transform_html(document, transforms):
+    """Eén lineaire pass over het document langs alle transforms
+    
+    Elke tag wordt één keer getokenized en gaat dan door de hele keten;
+    inhoud van script/style/pre/textarea en commentaar blijft onaangeroerd.
+    Optionele eind tags (p, li, dt/dd, option, tabel cellen) worden impliciet
+    gesloten, zodat de stack de echte nesting volgt; een eind tag zonder open
+    element wordt genegeerd.
+    """
+    if not transforms:
+        return document
+    out = []
+    stack = []
+    position = 0
+    for match in HTML_TOKEN.finditer(document):
+        out.append(document[position:match.start()])
+        position = match.end()
+        token = match.group(0)
+        if token.startswith('<!'):
+            out.append(token)
+            continue
+        if token.startswith('</'):
+            name = TAG_NAME.match(token).group(1).lower()
+            for transform in transforms:
+                transform.end_tag(name, stack)
+            # Tot en met de open tag sluiten, inclusief impliciet open gebleven kinderen
+            depth = _open_element_depth(stack, {name}, OPTIONAL_END_TAGS.get(name, ((), ()))[1])
+            if depth is not None:
+                del stack[depth:]
+            out.append(token)
+            continue
+        opening = OPEN_TAG.match(token).group(0) if match.group(1) else token
+        tag = HtmlTag(opening)
+        for group in IMPLIED_END_TAGS.get(tag.name, ()):
+            depth = _open_element_depth(stack, *OPTIONAL_END_TAGS[group])
+            if depth is not None:
+                for transform in transforms:
+                    transform.end_tag(stack[depth].name, stack)
+                del stack[depth:]
+        for transform in transforms:
+            transform.start_tag(tag, stack)
+        out.append(str(tag))
+        if match.group(1):
+            out.append(token[len(opening):])
+            for transform in transforms:
+                transform.end_tag(tag.name, stack)
+        elif tag.name not in VOID_ELEMENTS and not tag.self_closing:
+            stack.append(tag)
+    out.append(document[position:])
+    return ''.join(out)
+
+def matches_root(tag, roots):
+    """Matcht de tag één van de (enkelvoudige) selectors 'tag', '.class' of '#id'?"""
+    return any(root == tag.name or (root[:1] == '.' and root[1:] in tag.classes())
+               or (root[:1] == '#' and root[1:] == tag.get('id')) for root in roots)
+
+class PageTokens(HtmlTransform):
+    """Verzamelt tags, .classes en #ids tijdens de pass (voor CSS snoeien en critical CSS)
+    
+    Zelfde resultaat als collect_html_tokens(html) en collect_html_tokens(html, roots),
+    zonder de pagina nog twee keer te parsen.
+    """
+    
+    def __init__(self, context):
+        super().__init__(context)
+        self.roots = self.config.get('critical_selectors', CRITICAL_SELECTORS)
+        self.tokens = set(DOCUMENT_TOKENS)
+        self.critical = set(DOCUMENT_TOKENS)
+    
+    def start_tag(self, tag, stack):
+        tokens = {tag.name, *(f".{c}" for c in tag.classes())}
+        if tag.get('id'):
+            tokens.add(f"#{tag.get('id')}")
+        self.tokens |= tokens
+        if matches_root(tag, self.roots) or any(matches_root(parent, self.roots) for parent in stack):
+            self.critical |= tokens
+
+@html_transform('lazy-images')
+class LazyImages(HtmlTransform):
+    """loading="lazy" en decoding="async" voor afbeeldingen en iframes onder de vouw
+    
+    Boven de vouw blijven: de eerste config['eager_images'] (standaard 1)
+    afbeeldingen, alles binnen een critical selector (header, .hero, .nav)
+    en afbeeldingen met fetchpriority.
+    """
+    
+    def __init__(self, context):
+        super().__init__(context)
+        self.eager = int(self.config.get('eager_images', 1))
+        self.roots = self.config.get('critical_selectors', CRITICAL_SELECTORS)
+    
+    def start_tag(self, tag, stack):
+        if tag.name == 'iframe' and 'loading' not in tag.attrs:
+            tag.set('loading', 'lazy')
+        if tag.name != 'img':
+            return
+        if self.eager > 0 or tag.get('fetchpriority') or any(matches_root(parent, self.roots)
+                                                             for parent in stack):
+            self.eager -= 1
+            return
+        if 'loading' not in tag.attrs:
+            tag.set('loading', 'lazy')
+        if 'decoding' not in tag.attrs:
+            tag.set('decoding', 'async')
+
+# Klassieke first-party scripts onder dit pad krijgen defer
+DEFER_SCRIPT_PREFIX = '/assets/js/'
+
+@html_transform('defer-scripts')
+class DeferScripts(HtmlTransform):
+    """defer op first-party scripts zonder async/defer/module: parsen gaat door, volgorde blijft"""
+    
+    def start_tag(self, tag, stack):
+        if tag.name != 'script' or not tag.get('src', '').startswith(DEFER_SCRIPT_PREFIX):
+            return
+        if tag.get('type', '') not in ('', 'text/javascript', 'application/javascript'):
+            return
+        if 'async' not in tag.attrs and 'defer' not in tag.attrs:
+            tag.set('defer')
+
+@html_transform('safe-links')
+class SafeLinks(HtmlTransform):
+    """rel="noopener" op links met target=_blank of naar een andere origin"""
+    
+    def start_tag(self, tag, stack):
+        if tag.name not in ('a', 'area') or not tag.get('href'):
+            return
+        origin = url_origin(tag.get('href'))
+        external = origin is not None and origin not in self.context.get('first_party', ())
+        if external or tag.get('target') == '_blank':
+            tag.add_token('rel', 'noopener')
+
+DEFAULT_HTML_TRANSFORMS = ['lazy-images', 'defer-scripts', 'safe-links']
+
+def content_hash(data, length=ASSET_HASH_LENGTH):
+    return hashlib.sha256(data).hexdigest()[:length]
+
+def hashed_name(path, data):
+    """assets/css/main.css -> assets/css/main.<hash>.css"""
+    stem, dot, extension = path.rpartition('.')
+    return f"{stem}.{content_hash(data)}.{extension}"
+
+def rewrite_references(text, asset_map):
+    """Vervangt verwijzingen naar originele assets door hun gehashte naam
+    
+    Matcht zowel absolute (/assets/...) als relatieve (assets/...) paden
+    tussen quotes, haakjes of '='.
+    """
+    if not asset_map:
+        return text
+    keys = sorted((key.lstrip('/') for key in asset_map), key=len, reverse=True)
+    pattern = re.compile(r'(?<=["\'(=])(/?)(' + '|'.join(map(re.escape, keys)) + r')(?=[?#"\')\s>])')
+    return pattern.sub(lambda m: m.group(1) + asset_map['/' + m.group(2)].lstrip('/'), text)
+
+def build_assets(files, asset_prefix='assets/'):
+    """Minificeert en hasht CSS/JS en herschrijft alle verwijzingen
+    
+    files: {relatief pad: bytes}. Geeft (nieuwe files, asset_map) terug,
+    waarbij asset_map '/origineel' -> '/gehasht' bevat.
+    """
+    output = {}
+    asset_map = {}
+    
+    for path, data in files.items():
+        extension = os.path.splitext(path)[1].lower()
+        if path.startswith(asset_prefix) and extension in MINIFIERS:
+            minified = MINIFIERS[extension](data.decode('utf-8')).encode('utf-8')
+            target = hashed_name(path, minified)
+            output[target] = minified
+            asset_map['/' + path] = '/' + target
+    
+    for path, data in files.items():
+        if '/' + path in asset_map:
+            continue
+        if path.endswith(REWRITE_EXTENSIONS):
+            data = rewrite_references(data.decode('utf-8'), asset_map).encode('utf-8')
+        output[path] = data
+    
+    return output, asset_map
+
+def build_static_assets(asset_dir, html_files=(), out_dir='dist', safelist=None):
+    """Draait de asset pipeline over een bestaande directory (bijv. de repo assets/)
+    
+    Elk HTML bestand krijgt een eigen, gesnoeide kopie van de stylesheets die
+    het linkt (zie prune_stylesheets); de volledige versies blijven ernaast staan.
+    """
+    asset_dir = Path(asset_dir)
+    root = asset_dir.resolve().parent
+    files = {}
+    for path in sorted(asset_dir.rglob('*')):
+        if path.is_file():
+            files[path.resolve().relative_to(root).as_posix()] = path.read_bytes()
+    for path in html_files:
+        files[Path(path).resolve().relative_to(root).as_posix()] = Path(path).read_bytes()
+    
+    output, asset_map = build_assets(files, asset_prefix=asset_dir.resolve().name + '/')
+    output['asset-manifest.json'] = json.dumps(asset_map, indent=2).encode('utf-8')
+    
+    # Verwijzingen staan absoluut of relatief in de HTML: beide vormen opnemen
+    stylesheets = {}
+    for hashed in asset_map.values():
+        if hashed.endswith('.css'):
+            stylesheets[hashed] = stylesheets[hashed.lstrip('/')] = output[hashed.lstrip('/')].decode('utf-8')
+    tokens = safelist_tokens(PRUNE_SAFELIST if safelist is None else safelist) | collect_js_tokens('\n'.join(
+        data.decode('utf-8') for path, data in output.items() if path.endswith('.js')))
+    pruned = {}
+    for path in html_files:
+        relative_path = Path(path).resolve().relative_to(root).as_posix()
+        output[relative_path] = prune_stylesheets(output[relative_path].decode('utf-8'), stylesheets,
+                                                  tokens, pruned).encode('utf-8')
+    for href, (source, css) in pruned.items():
+        output[href.lstrip('/')] = css.encode('utf-8')
+    
+    out_dir = Path(out_dir)
+    for path, data in output.items():
+        target = out_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+    
+    for original, hashed in asset_map.items():
+        before = len(files[original.lstrip('/')])
+        after = len(output[hashed.lstrip('/')])
+        print(f"   ✅ {original} -> {hashed} ({before} -> {after} bytes)")
+    for href, (source, css) in pruned.items():
+        before = len(stylesheets[source].encode('utf-8'))
+        after = len(css.encode('utf-8'))
+        print(f"   ✂️  {source} -> {href} ({before} -> {after} bytes, -{(before - after) / before:.1%})")
+    return asset_map
+
+# Standaard cache strategie per route (pattern matcht op url.pathname)
+SW_ROUTES = [
+    {'pattern': r'^/assets/.+\.[0-9a-f]{%d}\.\w+$' % ASSET_HASH_LENGTH, 'strategy': 'cache-first'},
+    {'pattern': r'^/api/contact', 'strategy': 'network-first'},
+    {'pattern': r'(^/$|\.html$|/[^.]*$)', 'strategy': 'stale-while-revalidate'},
+]
+
+# Contactformulier endpoint (api/contact/handler.py en de Netlify Function);
+# per site te overschrijven met config['contact'] = {...}
+CONTACT_DEFAULTS = {
+    'port': 8787,                 # asyncio handler achter nginx (config/nginx.conf)
+    'fields': {'name': 100, 'email': 254, 'phone': 32, 'message': 2000},  # veld -> max lengte
+    'required': ['name', 'email', 'message'],
+    'honeypot': 'website_url',    # verborgen veld: ingevuld = bot
+    'spam_keywords': ['buy now', 'click here', 'free money', 'viagra', 'casino', 'lottery'],
+    'max_links': 2,
+    'max_body': 16384,            # bytes
+    'burst': 5,                   # token bucket per client: capaciteit
+    'refill_per_minute': 2,       # ... en aanvulling
+    'max_clients': 100000,        # daarboven worden volle buckets opgeruimd
+    'queue_size': 1000,           # vol = 503 met Retry-After
+    'batch_size': 200,            # max submissions per schrijfactie
+    'store': 'data/contact.sqlite3',  # *.jsonl = JSONL, anders SQLite
+}
+
+# Bestanden die de service worker bij installatie in de cache zet
+SW_PRECACHE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.webmanifest',
+                          '.png', '.svg', '.ico', '.webp', '.avif', '.jpg', '.woff2')
+SW_PRECACHE_EXCLUDE = ('service-worker.js', 'structured-data.json', 'asset-manifest.json')
+
+SW_OFFLINE_URL = '/offline.html'
+
+# Elementen die standaard boven de vouw staan (voor critical CSS)
+CRITICAL_SELECTORS = ['header', '.hero', '.nav']
+
+# Altijd aanwezig in een pagina, ook buiten de gescande elementen
+DOCUMENT_TOKENS = {'html', 'body', '*', ':root'}
+
+# Void elementen hebben geen eind tag
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'source', 'track', 'wbr'}
+
+# At-rules waarvan de inhoud zelf weer regels bevat
+CSS_GROUPING_RULES = ('@media', '@supports', '@layer', '@container')
+
+@functools.lru_cache(maxsize=32)
+def parse_css(css):
+    """Parseert CSS naar nodes: ('rule', selector, body), ('at', prelude, body)
+    of ('block', prelude, children) voor @media en verwante at-rules
+    
+    Gecached per stylesheet tekst; behandel het resultaat als read-only.
+    """
+    nodes, _ = _parse_css_block(minify_css(css), 0)
+    return nodes
+
+def _parse_css_block(css, i):
+    nodes = []
+    n = len(css)
+    while i < n:
+        if css[i] == '}':
+            return nodes, i + 1
+        j = i
+        while j < n and css[j] not in '{;}':
+            j = _skip_quoted(css, j) if css[j] in '"\'' else j + 1
+        prelude = css[i:j].strip()
+        if j >= n or css[j] != '{':
+            if prelude:
+                nodes.append(('at', prelude, None))
+            i = j + 1 if j < n and css[j] == ';' else j
+            continue
+        if prelude.startswith(CSS_GROUPING_RULES):
+            children, i = _parse_css_block(css, j + 1)
+            nodes.append(('block', prelude, children))
+            continue
+        depth = 1
+        k = j + 1
+        while k < n and depth:
+            if css[k] in '"\'':
+                k = _skip_quoted(css, k)
+                continue
+            depth += {'{': 1, '}': -1}.get(css[k], 0)
+            k += 1
+        body = css[j + 1:k - 1]
+        nodes.append(('at' if prelude.startswith('@') else 'rule', prelude, body))
+        i = k
+    return nodes, i
+
+def serialize_css(nodes):
+    out = []
+    for kind, prelude, body in nodes:
+        if kind == 'block':
+            inner = serialize_css(body)
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+        elif body is None:
+            out.append(f"{prelude};")
+        else:
+            out.append(f"{prelude}{{{body}}}")
+    return ''.join(out)
+
+@functools.lru_cache(maxsize=4096)
+def selector_tokens(selector):
+    """Tags, .classes en #ids die een (enkele) selector nodig heeft"""
+    selector = re.sub(r'\[[^\]]*\]', '', selector)
+    selector = re.sub(r'::?[\w-]+(\([^)]*\))?', lambda m: m.group(0) if m.group(0) == ':root' else '', selector)
+    tokens = set()
+    for compound in re.split(r'[\s>+~]+', selector.strip()):
+        if not compound:
+            continue
+        tokens.update(re.findall(r'[.#][\w-]+', compound))
+        tag = re.match(r'[a-zA-Z][\w-]*|:root|\*', compound)
+        if tag:
+            tokens.add(tag.group(0).lower())
+    return frozenset(tokens)
+
+def filter_css(nodes, used, keep_at=('@font-face',)):
+    """Houdt alleen regels over waarvan een selector matcht met de gebruikte tokens"""
+    kept = []
+    for kind, prelude, body in nodes:
+        if kind == 'block':
+            children = filter_css(body, used, keep_at)
+            if children:
+                kept.append((kind, prelude, children))
+        elif kind == 'at':
+            if prelude.startswith(keep_at):
+                kept.append((kind, prelude, body))
+        else:
+            selectors = [s for s in prelude.split(',') if selector_tokens(s) <= used]
+            if selectors:
+                kept.append((kind, ','.join(selectors), body))
+    return kept
+
+class HTMLTokenCollector(HTMLParser):
+    """Verzamelt tags, classes en ids, optioneel alleen binnen bepaalde elementen"""
+    
+    def __init__(self, roots=None):
+        super().__init__(convert_charrefs=True)
+        self.roots = roots
+        self.tokens = set(DOCUMENT_TOKENS)
+        self.stack = []
+        self.inside = 0
+    
+    def _matches_root(self, tag, classes, element_id):
+        return any(root == tag or root == f".{c}" or root == f"#{element_id}"
+                   for root in self.roots for c in classes or [''])
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+        element_id = attrs.get('id')
+        is_root = self.roots is not None and not self.inside and self._matches_root(tag, classes, element_id)
+        if self.roots is None or self.inside or is_root:
+            self.tokens.add(tag)
+            self.tokens.update(f".{c}" for c in classes)
+            if element_id:
+                self.tokens.add(f"#{element_id}")
+        if tag in VOID_ELEMENTS:
+            return
+        self.stack.append(is_root)
+        if is_root or self.inside:
+            self.inside += 1
+    
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS or not self.stack:
+            return
+        self.stack.pop()
+        if self.inside:
+            self.inside -= 1
+
+def collect_html_tokens(html, roots=None):
+    collector = HTMLTokenCollector(roots)
+    collector.feed(html)
+    collector.close()
+    return collector.tokens
+
+STYLESHEET_LINK = re.compile(r'<link\b[^>]*\brel=["\']stylesheet["\'][^>]*>')
+
+def extract_critical_css(html, css, roots=CRITICAL_SELECTORS, used=None):
+    """Subset van css die nodig is voor de elementen boven de vouw
+    
+    used: al verzamelde tokens binnen de roots (zie PageTokens), anders wordt
+    html hiervoor geparsed.
+    """
+    used = frozenset(collect_html_tokens(html, roots)) if used is None else frozenset(used)
+    return _critical_subset(css, used)
+
+@functools.lru_cache(maxsize=256)
+def _critical_subset(css, used):
+    # Pagina's uit hetzelfde template delen vrijwel altijd dezelfde tokens
+    return serialize_css(filter_css(parse_css(css), used))
+
+def inline_critical_css(html, stylesheets, roots=CRITICAL_SELECTORS, used=None):
+    """Inlinet critical CSS in <head> en laadt de volledige stylesheets async
+    
+    stylesheets: {href: css tekst}. Links naar onbekende stylesheets blijven
+    ongewijzigd.
+    """
+    if used is None and STYLESHEET_LINK.search(html):
+        used = collect_html_tokens(html, roots)
+    
+    def replace(match):
+        tag = match.group(0)
+        href = re.search(r'\bhref=["\']([^"\']+)["\']', tag)
+        if not href or href.group(1) not in stylesheets:
+            return tag
+        href = href.group(1)
+        critical = extract_critical_css(html, stylesheets[href], roots, used)
+        return (f'<style>{critical}</style>\n'
+                f'    <link rel="preload" href="{href}" as="style" '
+                f'onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+                f'    <noscript><link rel="stylesheet" href="{href}"></noscript>')
+    
+    return STYLESHEET_LINK.sub(replace, html)
+
+# Classes die pas runtime door JavaScript gezet worden (performance.js en de repo
+# scripts): die staan nergens in de markup maar mogen niet weggesnoeid worden
+PRUNE_SAFELIST = {'.webp', '.no-webp', '.lazy', '.loaded', '.scrolled', '.visible', '.active',
+                  '.selected', '.valid', '.invalid', '.input-valid', '.input-invalid',
+                  '.validation-message', '.update-notification'}
+
+# At-rules zonder selector die bij het snoeien altijd blijven
+PRUNE_KEEP_AT = ('@font-face', '@keyframes', '@-webkit-keyframes', '@property', '@counter-style')
+
+JS_STRING = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`')
+INLINE_SCRIPT = re.compile(r'<script\b[^>]*>(.*?)</script>', re.S | re.I)
+
+# main.<hash>.css -> main.<hash>.<hash van de gesnoeide kopie>.css
+PRUNED_STYLESHEET = re.compile(r'^(.+\.[0-9a-f]{%d})\.[0-9a-f]{%d}\.css$' % (ASSET_HASH_LENGTH, ASSET_HASH_LENGTH))
+
+def collect_js_tokens(source):
+    """Woorden uit JS string literals als mogelijke tag, .class of #id
+    
+    Ruim genomen ('active' in een string houdt .active, #active en active):
+    liever een regel te veel houden dan een runtime class missen.
+    """
+    tokens = set()
+    for literal in JS_STRING.findall(source):
+        for word in re.findall(r'[A-Za-z_][\w-]*', literal):
+            tokens.update((word.lower(), f".{word}", f"#{word}"))
+    return tokens
+
+def safelist_tokens(names):
+    """Safelist entries zonder prefix zijn classes"""
+    return {name if name[:1] in '.#' else f".{name}" for name in names}
+
+@functools.lru_cache(maxsize=256)
+def prune_css(css, used):
+    return serialize_css(filter_css(parse_css(css), used, PRUNE_KEEP_AT))
+
+def prune_stylesheets(document, stylesheets, tokens, pruned, used=None):
+    """Laat de stylesheet links van een pagina naar een gesnoeide kopie wijzen
+    
+    stylesheets: {href: css}, tokens: extra gebruikte tokens (JS bundels,
+    safelist). Inline scripts van de pagina tellen ook mee. Nieuwe kopieën
+    komen in pruned ({href: (bron href, css)}); pagina's met dezelfde tokens
+    delen dezelfde kopie. used: al verzamelde markup tokens (zie PageTokens).
+    """
+    markup = collect_html_tokens(document) if used is None else used
+    used = frozenset(markup | tokens | collect_js_tokens('\n'.join(INLINE_SCRIPT.findall(document))))
+    
+    def replace(match):
+        tag = match.group(0)
+        href = re.search(r'\bhref=["\']([^"\']+)["\']', tag)
+        if not href or href.group(1) not in stylesheets:
+            return tag
+        source = href.group(1)
+        css = prune_css(stylesheets[source], used)
+        if css == stylesheets[source]:
+            return tag
+        target = f"{source[:-len('.css')]}.{content_hash(css.encode('utf-8'))}.css"
+        pruned.setdefault(target, (source, css))
+        return tag.replace(source, target)
+    
+    return STYLESHEET_LINK.sub(replace, document)
+
+# Limieten per sitemap bestand volgens sitemaps.org
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+SITEMAP_INDEX = 'sitemap_index.xml'
+
+# Pagina's die niet in de sitemap horen
+SITEMAP_EXCLUDE = ('404.html', 'offline.html')
+
+class SitemapWriter:
+    """Streamt URLs naar gzipped sitemap shards en sluit af met een sitemap index
+    
+    open_file(naam) moet een binair, schrijfbaar bestand teruggeven. Er wordt
+    nooit meer dan één shard tegelijk open gehouden, dus het geheugengebruik
+    is onafhankelijk van het aantal URLs.
+    """
+    
+    HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    FOOTER = b'</urlset>\n'
+    
+    def __init__(self, base_url, open_file, mtime=0,
+                 max_urls=SITEMAP_MAX_URLS, max_bytes=SITEMAP_MAX_BYTES):
+        self.base_url = base_url.rstrip('/')
+        self.open_file = open_file
+        self.mtime = mtime
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.shards = []
+        self.urls = 0
+        self._raw = None
+        self._gzip = None
+        self._buffer = []
+        self._count = 0
+        self._size = 0
+        self._lastmod = None
+    
+    def _open_shard(self):
+        name = f"sitemap-{len(self.shards) + 1}.xml.gz"
+        self._raw = self.open_file(name)
+        self._gzip = gzip.GzipFile(filename='', mode='wb', fileobj=self._raw, mtime=self.mtime)
+        self._gzip.write(self.HEADER)
+        self._count = 0
+        self._size = len(self.HEADER)
+        self._lastmod = None
+        self.shards.append([name, None])
+    
+    def _flush_buffer(self):
+        # Gebundeld schrijven: gzip per <url> entry is erg traag
+        self._gzip.write(b''.join(self._buffer))
+        self._buffer.clear()
+    
+    def _close_shard(self):
+        self._flush_buffer()
+        self._gzip.write(self.FOOTER)
+        self._gzip.close()
+        self._raw.close()
+        self.shards[-1][1] = self._lastmod
+        self._gzip = None
+    
+    def add(self, path, lastmod=None, changefreq=None, priority=None):
+        entry = f"  <url>\n    <loc>{xml_escape(self.base_url + path)}</loc>\n"
+        if lastmod:
+            entry += f"    <lastmod>{lastmod}</lastmod>\n"
+        if changefreq:
+            entry += f"    <changefreq>{changefreq}</changefreq>\n"
+        if priority is not None:
+            entry += f"    <priority>{priority}</priority>\n"
+        data = (entry + "  </url>\n").encode('utf-8')
+        
+        if self._gzip and (self._count >= self.max_urls
+                           or self._size + len(data) + len(self.FOOTER) > self.max_bytes):
+            self._close_shard()
+        if not self._gzip:
+            self._open_shard()
+        
+        self._buffer.append(data)
+        if len(self._buffer) >= 1000:
+            self._flush_buffer()
+        self._count += 1
+        self._size += len(data)
+        self.urls += 1
+        if lastmod and (self._lastmod is None or lastmod > self._lastmod):
+            self._lastmod = lastmod
+    
+    def close(self):
+        """Sluit de laatste shard en geeft de sitemap index terug"""
+        if self._gzip:
+            self._close_shard()
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for name, lastmod in self.shards:
+            lines.append(f"  <sitemap>\n    <loc>{xml_escape(self.base_url)}/{name}</loc>")
+            if lastmod:
+                lines.append(f"    <lastmod>{lastmod}</lastmod>")
+            lines.append("  </sitemap>")
+        lines.append('</sitemapindex>\n')
+        return '\n'.join(lines)
+
+def page_url(relative_path):
+    """index.html -> /, diensten/index.html -> /diensten/, over.html -> /over.html"""
+    if relative_path == 'index.html':
+        return '/'
+    if relative_path.endswith('/index.html'):
+        return '/' + relative_path[:-len('index.html')]
+    return '/' + relative_path
+
+# Responsive afbeeldingen: breedtes en formaten (voorkeur van boven naar beneden)
+IMAGE_BREAKPOINTS = [400, 800, 1200, 1600]
+IMAGE_FORMATS = ['avif', 'webp', 'jpeg']
+IMAGE_QUALITY = {'avif': 50, 'webp': 75, 'jpeg': 80}
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.tif', '.tiff')
+IMAGE_MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+IMAGE_FILE_EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+
+# Encoded varianten per content hash (relatief aan project_path)
+IMAGE_CACHE_DIR = '.cache/images'
+
+IMG_TAG = re.compile(r'<img\b[^>]*>')
+
+def _encode_image(source, digest, cache_dir, breakpoints, formats):
+    """Encodeert alle varianten van één bron afbeelding (draait in een worker)"""
+    cache_dir = Path(cache_dir)
+    with Image.open(source) as original:
+        original.load()
+        width, height = original.size
+        widths = sorted({w for w in breakpoints if w < width} | {min(max(breakpoints), width)})
+        variants = []
+        for target_width in widths:
+            target_height = round(height * target_width / width)
+            resized = original.resize((target_width, target_height), Image.LANCZOS)
+            for fmt in formats:
+                path = cache_dir / f"{digest}-{target_width}.{IMAGE_FILE_EXTENSIONS[fmt]}"
+                if not path.exists():
+                    frame = resized
+                    if fmt == 'jpeg' and frame.mode not in ('RGB', 'L'):
+                        frame = frame.convert('RGB')
+                    temporary = path.with_suffix('.tmp')
+                    frame.save(temporary, format=fmt.upper(), quality=IMAGE_QUALITY[fmt])
+                    temporary.replace(path)
+                variants.append({'format': fmt, 'width': target_width,
+                                 'height': target_height, 'cache': path.name})
+    meta = {'width': width, 'height': height, 'variants': variants}
+    (cache_dir / f"{digest}.json").write_text(json.dumps(meta), encoding='utf-8')
+    return meta
+
+def available_image_formats(formats):
+    """Formaten die deze Pillow installatie kan schrijven"""
+    Image.init()
+    return [fmt for fmt in formats if fmt.upper() in Image.SAVE]
+
+def picture_markup(image, alt='', sizes='100vw', attributes=''):
+    """<picture> met een <source> per modern formaat en een <img> fallback"""
+    by_format = {}
+    for variant in image['variants']:
+        by_format.setdefault(variant['format'], []).append(variant)
+    srcset = {fmt: ', '.join(f"{v['url']} {v['width']}w" for v in variants)
+              for fmt, variants in by_format.items()}
+    fallback_format = 'jpeg' if 'jpeg' in by_format else list(by_format)[-1]
+    fallback = by_format[fallback_format][-1]
+    
+    sources = ''.join(f'<source type="{IMAGE_MIME_TYPES[fmt]}" srcset="{srcset[fmt]}" sizes="{sizes}">'
+                      for fmt in by_format if fmt != fallback_format)
+    return (f'<picture>{sources}<img src="{fallback["url"]}" srcset="{srcset[fallback_format]}" '
+            f'sizes="{sizes}" width="{fallback["width"]}" height="{fallback["height"]}" '
+            f'alt="{html.escape(alt)}"{attributes}></picture>')
+
+def responsive_images(document, images, sizes='100vw'):
+    """Vervangt <img> tags naar verwerkte bronnen door <picture> markup"""
+    if not images:
+        return document
+    
+    def replace(match):
+        tag = match.group(0)
+        src = re.search(r'\bsrc=["\']([^"\']+)["\']', tag)
+        if not src or src.group(1) not in images:
+            return tag
+        alt = re.search(r'\balt=["\']([^"\']*)["\']', tag)
+        extra = re.findall(r'\s(?:class|id|loading|decoding|fetchpriority)=["\'][^"\']*["\']', tag)
+        return picture_markup(images[src.group(1)], html.unescape(alt.group(1)) if alt else '',
+                              sizes, ''.join(extra))
+    
+    return IMG_TAG.sub(replace, document)
+
+# Eén cache policy voor Netlify, Apache en nginx; de eerste match wint.
+# Alles onder /assets/ is in dist/ content-gehasht (zie build_assets).
+CACHE_POLICY = [
+    {'name': 'hashed-assets', 'pattern': '/assets/*', 'cache_control': 'public, max-age=31536000, immutable'},
+    {'name': 'service-worker', 'pattern': '/service-worker.js', 'cache_control': 'no-cache'},
+    {'name': 'manifest', 'pattern': '/manifest.json', 'cache_control': 'public, max-age=86400'},
+    {'name': 'robots', 'pattern': '/robots.txt', 'cache_control': 'public, max-age=3600'},
+    {'name': 'sitemaps', 'pattern': '/sitemap*', 'cache_control': 'public, max-age=3600'},
+    # HTML en overige ongehashte bestanden: altijd revalideren
+    {'name': 'default', 'pattern': '/*', 'cache_control': 'public, max-age=0, must-revalidate'},
+]
+
+# Wat Netlify zelf meestuurt als geen regel matcht
+NETLIFY_DEFAULT_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+# Assets die elke HTML pagina via een Link header preloadt (voor de hash)
+PRELOAD_ASSETS = ['/assets/css/main.css']
+PRELOAD_TYPES = {'.css': 'style', '.js': 'script', '.woff2': 'font'}
+
+# Alleen nginx: add_header in een location vervangt die van het server block
+SECURITY_HEADERS = {
+    'X-Frame-Options': 'SAMEORIGIN',
+    'X-XSS-Protection': '1; mode=block',
+    'X-Content-Type-Options': 'nosniff',
+}
+
+# Bestanden die als .gz (en .br met de brotli module) naast het origineel komen
+COMPRESS_EXTENSIONS = ('.html', '.css', '.js', '.json', '.webmanifest', '.svg', '.xml', '.txt')
+COMPRESS_MIN_SIZE = 1024
+
+# Brotli 11 is traag (ms per KB): alleen voor de gehashte assets die een jaar
+# gecachet worden; pagina's (ook duizenden collectie pagina's) met een snellere stand
+BROTLI_QUALITY = {'assets/': 11, '': 6}
+
+@functools.lru_cache(maxsize=512)
+def _compress(data, brotli_quality):
+    variants = {'.gz': gzip.compress(data, 9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=brotli_quality)
+    return variants
+
+def precompress(relative_path, data):
+    """{'.gz': bytes, '.br': bytes} voor comprimeerbare bestanden die groot genoeg zijn"""
+    if not relative_path.endswith(COMPRESS_EXTENSIONS) or len(data) < COMPRESS_MIN_SIZE:
+        return {}
+    quality = next(q for prefix, q in BROTLI_QUALITY.items() if relative_path.startswith(prefix))
+    return dict(_compress(data, quality))
+
+def cache_rule(url, policy=CACHE_POLICY):
+    """Eerste policy regel waarvan het patroon de url matcht"""
+    for rule in policy:
+        if fnmatch.fnmatchcase(url, rule['pattern']):
+            return rule
+    return None
+
+def pattern_regex(pattern):
+    """Glob patroon uit de policy als regex ('*' matcht ook '/')"""
+    return '^' + re.escape(pattern).replace('\\*', '.*') + '$'
+
+def preload_links(asset_map, assets=PRELOAD_ASSETS):
+    """Link header waarde met de gehashte preload assets"""
+    links = []
+    for asset in assets:
+        href = asset_map.get(asset, asset)
+        kind = PRELOAD_TYPES.get(Path(href).suffix, 'fetch')
+        crossorigin = '; crossorigin' if kind in ('font', 'fetch') else ''
+        links.append(f"<{href}>; rel=preload; as={kind}{crossorigin}")
+    return ', '.join(links)
+
+def netlify_cache_headers(policy, links):
+    """[[headers]] blokken voor netlify.toml
+    
+    Netlify voegt waarden van alle matchende regels samen, dus de catch-all
+    regel krijgt alleen een Cache-Control als die afwijkt van Netlify's default.
+    """
+    blocks = []
+    for rule in policy:
+        values = {}
+        catch_all = rule['pattern'] == '/*'
+        if not catch_all or rule['cache_control'] != NETLIFY_DEFAULT_CACHE_CONTROL:
+            values['Cache-Control'] = rule['cache_control']
+        if catch_all and links:
+            values['Link'] = links
+        if not values:
+            continue
+        lines = [f'[[headers]]', f'  for = "{rule["pattern"]}"', '  [headers.values]']
+        lines += [f'    {name} = "{value}"' for name, value in values.items()]
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks)
+
+def apache_cache_rules(policy, links):
+    """If/ElseIf/Else keten (eerste match) plus Link header op HTML"""
+    lines = ['<IfModule mod_headers.c>']
+    for i, rule in enumerate(policy):
+        if rule['pattern'] == '/*':
+            lines.append('    <Else>')
+        else:
+            keyword = 'If' if i == 0 else 'ElseIf'
+            lines.append(f'    <{keyword} "%{{REQUEST_URI}} =~ m#{pattern_regex(rule["pattern"])}#">')
+        lines.append(f'        Header set Cache-Control "{rule["cache_control"]}"')
+        lines.append(f'    </{"Else" if rule["pattern"] == "/*" else keyword}>')
+    if links:
+        # 103 Early Hints: 'H2EarlyHints on' in de vhost (niet toegestaan in .htaccess)
+        lines += ['    <FilesMatch "\\.html$">',
+                  f'        Header add Link "{links}"',
+                  '    </FilesMatch>']
+    lines.append('</IfModule>')
+    return '\n'.join(lines)
+
+def apache_compression():
+    """Serveert main.css.br/.gz i.p.v. main.css als de browser dat accepteert"""
+    lines = ['<IfModule mod_rewrite.c>']
+    for suffix, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+        if suffix == '.br' and brotli is None:
+            continue
+        lines += [f'    RewriteCond %{{HTTP:Accept-Encoding}} {encoding}',
+                  f'    RewriteCond %{{REQUEST_FILENAME}}{suffix} -f',
+                  f'    RewriteRule ^(.+)$ $1{suffix} [L]']
+    lines += ['</IfModule>',
+              '<IfModule mod_mime.c>',
+              # main.css.gz houdt het type van .css en krijgt Content-Encoding van .gz
+              '    RemoveType .gz .br',
+              '    AddEncoding gzip .gz',
+              '    AddEncoding br .br',
+              '</IfModule>',
+              '<IfModule mod_headers.c>',
+              '    Header append Vary Accept-Encoding',
+              '</IfModule>']
+    return '\n'.join(lines)
+
+def nginx_cache_locations(policy):
+    """Regex locations in policy volgorde (nginx neemt de eerste match), catch-all als /"""
+    blocks = []
+    for rule in policy:
+        if rule['pattern'] == '/*':
+            head, try_files = '    location / {', '$uri $uri/ =404'
+        else:
+            head, try_files = f'    location ~ {pattern_regex(rule["pattern"])} {{', '$uri =404'
+        lines = [head, f'        add_header Cache-Control "{rule["cache_control"]}" always;']
+        if rule['pattern'] == '/*':
+            lines.append('        add_header Link $preload_links;')
+        lines += [f'        add_header {name} "{value}" always;' for name, value in SECURITY_HEADERS.items()]
+        lines += [f'        try_files {try_files};', '    }']
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks)
+
+def nginx_compression():
+    lines = ['    gzip_static on;']
+    if brotli is not None:
+        lines.append('    brotli_static on;  # ngx_brotli module')
+    return '\n'.join(lines)
+
+def _netlify_cache_control(text):
+    """url -> Cache-Control zoals Netlify het samenstelt uit netlify.toml"""
+    rules = [(h.get('for', ''), h.get('values', {})) for h in tomllib.loads(text).get('headers', [])]
+    
+    def lookup(url):
+        values = [v['Cache-Control'] for pattern, v in rules
+                  if 'Cache-Control' in v and fnmatch.fnmatchcase(url, pattern)]
+        return ', '.join(values) if values else NETLIFY_DEFAULT_CACHE_CONTROL
+    return lookup
+
+def _apache_cache_control(text):
+    """url -> Cache-Control uit een If/ElseIf/Else keten in .htaccess"""
+    branches = [(m.group(2), m.group(3)) for m in re.finditer(
+        r'<(If|ElseIf|Else)(?:\s+"%\{REQUEST_URI\} =~ m#([^#]+)#")?>\s*'
+        r'Header set Cache-Control "([^"]*)"', text)]
+    
+    def lookup(url):
+        for regex, value in branches:
+            if regex is None or re.search(regex, url):
+                return value
+        return None
+    return lookup
+
+def _nginx_cache_control(text):
+    """url -> Cache-Control uit regex locations (in volgorde) en location /"""
+    locations = [(m.group(1), m.group(2)) for m in re.finditer(
+        r'location\s+(?:~\*?\s+(\S+)|/)\s*\{[^}]*?add_header Cache-Control "([^"]*)"', text)]
+    
+    def lookup(url):
+        for regex, value in locations:
+            if regex and re.search(regex, url):
+                return value
+        fallback = [value for regex, value in locations if not regex]
+        return fallback[0] if fallback else None
+    return lookup
+
+def check_server_config(urls, policy=CACHE_POLICY, links='', netlify=None, htaccess=None, nginx=None):
+    """Vergelijkt geëmitteerde server configs met de policy; geeft een lijst verschillen"""
+    targets = {}
+    if netlify is not None and tomllib is not None:
+        targets['netlify.toml'] = (_netlify_cache_control(netlify), netlify)
+    if htaccess is not None:
+        targets['.htaccess'] = (_apache_cache_control(htaccess), htaccess)
+    if nginx is not None:
+        targets['nginx.conf'] = (_nginx_cache_control(nginx), nginx)
+    
+    differences = []
+    for target, (lookup, text) in targets.items():
+        for url in urls:
+            rule = cache_rule(url, policy)
+            expected = rule['cache_control'] if rule else None
+            actual = lookup(url)
+            if actual != expected:
+                differences.append(f"{target} {url}: Cache-Control {actual!r}, policy {expected!r}")
+        if links and links not in text:
+            differences.append(f"{target}: Link preload '{links}' ontbreekt")
+    if htaccess is not None and 'AddEncoding gzip .gz' not in htaccess:
+        differences.append(".htaccess: serveert geen voorgecomprimeerde .gz bestanden")
+    if nginx is not None and 'gzip_static on' not in nginx:
+        differences.append("nginx.conf: gzip_static staat uit")
+    return differences
+
+# Performance budgets per pagina; overschrijfbaar via config['budgets']
+AUDIT_BUDGETS = {
+    'bytes': 500_000,
+    'compressed_bytes': 170_000,
+    'requests': 25,
+    'render_blocking': 0,
+    'images_without_dimensions': 0,
+    'third_party_origins': 2,
+}
+
+# Eén regel per build met de audit resultaten (relatief aan project_path)
+AUDIT_HISTORY = '.generator-audit.jsonl'
+
+class PageAuditParser(HTMLParser):
+    """Verzamelt requests, render-blocking resources en afbeeldingen van een pagina"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.resources = []
+        self.render_blocking = []
+        self.images_without_dimensions = []
+        self.in_head = False
+        self.in_noscript = False
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        elif tag == 'noscript':
+            self.in_noscript = True
+        if self.in_noscript:
+            return
+        
+        if tag == 'script':
+            src = attrs.get('src')
+            if src:
+                self.resources.append(src)
+            script_type = attrs.get('type') or 'text/javascript'
+            blocking = (script_type in ('text/javascript', 'application/javascript')
+                        and 'async' not in attrs and 'defer' not in attrs)
+            if self.in_head and blocking:
+                # Ook een inline script blokkeert de parser
+                self.render_blocking.append(src or 'inline <script>')
+        elif tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            href = attrs.get('href')
+            if href and {'stylesheet', 'icon', 'manifest', 'preload', 'modulepreload'} & set(rel):
+                self.resources.append(href)
+            if self.in_head and 'stylesheet' in rel and attrs.get('media', 'all') in ('all', 'screen', ''):
+                self.render_blocking.append(href)
+        elif tag in ('img', 'iframe', 'video', 'audio', 'source', 'embed'):
+            src = attrs.get('src')
+            # <source srcset> in een <picture>: de browser laadt één variant via de <img>
+            if src and tag != 'source':
+                self.resources.append(src)
+            if tag == 'img' and not (attrs.get('width') and attrs.get('height')):
+                self.images_without_dimensions.append(src or attrs.get('srcset', ''))
+    
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+        elif tag == 'noscript':
+            self.in_noscript = False
+
+def url_origin(url):
+    """'https://host' voor absolute URLs, None voor lokale verwijzingen"""
+    match = re.match(r'(?:(https?:)?//)([^/?#]+)', url)
+    if not match or not (match.group(1) or url.startswith('//')):
+        return None
+    return f"{match.group(1) or 'https:'}//{match.group(2).lower()}"
+
+def audit_page(root, relative_path, first_party=(), compressed_sizes=None):
+    """Meet één HTML pagina inclusief de lokale resources die ze laadt"""
+    root = Path(root)
+    compressed_sizes = {} if compressed_sizes is None else compressed_sizes
+    
+    def sizes(path):
+        if path not in compressed_sizes:
+            data = path.read_bytes()
+            compressed_sizes[path] = (len(data), len(gzip.compress(data, 9, mtime=0)))
+        return compressed_sizes[path]
+    
+    page = root / relative_path
+    parser = PageAuditParser()
+    parser.feed(page.read_text(encoding='utf-8', errors='replace'))
+    page_bytes, page_compressed = sizes(page)
+    
+    third_party = set()
+    requests = {str(relative_path)}
+    css_saved = 0
+    for url in parser.resources:
+        resource_origin = url_origin(url)
+        if resource_origin:
+            requests.add(url)
+            if resource_origin not in first_party:
+                third_party.add(resource_origin)
+            continue
+        if url.startswith('data:'):
+            continue
+        path = url.split('#', 1)[0].split('?', 1)[0]
+        target = root / path.lstrip('/') if path.startswith('/') else page.parent / path
+        requests.add(url)
+        if target.is_file():
+            size, compressed = sizes(target)
+            page_bytes += size
+            page_compressed += compressed
+            # Gesnoeide stylesheet: besparing t.o.v. de volledige versie ernaast
+            pruned = PRUNED_STYLESHEET.match(target.name)
+            full = target.with_name(f"{pruned.group(1)}.css") if pruned else None
+            if full and full.is_file():
+                css_saved += sizes(full)[0] - size
+    
+    return {
+        'bytes': page_bytes,
+        'compressed_bytes': page_compressed,
+        'requests': len(requests),
+        'render_blocking': parser.render_blocking,
+        'images_without_dimensions': parser.images_without_dimensions,
+        'third_party_origins': sorted(third_party),
+        'css_saved_bytes': css_saved,
+    }
+
+def audit_site(root, first_party=()):
+    """Audit van alle HTML pagina's onder root (bijv. dist/)"""
+    root = Path(root)
+    compressed_sizes = {}
+    pages = {}
+    for page in sorted(root.rglob('*.html')):
+        relative_path = page.relative_to(root).as_posix()
+        pages[relative_path] = audit_page(root, relative_path, first_party, compressed_sizes)
+    return {
+        'pages': pages,
+        'total': {
+            'pages': len(pages),
+            'bytes': sum(p['bytes'] for p in pages.values()),
+            'compressed_bytes': sum(p['compressed_bytes'] for p in pages.values()),
+            'requests': sum(p['requests'] for p in pages.values()),
+            'css_saved_bytes': sum(p['css_saved_bytes'] for p in pages.values()),
+        },
+    }
+
+def check_budgets(report, budgets=None):
+    """Lijst overschrijdingen '<pagina>: <metric> x > budget'"""
+    budgets = dict(AUDIT_BUDGETS, **(budgets or {}))
+    violations = []
+    for relative_path, page in report['pages'].items():
+        for metric, limit in budgets.items():
+            value = page.get(metric)
+            if value is None or limit is None:
+                continue
+            count = len(value) if isinstance(value, list) else value
+            if count > limit:
+                detail = f" ({', '.join(value)})" if isinstance(value, list) else ''
+                violations.append(f"{relative_path}: {metric} {count} > {limit}{detail}")
+    return violations
+
+def record_audit(history_path, report, build_date=None):
+    """Voegt de audit toe aan de historie en geeft het verschil met de vorige build"""
+    history_path = Path(history_path)
+    previous = None
+    if history_path.exists():
+        with open(history_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    previous = line
+    previous = json.loads(previous) if previous else None
+    
+    entry = {
+        'build_date': build_date,
+        'total': report['total'],
+        'pages': {path: {key: page[key] for key in ('bytes', 'compressed_bytes', 'requests')}
+                  for path, page in report['pages'].items()},
+    }
+    with open(history_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, sort_keys=True) + '\n')
+    
+    diff = {}
+    if previous is None:
+        return diff
+    for path in sorted(set(entry['pages']) | set(previous['pages'])):
+        old = previous['pages'].get(path, {})
+        new = entry['pages'].get(path, {})
+        delta = {key: new.get(key, 0) - old.get(key, 0)
+                 for key in ('bytes', 'compressed_bytes', 'requests')}
+        if any(delta.values()):
+            diff[path] = delta
+    return diff
+
+def print_audit(report, violations, diff):
+    """Samenvatting van een audit: totalen, groei t.o.v. vorige build en budgetten"""
+    total = report['total']
+    print(f"\n🔎 Audit: {total['pages']} pagina's, {total['bytes']} bytes "
+          f"({total['compressed_bytes']} gzip), {total['requests']} requests")
+    if total.get('css_saved_bytes'):
+        print(f"   ✂️  Ongebruikte CSS: {total['css_saved_bytes']} bytes bespaard over alle pagina's")
+    for path, delta in diff.items():
+        print(f"   Δ {path}: {delta['bytes']:+} bytes, {delta['compressed_bytes']:+} gzip, "
+              f"{delta['requests']:+} requests")
+    for violation in violations:
+        print(f"   ❌ {violation}")
+    if not violations:
+        print("   ✅ Binnen alle budgets")
+
+# Link checker: bestanden die niemand hoeft te refereren (crawlers, server of browser
+# vragen ze zelf op). Dotfiles en .well-known/ tellen ook als ingang.
+LINK_ENTRY_POINTS = {'index.html', '404.html', 'robots.txt', 'humans.txt', 'favicon.ico',
+                     SITEMAP_INDEX, '_redirects', '_headers'}
+
+# Bestanden waarin de link checker naar verwijzingen zoekt
+LINK_SCAN_EXTENSIONS = ('.html', '.css', '.js', '.mjs', '.json', '.webmanifest', '.xml', '.xml.gz', '.txt')
+
+# Meer hops dan dit geldt als lus
+LINK_MAX_HOPS = 10
+
+LINK_ATTRIBUTE = re.compile(r'\s(href|src|poster|srcset|imagesrcset)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))',
+                            re.I)
+# Absolute paden met een extensie in JavaScript strings (precache lijst, register())
+JS_PATH = re.compile(r'[\'"`](/[^\'"`\s?#*]*\.[A-Za-z0-9]{1,8})(?:[?#][^\'"`]*)?[\'"`]')
+CSS_IMPORT = re.compile(r'@import\s+[\'"]([^\'"]+)[\'"]')
+SITEMAP_LOC = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>')
+ROBOTS_SITEMAP = re.compile(r'(?im)^sitemap:\s*(\S+)')
+
+def _json_strings(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _json_strings(item)
+    elif isinstance(value, str):
+        yield value
+
+def scan_references(relative_path, data):
+    """Alle URLs waar één bestand naar verwijst, in volgorde zonder dubbelen"""
+    if relative_path.endswith('.gz'):
+        data = gzip.decompress(data)
+    text = data.decode('utf-8', errors='replace')
+    urls = []
+    if relative_path.endswith('.html'):
+        for match in LINK_ATTRIBUTE.finditer(text):
+            value = next(group for group in match.groups()[1:] if group is not None)
+            if match.group(1).lower().endswith('srcset'):
+                urls.extend(candidate.split()[0] for candidate in value.split(',') if candidate.strip())
+            else:
+                urls.append(value)
+        urls.extend(CSS_URL.findall(text))
+        for script in INLINE_SCRIPT.findall(text):
+            urls.extend(JS_PATH.findall(script))
+    elif relative_path.endswith('.css'):
+        urls = CSS_URL.findall(text) + CSS_IMPORT.findall(text)
+    elif relative_path.endswith(('.js', '.mjs')):
+        urls = JS_PATH.findall(text)
+    elif relative_path.endswith(('.json', '.webmanifest')):
+        try:
+            urls = [value for value in _json_strings(json.loads(text)) if value.startswith(('/', 'http'))]
+        except ValueError:
+            return []
+    elif relative_path.endswith(('.xml', '.xml.gz')):
+        urls = SITEMAP_LOC.findall(text)
+    elif relative_path.endswith('robots.txt'):
+        urls = ROBOTS_SITEMAP.findall(text)
+    return list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+
+def local_link(url, source, first_party=()):
+    """Pad op de server voor een verwijzing vanuit /source (None: extern, anker, data: of mailto:)"""
+    url = html.unescape(url)
+    origin = url_origin(url)
+    if origin:
+        if origin not in first_party:
+            return None
+        url = re.sub(r'^(?:https?:)?//[^/?#]+', '', url) or '/'
+    path = url.split('#', 1)[0].split('?', 1)[0]
+    if not path or url.startswith(('mailto:', 'tel:', 'javascript:')) or ':' in path.split('/', 1)[0]:
+        return None
+    if not path.startswith('/'):
+        trailing = '/' if path.endswith('/') else ''
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(source), path)) + trailing
+    return unquote(path)
+
+def resolve_link(path, files):
+    """Bestand dat de server voor een pad teruggeeft (pretty URLs zoals Netlify), of None"""
+    path = path.lstrip('/')
+    if not path or path.endswith('/'):
+        candidates = (path + 'index.html',)
+    else:
+        candidates = (path, path + '.html', path + '/index.html')
+    return next((candidate for candidate in candidates if candidate in files), None)
+
+def redirect_rules(netlify=None, redirects_file=None):
+    """(from, to, status) in de volgorde waarin Netlify ze toepast: _redirects, dan netlify.toml"""
+    rules = []
+    for line in (redirects_file or '').splitlines():
+        parts = line.split('#', 1)[0].split()
+        if len(parts) >= 2:
+            status = parts[2].rstrip('!') if len(parts) > 2 else ''
+            rules.append((parts[0], parts[1], int(status) if status.isdigit() else 301))
+    if netlify and tomllib is not None:
+        for rule in tomllib.loads(netlify).get('redirects', []):
+            rules.append((rule['from'], rule['to'], int(rule.get('status', 301))))
+    return rules
+
+def _redirect_pattern(source):
+    pattern = re.escape(source.rstrip('/') or '/').replace(r'\*', '(?P<splat>.*)')
+    pattern = re.sub(r':(\w+)', r'(?P<\1>[^/]+)', pattern)
+    return re.compile(pattern + '/?$')
+
+def check_links(root, first_party=(), redirects=(), workers=None):
+    """Link en asset check over alle bestanden onder root in één parallelle pass
+    
+    Index van alle bestanden plus de verwijzingen uit HTML, CSS, JavaScript (service
+    worker), manifest/JSON, sitemaps en robots.txt, opgelost zoals de server dat doet:
+    bestaand bestand, dan de redirect regels. Een catch-all rewrite (/* met status
+    200, de SPA fallback) telt niet: die serveert index.html voor elk ontbrekend asset.
+    """
+    root = Path(root)
+    files = set()
+    for directory, _, names in os.walk(root):
+        prefix = Path(directory).relative_to(root).as_posix()
+        prefix = '' if prefix == '.' else prefix + '/'
+        files.update(prefix + name for name in names)
+    scan = sorted(f for f in files if f.endswith(LINK_SCAN_EXTENSIONS))
+    rules = [(_redirect_pattern(source), target, status, '*' in source)
+             for source, target, status in redirects]
+    
+    def references(relative_path):
+        return scan_references(relative_path, (root / relative_path).read_bytes())
+    
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        found = dict(zip(scan, pool.map(references, scan)))
+    
+    def follow(path):
+        """(doel, redirect hops); doel is een bestand, een externe URL of None"""
+        hops = []
+        while True:
+            target = resolve_link(path, files)
+            if target:
+                return target, hops
+            for pattern, destination, status, catch_all in rules:
+                match = pattern.match(path)
+                if match:
+                    break
+            else:
+                return None, hops
+            if catch_all and status == 200:
+                return None, hops
+            for name, value in match.groupdict().items():
+                destination = destination.replace(':' + name, value or '')
+            hops.append(destination)
+            if url_origin(destination):
+                return destination, hops
+            if len(hops) > LINK_MAX_HOPS:
+                return None, hops
+            path = destination.split('#', 1)[0].split('?', 1)[0]
+    
+    # Elke pagina verwijst naar dezelfde assets: één keer oplossen per url (relatieve
+    # urls per directory) en per pad
+    paths, targets = {}, {}
+    missing, redirected, referenced = {}, [], set()
+    total = 0
+    for source, urls in found.items():
+        directory = posixpath.dirname('/' + source)
+        for url in urls:
+            key = (url, None if url.startswith(('/', 'http:', 'https:')) else directory)
+            if key not in paths:
+                paths[key] = local_link(url, '/' + source, first_party)
+            path = paths[key]
+            if path is None:
+                continue
+            total += 1
+            if path not in targets:
+                targets[path] = follow(path)
+            target, hops = targets[path]
+            if target is None:
+                missing.setdefault(path, []).append(source)
+            elif target != source:
+                referenced.add(target)
+            if hops:
+                redirected.append({'source': source, 'url': url, 'hops': hops})
+    
+    chains = []
+    for source, target, status in redirects:
+        if '*' in source or ':' in source or resolve_link(source, files):
+            continue
+        destination, hops = follow(source)
+        if destination is None and not url_origin(target):
+            missing.setdefault(target, []).append(f"redirect {source}")
+        if len(hops) > 1:
+            chains.append({'from': source, 'hops': hops})
+    
+    unreferenced = []
+    for relative_path in sorted(files - referenced):
+        name = relative_path.rsplit('/', 1)[-1]
+        base = relative_path.rsplit('.', 1)[0] if relative_path.endswith(('.gz', '.br')) else None
+        if (relative_path in LINK_ENTRY_POINTS or name.startswith('.') or relative_path.startswith('.')
+                or (base in files and base != relative_path)):
+            continue
+        unreferenced.append(relative_path)
+    
+    return {
+        'files': len(files),
+        'scanned': len(scan),
+        'references': total,
+        'missing': {url: sources for url, sources in sorted(missing.items())},
+        'redirected': redirected,
+        'redirect_chains': chains,
+        'unreferenced': unreferenced,
+    }
+
+def print_link_report(report, limit=20):
+    """Samenvatting van check_links: ontbrekende doelen gegroepeerd per URL"""
+    print(f"\n🔗 Links: {report['files']} bestanden, {report['references']} lokale verwijzingen "
+          f"in {report['scanned']} bestanden")
+    for url, sources in report['missing'].items():
+        more = f" en {len(sources) - 3} andere" if len(sources) > 3 else ''
+        print(f"   ❌ {url} ontbreekt (vanuit {', '.join(sources[:3])}{more})")
+    for chain in report['redirect_chains']:
+        print(f"   🔁 Redirect keten: {chain['from']} → {' → '.join(chain['hops'])}")
+    for entry in report['redirected'][:limit]:
+        print(f"   ↪️  {entry['source']}: {entry['url']} via {len(entry['hops'])} redirect(s) naar {entry['hops'][-1]}")
+    unreferenced = report['unreferenced']
+    if unreferenced:
+        more = f" (+{len(unreferenced) - limit})" if len(unreferenced) > limit else ''
+        print(f"   🗑️  Niet gerefereerd: {', '.join(unreferenced[:limit])}{more}")
+    if not (report['missing'] or report['redirect_chains']):
+        print("   ✅ Geen ontbrekende doelen of redirect ketens")
+
+# Maximaal aantal hints per pagina (inclusief al aanwezige); meer hints
+# concurreren met de resources die de pagina echt nodig heeft
+RESOURCE_HINT_LIMITS = {'preconnect': 2, 'dns-prefetch': 4, 'preload': 4, 'prefetch': 2}
+
+# Speculation Rules: interne links prefetchen zodra de gebruiker er naar wijst
+SPECULATION_RULES = {
+    'prefetch': [{
+        'source': 'document',
+        'where': {'and': [
+            {'href_matches': '/*'},
+            {'not': {'href_matches': '/assets/*'}},
+            {'not': {'selector_matches': '[rel~=nofollow]'}},
+        ]},
+        'eagerness': 'moderate',
+    }],
+}
+
+PRELOAD_AS = {'.css': 'style', '.js': 'script', '.woff2': 'font', '.woff': 'font',
+              '.avif': 'image', '.webp': 'image', '.jpg': 'image', '.jpeg': 'image',
+              '.png': 'image', '.svg': 'image', '.gif': 'image'}
+
+INLINE_URL = re.compile(r'https?://[^\s\'"`)<>\\]+')
+CSS_URL = re.compile(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)')
+
+class ResourceScanner(HTMLParser):
+    """Externe origins, bestaande hints, interne links en CSS url()s van een pagina"""
+    
+    HINT_RELS = ('preconnect', 'dns-prefetch', 'preload', 'prefetch', 'modulepreload')
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.origins = {}
+        self.hints = set()
+        self.links = []
+        self.style_urls = []
+        self.speculation_rules = False
+        self.in_head = False
+        self.data_tag = None
+        self.deferred = False
+    
+    def use_origin(self, url, crossorigin=False):
+        origin = url_origin(url)
+        if not origin:
+            return
+        entry = self.origins.setdefault(origin, {'count': 0, 'head': False, 'crossorigin': False,
+                                                 'order': len(self.origins)})
+        entry['count'] += 1
+        entry['head'] |= self.in_head
+        entry['crossorigin'] |= crossorigin
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        crossorigin = 'crossorigin' in attrs
+        
+        if tag == 'a' and attrs.get('href'):
+            self.links.append(attrs['href'])
+        elif tag == 'link' and attrs.get('href'):
+            rels = (attrs.get('rel') or '').lower().split()
+            hint = next((rel for rel in rels if rel in self.HINT_RELS), None)
+            if hint:
+                self.hints.add((hint, url_origin(attrs['href']) if hint in ('preconnect', 'dns-prefetch')
+                                else attrs['href']))
+                if hint == 'preload':
+                    self.use_origin(attrs['href'], crossorigin or attrs.get('as') == 'font')
+            elif {'stylesheet', 'icon', 'manifest', 'apple-touch-icon'} & set(rels):
+                self.use_origin(attrs['href'], crossorigin)
+        elif tag in ('script', 'img', 'iframe', 'source', 'video', 'audio') and attrs.get('src'):
+            # Partytown scripts haalt de worker pas na load op
+            if attrs.get('type') != 'text/partytown':
+                self.use_origin(attrs['src'], crossorigin or attrs.get('type') == 'module')
+        
+        if tag == 'script' and attrs.get('type') == 'speculationrules':
+            self.speculation_rules = True
+        if tag in ('script', 'style'):
+            self.data_tag = tag
+            self.deferred = 'data-deferred' in attrs
+    
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+        if tag == self.data_tag:
+            self.data_tag = None
+    
+    def handle_data(self, data):
+        if self.data_tag == 'script' and not self.deferred:
+            # Loaders die hun script direct zelf aanmaken (gtag/GTM snippets); uitgestelde
+            # loaders (data-deferred) verbinden pas na load of toestemming
+            for url in INLINE_URL.findall(data):
+                self.use_origin(url)
+        elif self.data_tag == 'style' and self.in_head:
+            self.style_urls.extend(CSS_URL.findall(data))
+
+def internal_link(href, page):
+    """Genormaliseerd intern pad van een <a href> (None voor extern, anker of mailto)"""
+    if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')) or url_origin(href):
+        return None
+    if ':' in href.split('/', 1)[0]:
+        return None
+    path = href.split('#', 1)[0].split('?', 1)[0]
+    if not path:
+        return None
+    if not path.startswith('/'):
+        trailing = '/' if path.endswith('/') else ''
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(page), path)) + trailing
+    if path.endswith('/index.html'):
+        path = path[:-len('index.html')]
+    return path
+
+def navigation_ranks(pages):
+    """In-degree per intern pad over alle pagina's {relatief pad: html}"""
+    ranks = {}
+    for relative_path, document in pages.items():
+        scanner = ResourceScanner()
+        scanner.feed(document)
+        page = page_url(relative_path)
+        for target in {internal_link(href, page) for href in scanner.links}:
+            if target and target != page:
+                ranks[target] = ranks.get(target, 0) + 1
+    return ranks
+
+def add_resource_hints(document, page, ranks=None, limits=None, first_party=(),
+                       speculation_rules=SPECULATION_RULES):
+    """Voegt gerankte en gemaximeerde hints toe aan <head> van een productie pagina
+    
+    preconnect/dns-prefetch voor externe origins (eerst die uit <head>, dan op
+    aantal verwijzingen), preload voor url()s uit de inline critical CSS,
+    prefetch voor de interne links met de meeste inkomende links en Speculation
+    Rules voor prefetch bij hover.
+    """
+    limits = dict(RESOURCE_HINT_LIMITS, **(limits or {}))
+    ranks = ranks or {}
+    scanner = ResourceScanner()
+    scanner.feed(document)
+    existing = {rel: {href for hint, href in scanner.hints if hint == rel} for rel in limits}
+    tags = []
+    
+    def room(rel):
+        return limits[rel] - len(existing[rel])
+    
+    origins = sorted(scanner.origins.items(),
+                     key=lambda item: (not item[1]['head'], -item[1]['count'], item[1]['order']))
+    for origin, usage in origins:
+        if origin in first_party or origin in existing['preconnect'] or origin in existing['dns-prefetch']:
+            continue
+        if room('preconnect') > 0:
+            crossorigin = ' crossorigin' if usage['crossorigin'] else ''
+            tags.append(f'<link rel="preconnect" href="{origin}"{crossorigin}>')
+            existing['preconnect'].add(origin)
+        elif room('dns-prefetch') > 0:
+            tags.append(f'<link rel="dns-prefetch" href="{origin}">')
+            existing['dns-prefetch'].add(origin)
+    
+    for url in dict.fromkeys(scanner.style_urls):
+        kind = PRELOAD_AS.get(posixpath.splitext(url.split('?', 1)[0])[1].lower())
+        # Fonts preloadt create_fonts zelf (alleen de gewichten die er toe doen)
+        if kind != 'image' or url in existing['preload'] or url.startswith('data:') or room('preload') <= 0:
+            continue
+        tags.append(f'<link rel="preload" href="{url}" as="image">')
+        existing['preload'].add(url)
+    
+    links = [internal_link(href, page) for href in scanner.links]
+    candidates = [link for link in dict.fromkeys(links) if link and link != page]
+    candidates.sort(key=lambda link: -ranks.get(link, 0))
+    for link in candidates:
+        if room('prefetch') <= 0:
+            break
+        if link not in existing['prefetch']:
+            tags.append(f'<link rel="prefetch" href="{link}">')
+            existing['prefetch'].add(link)
+    
+    if candidates and speculation_rules and not scanner.speculation_rules:
+        tags.append(f'<script type="speculationrules">{json.dumps(speculation_rules, separators=(",", ":"))}</script>')
+    
+    if not tags:
+        return document
+    markup = ''.join(f"\n    {tag}" for tag in tags)
+    position = document.find('</title>')
+    if position >= 0:
+        position += len('</title>')
+    else:
+        position = document.find('</head>')
+        if position < 0:
+            return document
+    return document[:position] + markup + document[position:]
+
+# Self-hosted fonts: bronnen in src/assets/fonts (of config['font_dir'])
+FONT_EXTENSIONS = ('.ttf', '.otf', '.woff', '.woff2')
+FONT_CACHE_DIR = '.cache/fonts'
+FONT_DISPLAY = 'swap'
+FONT_FALLBACK_STACK = "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif"
+
+# Altijd in de subset: ASCII plus Nederlandse/West-Europese tekens en typografie
+FONT_BASE_CHARACTERS = (''.join(chr(c) for c in range(0x20, 0x7f))
+                        + 'àáâäèéêëìíîïòóôöùúûüçñÀÁÂÄÈÉÊËÌÍÎÏÒÓÔÖÙÚÛÜÇÑĳĲ'
+                        + '€‘’‚“”„–—…•·©®™°×\u00a0')
+
+# Gewicht uit de bestandsnaam als fontTools ontbreekt (Inter-SemiBold.woff2)
+FONT_WEIGHTS = {'thin': 100, 'extralight': 200, 'light': 300, 'regular': 400, 'medium': 500,
+                'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900}
+
+def font_metadata(path):
+    """family, weight en style van een font (tabellen via fontTools, anders de bestandsnaam)"""
+    stem = Path(path).stem
+    family, _, variant = stem.partition('-')
+    variant = variant.lower()
+    meta = {
+        'family': family,
+        'weight': next((w for name, w in sorted(FONT_WEIGHTS.items(), key=lambda i: -len(i[0]))
+                        if name in variant), 400),
+        'style': 'italic' if 'italic' in variant else 'normal',
+    }
+    # Zonder brotli kan fontTools geen WOFF2 lezen; dan gebruikt create_fonts de .woff2
+    # ongewijzigd en blijft de bestandsnaam leidend
+    if TTFont is not None and can_subset_fonts():
+        font = TTFont(str(path), lazy=True)
+        name = font['name'].getBestFamilyName()
+        if name:
+            meta['family'] = name
+        if 'OS/2' in font:
+            meta['weight'] = font['OS/2'].usWeightClass
+            meta['style'] = 'italic' if font['OS/2'].fsSelection & 1 else 'normal'
+        font.close()
+    return meta
+
+def used_characters(documents):
+    """Alle tekens in de tekst van de gegeven HTML documenten"""
+    characters = set()
+    for document in documents:
+        characters.update(html.unescape(re.sub(r'<[^>]*>', ' ', document)))
+    return characters
+
+def can_subset_fonts():
+    # WOFF2 schrijven vraagt naast fontTools ook de brotli module
+    return font_subset is not None and brotli is not None
+
+def subset_font(source, characters, cache_dir):
+    """WOFF2 met alleen de gegeven tekens; gecachet op hash van font en tekenset
+    
+    Geeft (data, uit cache) terug. Zonder fontTools/brotli wordt een .woff2 bron
+    ongewijzigd gebruikt en andere formaten overgeslagen (None).
+    """
+    source = Path(source)
+    data = source.read_bytes()
+    if not can_subset_fonts():
+        return (data, False) if source.suffix.lower() == '.woff2' else (None, False)
+    
+    text = ''.join(sorted(characters))
+    key = hashlib.sha256(data + text.encode('utf-8')).hexdigest()[:16]
+    cached = Path(cache_dir) / f"{key}.woff2"
+    if cached.exists():
+        return cached.read_bytes(), True
+    
+    options = font_subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    font = font_subset.load_font(str(source), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    font_subset.save_font(font, buffer, options)
+    font.close()
+    cached.write_bytes(buffer.getvalue())
+    return buffer.getvalue(), False
+
+def font_face_css(fonts, display=FONT_DISPLAY):
+    """@font-face regels voor de gesubsette fonts"""
+    return '\n'.join(
+        f"@font-face {{\n"
+        f"    font-family: '{font['family']}';\n"
+        f"    font-style: {font['style']};\n"
+        f"    font-weight: {font['weight']};\n"
+        f"    font-display: {display};\n"
+        f"    src: url('{font['url']}') format('woff2');\n"
+        f"}}\n"
+        for font in fonts)
+
+def font_preload_markup(fonts):
+    return ''.join(f'    <link rel="preload" href="{font["url"]}" as="font" type="font/woff2" crossorigin>\n'
+                   for font in fonts if font.get('preload'))
+
+# Laadstrategie voor GA/GTM (config['analytics_mode']):
+#   'eager'       direct na de pagina (oude gedrag, maar niet meer in <head>)
+#   'idle'        na load, zodra de main thread idle is
+#   'interaction' bij de eerste scroll/klik/toets
+#   'consent'     pas na toestemming via de cookie banner (Consent Mode defaults op denied)
+#   'worker'      tags draaien in een web worker via Partytown
+ANALYTICS_MODES = ('eager', 'idle', 'interaction', 'consent', 'worker')
+ANALYTICS_DEFAULT_MODE = 'idle'
+
+ANALYTICS_TRIGGERS = {
+    'eager': "loadAnalytics();",
+    'idle': ("addEventListener('load', function () {\n"
+             "            'requestIdleCallback' in window ? requestIdleCallback(loadAnalytics, {timeout: 4000})\n"
+             "                : setTimeout(loadAnalytics, 2000);\n"
+             "        });"),
+    'interaction': ("['pointerdown', 'keydown', 'scroll', 'touchstart'].forEach(function (type) {\n"
+                    "            addEventListener(type, loadAnalytics, {once: true, passive: true});\n"
+                    "        });"),
+}
+
+GTAG_URL = 'https://www.googletagmanager.com/gtag/js?id={}'
+GTM_URL = 'https://www.googletagmanager.com/gtm.js?id={}'
+GTM_START = "dataLayer.push({'gtm.start': Date.now(), event: 'gtm.js'});"
+CONSENT_DEFAULTS = ("gtag('consent', 'default', {analytics_storage: 'denied', ad_storage: 'denied', "
+                    "ad_user_data: 'denied', ad_personalization: 'denied'});")
+
+# Partytown lib (npm i @builder.io/partytown), of config['partytown_lib']
+PARTYTOWN_LIB = Path('node_modules/@builder.io/partytown/lib')
+PARTYTOWN_URL = '/~partytown/'
+
+def analytics_tags(config):
+    """(gtag config regels, script urls) voor de geconfigureerde GA en GTM ids"""
+    lines, scripts = [], []
+    if config.get('ga_tracking_id'):
+        lines.append(f"gtag('config', {json.dumps(config['ga_tracking_id'])});")
+        scripts.append(GTAG_URL.format(config['ga_tracking_id']))
+    if config.get('gtm_id'):
+        scripts.append(GTM_URL.format(config['gtm_id']))
+    return lines, scripts
+
+def indent_lines(lines, indent=8):
+    return ''.join(f"{' ' * indent}{line}\n" for line in lines)
+
+# Git modi: 'commit' (repo + initiële commit), 'init' (repo zonder commit,
+# bijv. in bulk runs) of 'skip'
+GIT_MODES = ('commit', 'init', 'skip')
+
+GIT_DEFAULT_BRANCH = 'main'
+
+def gitignore_matcher(text):
+    """Eenvoudige .gitignore matcher (geen negaties) voor de gegenereerde patronen"""
+    patterns = [line.strip() for line in text.splitlines()
+                if line.strip() and not line.startswith(('#', '!'))]
+    
+    def ignored(relative_path, is_dir=False):
+        parts = relative_path.split('/')
+        for pattern in patterns:
+            directory_only = pattern.endswith('/')
+            pattern = pattern.strip('/')
+            if '/' in pattern:
+                # Verankerd patroon: matcht vanaf de root
+                if fnmatch.fnmatchcase(relative_path, pattern) or \
+                        relative_path.startswith(pattern + '/'):
+                    return True
+                continue
+            # Een patroon matcht elk pad component; directory patronen alleen mappen
+            candidates = parts if is_dir or not directory_only else parts[:-1]
+            if any(fnmatch.fnmatchcase(part, pattern) for part in candidates):
+                return True
+        return False
+    
+    return ignored
+
+class GitWriter:
+    """Schrijft een git repository direct (objects, index, refs) zonder subprocess
+    
+    Werkt alleen met paden onder root en verandert de working directory
+    niet, dus veilig voor parallelle generatie van veel projecten.
+    """
+    
+    def __init__(self, root, branch=GIT_DEFAULT_BRANCH):
+        self.root = Path(root)
+        self.git_dir = self.root / '.git'
+        self.branch = branch
+    
+    def init(self):
+        for directory in ('objects/info', 'objects/pack', 'refs/heads', 'refs/tags', 'info'):
+            (self.git_dir / directory).mkdir(parents=True, exist_ok=True)
+        if not (self.git_dir / 'HEAD').exists():
+            (self.git_dir / 'HEAD').write_text(f"ref: refs/heads/{self.branch}\n")
+            (self.git_dir / 'config').write_text(
+                "[core]\n\trepositoryformatversion = 0\n\tfilemode = true\n"
+                "\tbare = false\n\tlogallrefupdates = true\n")
+            (self.git_dir / 'description').write_text(
+                "Unnamed repository; edit this file 'description' to name the repository.\n")
+    
+    def write_object(self, kind, data):
+        header = f"{kind} {len(data)}\0".encode('ascii')
+        sha = hashlib.sha1(header + data).hexdigest()
+        path = self.git_dir / 'objects' / sha[:2] / sha[2:]
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temporary.write_bytes(zlib.compress(header + data, 1))
+            temporary.replace(path)
+        return sha
+    
+    def write_tree(self, entries):
+        """entries: {pad: (mode, sha)}; geeft de sha van de root tree terug"""
+        children = {}
+        for path, (mode, sha) in entries.items():
+            name, _, rest = path.partition('/')
+            if rest:
+                children.setdefault(name, {})[rest] = (mode, sha)
+            else:
+                children[name] = (mode, sha)
+        
+        records = []
+        for name, value in children.items():
+            if isinstance(value, dict):
+                records.append((name + '/', b'40000', name, self.write_tree(value)))
+            else:
+                records.append((name, b'%o' % value[0], name, value[1]))
+        # Git sorteert mappen alsof hun naam op '/' eindigt
+        records.sort(key=lambda record: record[0].encode('utf-8'))
+        data = b''.join(mode + b' ' + name.encode('utf-8') + b'\0' + bytes.fromhex(sha)
+                        for _, mode, name, sha in records)
+        return self.write_object('tree', data)
+    
+    def head(self):
+        ref = self.git_dir / 'refs' / 'heads' / self.branch
+        return ref.read_text().strip() if ref.exists() else None
+    
+    def commit(self, tree, message, author, timestamp):
+        parent = self.head()
+        if parent:
+            previous = zlib.decompress((self.git_dir / 'objects' / parent[:2] / parent[2:]).read_bytes())
+            if previous.split(b'\0', 1)[1].startswith(f"tree {tree}\n".encode('ascii')):
+                return None  # Niets gewijzigd
+        lines = [f"tree {tree}"]
+        if parent:
+            lines.append(f"parent {parent}")
+        signature = f"{author} {timestamp} +0000"
+        lines += [f"author {signature}", f"committer {signature}", '', message, '']
+        sha = self.write_object('commit', '\n'.join(lines).encode('utf-8'))
+        (self.git_dir / 'refs' / 'heads' / self.branch).write_text(sha + '\n')
+        return sha
+    
+    def write_index(self, entries):
+        """Schrijft .git/index (versie 2) zodat 'git status' direct schoon is"""
+        records = []
+        for path in sorted(entries, key=lambda p: p.encode('utf-8')):
+            mode, sha, stat = entries[path]
+            name = path.encode('utf-8')
+            record = struct.pack('>10I20sH',
+                                 int(stat.st_ctime) & 0xFFFFFFFF, stat.st_ctime_ns % 10**9,
+                                 int(stat.st_mtime) & 0xFFFFFFFF, stat.st_mtime_ns % 10**9,
+                                 stat.st_dev & 0xFFFFFFFF, stat.st_ino & 0xFFFFFFFF, mode,
+                                 stat.st_uid, stat.st_gid, stat.st_size & 0xFFFFFFFF,
+                                 bytes.fromhex(sha), min(len(name), 0xFFF)) + name
+            records.append(record + b'\0' * (8 - len(record) % 8))
+        data = b'DIRC' + struct.pack('>II', 2, len(records)) + b''.join(records)
+        (self.git_dir / 'index').write_bytes(data + hashlib.sha1(data).digest())
+    
+    def add_all(self, ignored):
+        """Schrijft blobs voor alle niet-genegeerde bestanden; geeft index entries terug"""
+        entries = {}
+        for directory, dirnames, filenames in os.walk(self.root):
+            relative_dir = Path(directory).relative_to(self.root).as_posix()
+            prefix = '' if relative_dir == '.' else relative_dir + '/'
+            dirnames[:] = sorted(d for d in dirnames
+                                 if d != '.git' and not ignored(prefix + d, is_dir=True))
+            for filename in filenames:
+                path = prefix + filename
+                if ignored(path):
+                    continue
+                full_path = Path(directory) / filename
+                stat = full_path.stat()
+                mode = 0o100755 if stat.st_mode & 0o111 else 0o100644
+                entries[path] = (mode, self.write_object('blob', full_path.read_bytes()), stat)
+        return entries
+
+# Records per worker taak bij het renderen van collecties
+PAGE_CHUNK_SIZE = 64
+
+# Standaard aantal items per overzichtspagina
+LISTING_PER_PAGE = 24
+
+def iter_records(source, table=None):
+    """Streamt records (dicts) uit een CSV, JSONL of SQLite bron"""
+    path = Path(source)
+    extension = path.suffix.lower()
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+    elif extension in ('.jsonl', '.ndjson'):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension in ('.db', '.sqlite', '.sqlite3'):
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        connection.row_factory = sqlite3.Row
+        try:
+            for row in connection.execute(f'SELECT * FROM "{table or path.stem}"'):
+                yield dict(row)
+        finally:
+            connection.close()
+    else:
+        raise ValueError(f"Onbekend data formaat: {path}")
+
+def slugify(text):
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Generator instantie per worker proces, opgebouwd in de initializer
+_PAGE_WORKER = None
+
+def _init_page_worker(state):
+    global _PAGE_WORKER
+    _PAGE_WORKER = CompleteWebsiteGenerator.from_state(state)
+
+def _render_page_chunk(collection, records):
+    return [_PAGE_WORKER.render_collection_page(collection, record) for record in records]
+
+class TreeFile(io.BytesIO):
+    """Bestand dat bij close() via write_file naar één of meer paden gaat"""
+    
+    def __init__(self, generator, *relative_paths):
+        super().__init__()
+        self.generator = generator
+        self.relative_paths = relative_paths
+    
+    def close(self):
+        if not self.closed:
+            for relative_path in self.relative_paths:
+                self.generator.write_file(relative_path, self.getvalue())
+        super().close()
+
+class VirtualTree:
+    """In-memory bestandsboom: alle stappen renderen hierin, daarna één flush"""
+    
+    def __init__(self):
+        self.directories = []
+        self.files = {}
+    
+    def add_dir(self, relative_path):
+        if relative_path not in self.directories:
+            self.directories.append(relative_path)
+    
+    def add_file(self, relative_path, content):
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        self.files[relative_path] = data
+        return data
+    
+    def read_text(self, relative_path):
+        return self.files[relative_path].decode('utf-8')
+    
+    def write_to(self, sink):
+        """Schrijft de complete boom in één bulk pass naar een geopende sink"""
+        # Gesorteerd: parallelle stappen vullen de boom in wisselende volgorde,
+        # archives moeten toch reproduceerbaar zijn
+        for relative_path in sorted(self.directories):
+            sink.add_dir(relative_path)
+        for relative_path in sorted(self.files):
+            sink.write_file(relative_path, self.files[relative_path])
+    
+    def flush(self, sink):
+        with sink:
+            self.write_to(sink)
+        return sink
+
+class OutputSink:
+    """Basis voor output sinks (directory, tar, zip, dict)"""
+    
+    def __init__(self):
+        self.files_written = 0
+        self.bytes_written = 0
+        # Timestamp voor archive entries; None = build datum van de generator
+        self.mtime = None
+    
+    def __enter__(self):
+        self.open()
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def open(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    def add_dir(self, relative_path):
+        pass
+    
+    def write_file(self, relative_path, data):
+        raise NotImplementedError
+    
+    def _count(self, data):
+        self.files_written += 1
+        self.bytes_written += len(data)
+
+class DirectorySink(OutputSink):
+    """Schrijft naar een directory; ongewijzigde bestanden worden overgeslagen"""
+    
+    def __init__(self, root, previous_outputs=None, force=False):
+        super().__init__()
+        self.root = Path(root)
+        self.previous_outputs = previous_outputs or {}
+        self.force = force
+    
+    def add_dir(self, relative_path):
+        (self.root / relative_path).mkdir(parents=True, exist_ok=True)
+    
+    def write_file(self, relative_path, data):
+        path = self.root / relative_path
+        previous = self.previous_outputs.get(relative_path)
+        if (not self.force and previous
+                and previous['hash'] == hashlib.sha256(data).hexdigest()
+                and path.is_file() and path.stat().st_size == len(data)):
+            return False
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        self._count(data)
+        return True
+
+class TarSink(OutputSink):
+    """Streamt de boom als tar(.gz) naar een bestand of stdout ('-')"""
+    
+    def __init__(self, target, prefix='', compression='', mtime=None):
+        super().__init__()
+        self.target = target
+        self.prefix = prefix
+        self.compression = compression
+        self.mtime = mtime
+        # stdout nu vastleggen: voortgang wordt later naar stderr omgeleid
+        self.stream = sys.stdout.buffer if target == '-' else None
+        self.archive = None
+    
+    def open(self):
+        # Stream modus ('w|'): werkt ook op niet-seekable streams zoals stdout
+        mode = f"w|{self.compression}"
+        if self.stream:
+            self.archive = tarfile.open(fileobj=self.stream, mode=mode)
+        else:
+            self.archive = tarfile.open(self.target, mode=mode)
+    
+    def close(self):
+        self.archive.close()
+        if self.stream:
+            self.stream.flush()
+    
+    def _info(self, relative_path):
+        info = tarfile.TarInfo(f"{self.prefix}/{relative_path}" if self.prefix else relative_path)
+        info.mtime = self.mtime or 0
+        return info
+    
+    def add_dir(self, relative_path):
+        info = self._info(relative_path)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        self.archive.addfile(info)
+    
+    def write_file(self, relative_path, data):
+        info = self._info(relative_path)
+        info.size = len(data)
+        info.mode = 0o644
+        self.archive.addfile(info, io.BytesIO(data))
+        self._count(data)
+        return True
+
+class ZipSink(OutputSink):
+    """Schrijft de boom als zip naar een bestand of stdout ('-')"""
+    
+    def __init__(self, target, prefix='', mtime=None):
+        super().__init__()
+        self.target = target
+        self.prefix = prefix
+        self.mtime = mtime
+        self.stream = sys.stdout.buffer if target == '-' else None
+        self.archive = None
+        self.date_time = None
+    
+    def open(self):
+        # Zip kan geen datums voor 1980 opslaan
+        self.date_time = time.gmtime(max(self.mtime or 0, 315532800))[:6]
+        self.archive = zipfile.ZipFile(self.stream or self.target, 'w', zipfile.ZIP_DEFLATED)
+    
+    def close(self):
+        self.archive.close()
+    
+    def _name(self, relative_path):
+        return f"{self.prefix}/{relative_path}" if self.prefix else relative_path
+    
+    def add_dir(self, relative_path):
+        self.archive.writestr(zipfile.ZipInfo(self._name(relative_path) + '/', self.date_time), b'')
+    
+    def write_file(self, relative_path, data):
+        info = zipfile.ZipInfo(self._name(relative_path), self.date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.archive.writestr(info, data)
+        self._count(data)
+        return True
+
+class DictSink(OutputSink):
+    """Houdt de output in een dict {relatief pad: bytes}, handig voor tests"""
+    
+    def __init__(self):
+        super().__init__()
+        self.directories = []
+        self.files = {}
+    
+    def add_dir(self, relative_path):
+        self.directories.append(relative_path)
+    
+    def write_file(self, relative_path, data):
+        self.files[relative_path] = data
+        self._count(data)
+        return True
+
+def make_sink(target, prefix='', mtime=None):
+    """Kiest een archive sink op basis van de bestandsnaam ('-' = tar op stdout)"""
+    name = str(target).lower()
+    if name.endswith('.zip'):
+        return ZipSink(target, prefix, mtime)
+    if name.endswith(('.tar.gz', '.tgz')):
+        return TarSink(target, prefix, 'gz', mtime)
+    if name.endswith('.tar.xz'):
+        return TarSink(target, prefix, 'xz', mtime)
+    return TarSink(target, prefix, '', mtime)
+
+def max_rss_kb():
+    """Hoogste resident set size van dit proces in KiB (None zonder resource module)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS rapporteert bytes, Linux KiB
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+class BuildProfiler:
+    """Meet wall tijd, CPU tijd, geschreven bestanden/bytes en piek geheugen per stap
+    
+    Stappen mogen genest zijn: writes en geheugen tellen mee voor alle open stappen.
+    Elke thread heeft een eigen stack, zodat parallelle stappen (StepScheduler)
+    hun writes en CPU tijd niet aan elkaar toeschrijven. Piek geheugen (Python
+    allocaties via tracemalloc) alleen met trace_memory=True; die piek is globaal.
+    De generator stappen tellen de bestanden die ze produceren, de flush stap
+    (SINK_STEPS) telt wat de sink echt schreef. rss_growth_kb is de groei van de
+    proces-brede max RSS tijdens de stap; parallelle stappen delen die meting.
+    """
+    
+    # Stappen die sink I/O meten in plaats van geproduceerde bestanden
+    SINK_STEPS = ('flush',)
+    
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.started_tracing = False
+        self.reset()
+    
+    def reset(self):
+        self.records = []
+        self.local = threading.local()
+        self.sink = None
+        # Planning van de laatste StepScheduler run (tijdlijn en critical path)
+        self.schedule = None
+    
+    @property
+    def stack(self):
+        """Open stappen van de huidige thread"""
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+    
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+    
+    def stop(self):
+        # Alleen stoppen als wij tracemalloc zelf gestart hebben
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+    
+    def _update_peak(self):
+        # Eén globale piek: verdelen over de open stappen en daarna resetten
+        if not (self.trace_memory and tracemalloc.is_tracing()):
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self.stack:
+            record['peak_memory'] = max(record['peak_memory'] or 0, peak)
+        tracemalloc.reset_peak()
+    
+    @contextlib.contextmanager
+    def step(self, name):
+        self._update_peak()
+        record = {
+            'name': name,
+            'parent': self.stack[-1]['name'] if self.stack else None,
+            'wall_time': 0.0,
+            'cpu_time': 0.0,
+            'files_written': 0,
+            'bytes_written': 0,
+            'peak_memory': None,
+            'rss_growth_kb': None,
+        }
+        self.records.append(record)
+        self.stack.append(record)
+        rss = max_rss_kb()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record['wall_time'] = round(time.perf_counter() - wall, 6)
+            record['cpu_time'] = round(time.thread_time() - cpu, 6)
+            self._update_peak()
+            if rss is not None:
+                record['rss_growth_kb'] = max_rss_kb() - rss
+            self.stack.pop()
+    
+    def record_write(self, size, files=1):
+        for record in self.stack:
+            record['files_written'] += files
+            record['bytes_written'] += size
+    
+    def totals(self):
+        """Som over de top-level stappen (bij parallelle stappen meer dan de doorlooptijd)
+        
+        files_written/bytes_written tellen de geproduceerde bestanden; de sink I/O
+        van de flush stap staat in report()['sink']. max_rss_kb is proces-breed.
+        """
+        top = [r for r in self.records if r['parent'] is None]
+        produced = [r for r in top if r['name'] not in self.SINK_STEPS]
+        peaks = [r['peak_memory'] for r in top if r['peak_memory'] is not None]
+        return {
+            'wall_time': round(sum(r['wall_time'] for r in top), 6),
+            'cpu_time': round(sum(r['cpu_time'] for r in top), 6),
+            'files_written': sum(r['files_written'] for r in produced),
+            'bytes_written': sum(r['bytes_written'] for r in produced),
+            'peak_memory': max(peaks) if peaks else None,
+            'max_rss_kb': max_rss_kb(),
+        }
+    
+    def report(self):
+        return {'steps': [dict(r) for r in self.records], 'total': self.totals(),
+                'sink': self.sink, 'schedule': self.schedule}
+
+def aggregate_profiles(reports):
+    """Telt profiel rapporten van meerdere sites op per stap naam"""
+    steps = {}
+    for report in reports:
+        for record in report['steps']:
+            step = steps.setdefault(record['name'], {
+                'runs': 0, 'wall_time': 0.0, 'cpu_time': 0.0,
+                'files_written': 0, 'bytes_written': 0, 'peak_memory': None})
+            step['runs'] += 1
+            for key in ('wall_time', 'cpu_time'):
+                step[key] = round(step[key] + record[key], 6)
+            for key in ('files_written', 'bytes_written'):
+                step[key] += record[key]
+            if record['peak_memory'] is not None:
+                step['peak_memory'] = max(step['peak_memory'] or 0, record['peak_memory'])
+    totals = [report['total'] for report in reports]
+    return {
+        'sites': len(reports),
+        'steps': steps,
+        'total': {
+            'wall_time': round(sum(t['wall_time'] for t in totals), 6),
+            'cpu_time': round(sum(t['cpu_time'] for t in totals), 6),
+            'files_written': sum(t['files_written'] for t in totals),
+            'bytes_written': sum(t['bytes_written'] for t in totals),
+        },
+    }
+
+def profiled(method):
+    """Registreert een generator stap onder de naam van de methode"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.profiler.step(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class StepScheduler:
+    """Voert generator stappen uit als DAG met de timings en het critical path
+    
+    steps is een tabel {naam: (inputs, outputs)} met de resources die een stap
+    leest en schrijft. Een stap hangt af van elke eerder gedeclareerde stap die
+    één van zijn inputs schrijft; latere schrijvers tellen niet mee. De volgorde
+    van de tabel is daarmee een geldige topologische volgorde en een cyclus kan
+    niet ontstaan. Stappen zonder onderlinge afhankelijkheid draaien parallel.
+    """
+    
+    def __init__(self, steps):
+        self.steps = dict(steps)
+        self.dependencies = {}
+        writers = {}
+        for name, (inputs, outputs) in self.steps.items():
+            self.dependencies[name] = sorted({writer for resource in inputs
+                                              for writer in writers.get(resource, ())},
+                                             key=list(self.steps).index)
+            for resource in outputs:
+                writers.setdefault(resource, []).append(name)
+    
+    def downstream(self, names):
+        """De gegeven stappen plus alles wat (indirect) van hun output afhangt"""
+        selected = set(names) & set(self.steps)
+        for name in self.steps:
+            if any(dependency in selected for dependency in self.dependencies[name]):
+                selected.add(name)
+        return selected
+    
+    def run(self, call, names=None, workers=1):
+        """Roept call(naam) aan voor de stappen (standaard alle) en geeft de planning terug
+        
+        Met workers > 1 draaien klare stappen in een thread pool: de stappen delen
+        de generator state, dus een process pool kan niet. Winst zit in stappen
+        die I/O doen of buiten de GIL werken (image encoding, compressie).
+        Afhankelijkheden buiten names gelden als voldaan. De eerste fout wordt
+        doorgegeven nadat de lopende stappen klaar zijn.
+        """
+        names = [name for name in self.steps if names is None or name in names]
+        pending = {name: {d for d in self.dependencies[name] if d in names} for name in names}
+        timings = {}
+        started = time.perf_counter()
+        
+        def execute(name):
+            begin = time.perf_counter() - started
+            call(name)
+            timings[name] = (round(begin, 6), round(time.perf_counter() - started, 6))
+        
+        if workers <= 1:
+            for name in names:
+                execute(name)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='step') as pool:
+                running = {}
+                while pending or running:
+                    for name in [name for name, waiting in pending.items() if not waiting]:
+                        del pending[name]
+                        running[pool.submit(execute, name)] = name
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        future.result()
+                        for waiting in pending.values():
+                            waiting.discard(name)
+        
+        return {
+            'workers': workers,
+            'wall_time': round(time.perf_counter() - started, 6),
+            'steps': {name: {'start': timings[name][0], 'end': timings[name][1],
+                             'dependencies': [d for d in self.dependencies[name] if d in names]}
+                      for name in names},
+            'critical_path': self.critical_path(timings),
+        }
+    
+    def critical_path(self, timings):
+        """Langste keten afhankelijke stappen (naar duur): de ondergrens van de doorlooptijd"""
+        finish, previous = {}, {}
+        for name in self.steps:
+            if name not in timings:
+                continue
+            start, end = timings[name]
+            dependencies = [d for d in self.dependencies[name] if d in finish]
+            before = max(dependencies, key=finish.get, default=None)
+            previous[name] = before
+            finish[name] = (finish[before] if before else 0.0) + end - start
+        if not finish:
+            return {'steps': [], 'wall_time': 0.0}
+        name = max(finish, key=finish.get)
+        total = finish[name]
+        path = []
+        while name:
+            path.append(name)
+            name = previous[name]
+        return {'steps': path[::-1], 'wall_time': round(total, 6)}
+
+# Stappen die de virtuele boom vullen: naam -> (inputs, outputs). De resources:
+#   site       bestanden onder public/ en src/ (samen de server tree)
+#   images     responsive varianten (self.images), nodig in de pagina's
+#   fonts      gesubsette fonts (self.fonts): preloads, @font-face, Link headers
+#   analytics  Partytown lib (self.partytown) voor analytics_mode 'worker'
+#   asset_map  gehashte asset namen van de productie build
+#   repo       project bestanden buiten de server tree (package.json, .gitignore, ...)
+# De volgorde is ook de volgorde met één worker (step_workers = 1).
+TREE_STEPS = {
+    'create_project_structure':   ((), ('repo',)),
+    'create_configuration_files': ((), ('repo',)),
+    'create_robots_txt':          ((), ('site',)),
+    'create_manifest':            ((), ('site',)),
+    'create_404_page':            ((), ('site',)),
+    'create_offline_page':        ((), ('site',)),
+    'create_structured_data':     ((), ('site',)),
+    'create_security_txt':        ((), ('site',)),
+    'create_humans_txt':          ((), ('site',)),
+    'create_gitignore':           ((), ('repo',)),
+    'create_contact_handler':     ((), ('repo',)),
+    'create_images':              ((), ('images', 'site')),
+    'create_fonts':               ((), ('fonts', 'site')),
+    'create_analytics':           ((), ('analytics', 'site')),
+    'create_html_templates':      (('images', 'fonts', 'analytics'), ('site',)),
+    'create_assets':              (('fonts',), ('site',)),
+    # Precache revisies over de definitieve bestanden: wacht op alle eerdere 'site' schrijvers
+    'create_service_worker':      (('site',), ('site',)),
+    'create_readme':              ((), ('repo',)),
+    'create_production_build':    (('site', 'images', 'fonts'), ('asset_map',)),
+    # Schrijft ook public/.htaccess, maar na de build: die hoort niet in dist/ via site_files
+    'create_server_config':       (('asset_map', 'fonts'), ('repo', 'site')),
+}
+
+# Threads voor de boom stappen; meer helpt niet, het meeste werk houdt de GIL vast
+STEP_WORKERS = 4
+
+# Process pools binnen een build starten nooit via fork: create_images draait in een
+# StepScheduler thread en in --watch draait de live reload server ernaast. Fork met
+# levende threads kopieert locks die net vastgehouden worden en kan zo deadlocken.
+POOL_START_METHOD = 'forkserver'
+
+def process_pool(max_workers, **kwargs):
+    """ProcessPoolExecutor met forkserver (spawn waar dat niet bestaat, zoals Windows)"""
+    method = POOL_START_METHOD if POOL_START_METHOD in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method), **kwargs)
+
 class CompleteWebsiteGenerator:
     def __init__(self, project_name="mijn-website", base_path="./projects"):
         self.project_name = project_name
         self.base_path = Path(base_path)
         self.project_path = self.base_path / project_name
         
-        # Project configuratie
-        self.config = {
-            'business_name': 'Mijn Bedrijf',
-            'domain': 'mijnwebsite.nl',
-            'description': 'Professionele website',
-            'ga_tracking_id': '',
-            'gtm_id': '',
-            'keywords': 'website, professioneel, diensten',
-            'services': ['Dienst 1', 'Dienst 2', 'Dienst 3']
+        # Project configuratie
+        self.config = {
+            'business_name': 'Mijn Bedrijf',
+            'domain': 'mijnwebsite.nl',
+            'description': 'Professionele website',
+            'ga_tracking_id': '',
+            'gtm_id': '',
+            'keywords': 'website, professioneel, diensten',
+            'services': ['Dienst 1', 'Dienst 2', 'Dienst 3']
+        }
+        
+        # Incrementele regeneratie
+        self.force = False
+        # Alleen builds naar project_path (DirectorySink) bewaren caches in project_path/.cache
+        self.cache_on_disk = True
+        self.previous_manifest = {}
+        self.outputs = {}
+        # Geschreven in deze run, en per output de top-level stap die het schreef:
+        # bepaalt wat remove_stale_outputs mag opruimen
+        self.emitted = set()
+        self.output_steps = {}
+        self.build_date = None
+        
+        # Alle stappen renderen naar deze virtuele boom
+        self.vfs = VirtualTree()
+        
+        # '/origineel' -> '/gehasht' na de productie build
+        self.asset_map = {}
+        
+        # url -> {hash, lastmod} voor de sitemap
+        self.pages = {}
+        
+        # Productie stylesheets {gehashte href: css} voor critical CSS per pagina
+        self.stylesheets = {}
+        
+        # Gesnoeide kopieën {href: (bron href, css)} per token set, en de tokens uit
+        # JS bundels + safelist die altijd blijven (zie prune_stylesheets)
+        self.pruned_stylesheets = {}
+        self.pruned_sent = set()
+        self.script_tokens = frozenset()
+        
+        # '/assets/images/bron.jpg' -> varianten, gevuld door create_images
+        self.images = {}
+        
+        # Gesubsette fonts [{family, weight, style, url, preload}], gevuld door create_fonts
+        self.fonts = []
+        
+        # In-degree per intern pad (create_production_build), rankt prefetch hints
+        self.link_ranks = {}
+        
+        # Geminificeerde <style> inhoud in SHARED_STYLESHEET, en dist pad -> (bytes voor, na) minify
+        self.shared_styles = []
+        self.html_sizes = {}
+        
+        # Inline Partytown snippet, gevuld door create_analytics in 'worker' modus
+        self.partytown = None
+        
+        # Open sink tijdens de streaming fase: write_file schrijft dan direct door
+        self.stream_sink = None
+        self.collection_counts = {}
+        
+        # Timing/IO/geheugen per stap, zie profile_report()
+        self.profiler = BuildProfiler()
+        
+        # Top-level stap -> gebruikte templates, bepaalt wat een rebuild herhaalt
+        self.template_uses = {}
+        
+        # Resultaat van audit_output (alleen met config['audit'] of config['budgets'])
+        self.audit_report = None
+        # Resultaat van check_output_links (config['check_links'], standaard aan)
+        self.link_report = None
+        self.budget_violations = []
+    
+    def worker_state(self):
+        """Minimale state om in een worker proces pagina's te renderen"""
+        return {
+            'project_name': self.project_name,
+            'base_path': str(self.base_path),
+            'config': self.config,
+            'build_date': self.build_date,
+            'asset_map': self.asset_map,
+            'stylesheets': self.stylesheets,
+            'script_tokens': self.script_tokens,
+            'images': self.images,
+            'fonts': self.fonts,
+            'link_ranks': self.link_ranks,
+            'partytown': self.partytown,
+            'shared_styles': self.shared_styles,
+        }
+    
+    @classmethod
+    def from_state(cls, state):
+        generator = cls(state['project_name'], state['base_path'])
+        generator.config = state['config']
+        generator.build_date = state['build_date']
+        generator.asset_map = state['asset_map']
+        generator.stylesheets = state['stylesheets']
+        generator.script_tokens = state['script_tokens']
+        generator.images = state['images']
+        generator.fonts = state['fonts']
+        generator.link_ranks = state['link_ranks']
+        generator.partytown = state['partytown']
+        generator.shared_styles = state['shared_styles']
+        return generator
+    
+    def input_fingerprint(self):
+        """Hash van alle inputs die de output bepalen"""
+        inputs = {
+            'template_version': TEMPLATE_VERSION,
+            'templates': self.templates.fingerprint(self.templates.template_names()),
+            'project_name': self.project_name,
+            'config': self.config,
+            'sources': [self.source_stat(c) for c in self.config.get('collections', [])],
+            'images': self.image_stats(),
+            'fonts': self.font_stats(),
+        }
+        payload = json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+    
+    @staticmethod
+    def source_stat(collection):
+        """mtime en grootte van een data bron, voor de input fingerprint"""
+        stat = Path(collection['source']).stat()
+        return [str(collection['source']), stat.st_mtime_ns, stat.st_size]
+    
+    def image_stats(self):
+        """Naam, mtime en grootte van de bron afbeeldingen"""
+        return self.source_stats(self.image_source_dir(), IMAGE_EXTENSIONS)
+    
+    def font_stats(self):
+        return self.source_stats(self.font_source_dir(), FONT_EXTENSIONS)
+    
+    @staticmethod
+    def source_stats(source_dir, extensions):
+        if not source_dir.is_dir():
+            return []
+        return [[p.name, p.stat().st_mtime_ns, p.stat().st_size]
+                for p in sorted(source_dir.glob('*')) if p.suffix.lower() in extensions]
+    
+    def load_build_manifest(self):
+        """Leest het hash manifest van de vorige run (indien aanwezig)"""
+        try:
+            with open(self.project_path / BUILD_MANIFEST, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def resolve_build_date(self, fingerprint):
+        """Bepaalt een deterministische datum voor lastmod/humans.txt"""
+        if self.config.get('build_date'):
+            return self.config['build_date']
+        if 'SOURCE_DATE_EPOCH' in os.environ:
+            epoch = int(os.environ['SOURCE_DATE_EPOCH'])
+            return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d')
+        # Ongewijzigde inputs behouden de datum van de vorige generatie
+        if self.previous_manifest.get('inputs') == fingerprint:
+            return self.previous_manifest.get('build_date')
+        return datetime.now().strftime('%Y-%m-%d')
+    
+    def verified_outputs(self):
+        """Manifest outputs die op disk nog byte voor byte kloppen
+        
+        Grootte eerst (goedkoop), daarna de sha256 uit het manifest: een met de
+        hand bewerkt bestand van dezelfde lengte valt zo ook af.
+        """
+        outputs = {}
+        for relative_path, entry in self.previous_manifest.get('outputs', {}).items():
+            path = self.project_path / relative_path
+            if (path.is_file() and path.stat().st_size == entry['size']
+                    and hashlib.sha256(path.read_bytes()).hexdigest() == entry['hash']):
+                outputs[relative_path] = entry
+        return outputs
+    
+    def is_up_to_date(self, fingerprint, verified):
+        """True als inputs ongewijzigd zijn en alle outputs nog kloppen (zie verified_outputs)"""
+        if self.force or self.previous_manifest.get('inputs') != fingerprint:
+            return False
+        return len(verified) == len(self.previous_manifest.get('outputs', {}))
+    
+    @property
+    def templates(self):
+        return get_template_registry(self.config.get('theme_dir'))
+    
+    def render(self, name, **context):
+        """Rendert een template met config, project_name en build_date in de context"""
+        self.track_template(name)
+        context.setdefault('config', self.config)
+        context.setdefault('project_name', self.project_name)
+        context.setdefault('build_date', self.build_date)
+        context.setdefault('font_preloads', font_preload_markup(self.fonts))
+        return self.templates.render(name, context)
+    
+    def track_template(self, name):
+        """Registreert dat de lopende top-level stap dit template gebruikt (voor rebuilds)"""
+        step = self.profiler.stack[0]['name'] if self.profiler.stack else None
+        self.template_uses.setdefault(step, set()).add(name)
+    
+    def template_stats(self):
+        """Render statistieken per template, cumulatief over alle projecten in dit proces"""
+        return {name: dict(stats, average=stats['seconds'] / stats['renders'])
+                for name, stats in sorted(self.templates.stats.items())}
+    
+    def write_file(self, relative_path, content):
+        """Rendert een bestand in de virtuele boom en registreert de hash"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        self.outputs[relative_path] = {'hash': hashlib.sha256(data).hexdigest(), 'size': len(data)}
+        self.emitted.add(relative_path)
+        self.output_steps[relative_path] = self.profiler.stack[0]['name'] if self.profiler.stack else None
+        self.profiler.record_write(len(data))
+        if self.stream_sink:
+            self.stream_sink.write_file(relative_path, data)
+        else:
+            self.vfs.add_file(relative_path, data)
+    
+    def profile_report(self):
+        """Machine-leesbaar rapport met metingen per stap van de laatste run"""
+        return dict(self.profiler.report(), project=self.project_name,
+                    template_version=TEMPLATE_VERSION)
+    
+    def write_dist(self, relative_path, content):
+        """Schrijft een productie bestand plus voorgecomprimeerde .gz/.br varianten"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        self.write_file(f"dist/{relative_path}", data)
+        if self.config.get('precompress', True):
+            for suffix, compressed in precompress(relative_path, data).items():
+                self.write_file(f"dist/{relative_path}{suffix}", compressed)
+    
+    def build_mtime(self):
+        """Unix timestamp van de build datum (voor archive entries)"""
+        return int(datetime.strptime(self.build_date, '%Y-%m-%d')
+                   .replace(tzinfo=timezone.utc).timestamp())
+    
+    def remove_stale_outputs(self, previous_outputs, steps=None):
+        """Verwijdert outputs van de vorige build die deze build niet opnieuw schreef
+        
+        Anders blijven bijv. main.<oude hash>.css en zijn .br/.gz in dist/ staan en
+        wijkt een incrementele build af van een schone. steps beperkt het opruimen
+        tot outputs van die stappen (partiële rebuild); None = alle outputs.
+        """
+        removed = 0
+        for relative_path in sorted(set(previous_outputs) - self.emitted):
+            if steps is not None and self.output_steps.get(relative_path) not in steps:
+                continue
+            self.outputs.pop(relative_path, None)
+            self.output_steps.pop(relative_path, None)
+            path = self.project_path / relative_path
+            for stale in (path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')):
+                if stale.is_file() and (stale == path or stale.relative_to(self.project_path).as_posix()
+                                        not in self.emitted):
+                    stale.unlink()
+                    removed += 1
+            # Leeg geraakte directories (bijv. een verdwenen collectie pagina), niet de project structuur
+            parent = path.parent
+            while (parent != self.project_path and parent.is_dir() and not any(parent.iterdir())
+                   and parent.relative_to(self.project_path).as_posix() not in self.vfs.directories):
+                parent.rmdir()
+                parent = parent.parent
+        if removed:
+            print(f"🧹 {removed} verouderde bestanden verwijderd")
+        return removed
+    
+    def save_build_manifest(self, fingerprint):
+        """Legt input en output hashes vast voor de volgende run"""
+        manifest = {
+            'template_version': TEMPLATE_VERSION,
+            'inputs': fingerprint,
+            'build_date': self.build_date,
+            'outputs': dict(sorted(self.outputs.items())),
+            'pages': dict(sorted(self.pages.items())),
         }
+        if manifest != self.previous_manifest:
+            with open(self.project_path / BUILD_MANIFEST, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
     
-    def run_generator(self):
-        """Voert complete generatie uit"""
+    def run_generator(self, sink=None):
+        """Voert complete generatie uit (standaard naar project_path)"""
         print(f"\n🚀 Ultra Professional Website Generator")
         print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         print(f"Project: {self.project_name}")
         print(f"Locatie: {self.project_path.absolute()}")
         print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
         
-        # Stap 1: Project structuur
-        self.create_project_structure()
+        self.profiler.reset()
+        self.profiler.start()
+        try:
+            return self._run_steps(sink)
+        finally:
+            self.profiler.stop()
+    
+    def _run_steps(self, sink):
+        """De generatie stappen zelf; run_generator regelt de profiler"""
+        with self.profiler.step('fingerprint'):
+            self.previous_manifest = self.load_build_manifest()
+            fingerprint = self.input_fingerprint()
+            self.build_date = self.resolve_build_date(fingerprint)
+        
+        to_directory = sink is None or isinstance(sink, DirectorySink)
+        # Alleen outputs die op disk nog kloppen mogen als ongewijzigd overgeslagen worden
+        verified = self.verified_outputs() if to_directory and not self.force else {}
+        if sink is None:
+            sink = DirectorySink(self.project_path, verified, self.force)
+        
+        if to_directory and self.is_up_to_date(fingerprint, verified):
+            print("⏭️  Inputs ongewijzigd, project is up-to-date")
+            # Budgets opnieuw toetsen: een gefaalde build mag niet groen worden door hem te herhalen
+            if self.config.get('audit') or self.config.get('budgets'):
+                self.audit_output()
+            return self.project_path
         
-        # Stap 2: Configuratie bestanden
-        self.create_configuration_files()
+        # Stap 1-7: alle stappen renderen naar de virtuele boom
+        self.cache_on_disk = to_directory
+        self.outputs = {}
+        self.emitted = set()
+        self.render_tree()
         
-        # Stap 3: Alle base bestanden
-        self.create_all_base_files()
+        # Stap 8: Bulk flush van de virtuele boom, daarna streamen
+        # collecties en sitemap direct naar de sink
+        self.write_output(sink)
+        if to_directory:
+            self.remove_stale_outputs(self.previous_manifest.get('outputs', {}))
+        print(f"\n📄 {sink.files_written}/{len(self.outputs)} bestanden geschreven "
+              f"({sink.bytes_written} bytes)")
+        # Werkelijk naar de sink geschreven (ongewijzigde bestanden worden overgeslagen)
+        self.profiler.sink = {'files_written': sink.files_written, 'bytes_written': sink.bytes_written}
         
-        # Stap 4: HTML templates
-        self.create_html_templates()
+        if not to_directory:
+            return sink
         
-        # Stap 5: CSS & JavaScript
-        self.create_assets()
+        if self.config.get('audit') or self.config.get('budgets'):
+            self.audit_output()
+        if self.config.get('check_links', True):
+            self.check_output_links()
         
-        # Stap 6: Git initialisatie
+        # Stap 9: Git initialisatie (alleen op een echte directory)
         self.init_git_repository()
         
-        # Stap 7: README
-        self.create_readme()
+        with self.profiler.step('save_build_manifest'):
+            self.save_build_manifest(fingerprint)
         
         print(f"\n✨ Project '{self.project_name}' succesvol gegenereerd!")
         print(f"\n📋 Volgende stappen:")
@@ -68,6 +3365,74 @@ class CompleteWebsiteGenerator:
         
         return self.project_path
     
+    def render_tree(self, steps=None):
+        """Vult de virtuele boom; steps beperkt een rebuild tot die stappen plus wat ervan afhangt"""
+        scheduler = StepScheduler(TREE_STEPS)
+        names = None if steps is None else scheduler.downstream(steps)
+        # Alleen wat deze run emitteert mag in de boom staan: site_files() kopieert
+        # alles wat er nog in staat naar dist/, ook outputs die geen stap meer maakt
+        if names is None:
+            self.vfs = VirtualTree()
+        else:
+            for relative_path, step in self.output_steps.items():
+                if step in names:
+                    self.vfs.files.pop(relative_path, None)
+        self.profiler.schedule = scheduler.run(lambda step: getattr(self, step)(), names,
+                                               self.step_workers())
+    
+    def step_workers(self):
+        return self.config.get('step_workers') or min(STEP_WORKERS, os.cpu_count() or 1)
+    
+    def write_output(self, sink, collections=True):
+        """Flusht de virtuele boom naar de sink en streamt collecties en sitemap erachteraan"""
+        if sink.mtime is None:
+            sink.mtime = self.build_mtime()
+        with sink:
+            with self.profiler.step('flush'):
+                files, size = sink.files_written, sink.bytes_written
+                self.vfs.write_to(sink)
+                self.profiler.record_write(sink.bytes_written - size, sink.files_written - files)
+            self.stream_sink = sink
+            try:
+                if collections:
+                    self.create_collections()
+                self.create_sitemap()
+            finally:
+                self.stream_sink = None
+        return sink
+    
+    def rebuild(self, changed_templates=None):
+        """Incrementele rebuild voor watch mode (geen git, geen audit)
+        
+        Met changed_templates worden alleen de stappen herhaald die één van die
+        templates renderden, plus de stappen die van hun output afhangen (service
+        worker, productie build, server config). None = alles.
+        Geeft de sink terug, of None als geen enkele stap geraakt werd.
+        """
+        steps = None
+        if changed_templates is not None:
+            steps = {step for step, names in self.template_uses.items() if names & changed_templates}
+            if not steps:
+                return None
+        
+        self.profiler.reset()
+        previous_outputs = dict(self.outputs)
+        fingerprint = self.input_fingerprint()
+        if steps is None:
+            self.build_date = self.resolve_build_date(fingerprint)
+        self.emitted = set()
+        self.render_tree(steps)
+        collections = steps is None or 'create_collections' in steps
+        sink = self.write_output(DirectorySink(self.project_path, previous_outputs), collections=collections)
+        if steps is not None:
+            steps = set(self.profiler.schedule['steps']) | {'create_sitemap'} \
+                | ({'create_collections'} if collections else set())
+        self.remove_stale_outputs(previous_outputs, steps)
+        self.save_build_manifest(fingerprint)
+        self.previous_manifest = self.load_build_manifest()
+        return sink
+    
+    @profiled
     def create_project_structure(self):
         """Creëert complete project structuur"""
         print("🏗️  Creëren project structuur...")
@@ -85,11 +3450,11 @@ class CompleteWebsiteGenerator:
         ]
         
         for directory in directories:
-            dir_path = self.project_path / directory
-            dir_path.mkdir(parents=True, exist_ok=True)
+            self.vfs.add_dir(directory)
         
         print("   ✅ Project structuur aangemaakt")
     
+    @profiled
     def create_configuration_files(self):
         """Genereert alle configuratie bestanden"""
         print("📝 Genereren configuratie bestanden...")
@@ -105,7 +3470,9 @@ class CompleteWebsiteGenerator:
                 "preview": "vite preview",
                 "deploy": "netlify deploy --prod",
                 "test": "echo 'Tests not yet implemented'",
-                "lint": "eslint src --ext .js,.html"
+                "lint": "eslint src --ext .js,.html",
+                "api": "python3 api/contact/handler.py",
+                "loadtest": "python3 tools/loadtest_contact.py"
             },
             "devDependencies": {
                 "vite": "^5.0.0",
@@ -113,32 +3480,12 @@ class CompleteWebsiteGenerator:
             }
         }
         
-        with open(self.project_path / "package.json", 'w') as f:
-            json.dump(package_json, f, indent=2)
+        if self.config.get('analytics_mode') == 'worker':
+            package_json["devDependencies"]["@builder.io/partytown"] = "^0.10.0"
         
-        # Netlify configuratie
-        netlify_toml = """[build]
-  command = "npm run build"
-  publish = "dist"
-
-[build.environment]
-  NODE_VERSION = "18"
-
-[[redirects]]
-  from = "/*"
-  to = "/index.html"
-  status = 200
-
-[[headers]]
-  for = "/*"
-  [headers.values]
-    X-Frame-Options = "SAMEORIGIN"
-    X-XSS-Protection = "1; mode=block"
-    X-Content-Type-Options = "nosniff"
-"""
+        self.write_file("package.json", json.dumps(package_json, indent=2))
         
-        with open(self.project_path / "netlify.toml", 'w') as f:
-            f.write(netlify_toml)
+        # netlify.toml volgt na de productie build (create_server_config)
         
         # VS Code settings
         vscode_settings = {
@@ -149,30 +3496,24 @@ class CompleteWebsiteGenerator:
             }
         }
         
-        with open(self.project_path / ".vscode" / "settings.json", 'w') as f:
-            json.dump(vscode_settings, f, indent=2)
+        self.write_file(".vscode/settings.json", json.dumps(vscode_settings, indent=2))
         
         print("   ✅ Configuratie bestanden gegenereerd")
     
+    @profiled
     def create_all_base_files(self):
-        """Genereert ALLE base bestanden uit webdevtools"""
+        """Genereert ALLE base bestanden uit webdevtools
+        
+        run_generator plant deze stappen los via TREE_STEPS; dit is de sequentiële variant.
+        """
         print("📂 Genereren alle base bestanden...")
         
         # robots.txt
         self.create_robots_txt()
         
-        # sitemap.xml
-        self.create_sitemap()
-        
         # manifest.json
         self.create_manifest()
         
-        # .htaccess
-        self.create_htaccess()
-        
-        # service-worker.js
-        self.create_service_worker()
-        
         # 404.html
         self.create_404_page()
         
@@ -193,43 +3534,70 @@ class CompleteWebsiteGenerator:
         
         print("   ✅ Alle base bestanden gegenereerd")
     
+    def contact_settings(self):
+        """CONTACT_DEFAULTS met config['contact'] eroverheen"""
+        settings = self.config.get('contact') or {}
+        unknown = sorted(set(settings) - set(CONTACT_DEFAULTS))
+        if unknown:
+            raise ValueError(f"Onbekende contact instelling(en): {', '.join(unknown)} "
+                             f"(kies uit {', '.join(CONTACT_DEFAULTS)})")
+        return dict(CONTACT_DEFAULTS, **settings)
+    
+    @profiled
+    def create_contact_handler(self):
+        """POST /api/contact: asyncio handler, Netlify Function en een load test"""
+        print("📮 Genereren contactformulier endpoint...")
+        settings = self.contact_settings()
+        self.write_file("api/contact/handler.py",
+                        self.render('api/handler.py', settings=pprint.pformat(settings, width=100, sort_dicts=False)))
+        self.write_file(".netlify/functions/contact.mjs",
+                        self.render('api/netlify-contact.mjs', settings=json.dumps(settings, indent=4)))
+        self.write_file("tools/loadtest_contact.py",
+                        self.render('tools/loadtest_contact.py', port=settings['port']))
+        print(f"   ✅ Handler op poort {settings['port']}, opslag in {settings['store']}")
+    
+    @profiled
     def create_robots_txt(self):
-        content = f"""# robots.txt voor {self.config['business_name']}
-User-agent: *
-Allow: /
-
-# AI Crawlers
-User-agent: GPTBot
-Allow: /
-
-User-agent: Google-Extended
-Allow: /
-
-User-agent: Claude-Web
-Allow: /
-
-User-agent: CCBot
-Allow: /
-
-# Sitemap
-Sitemap: https://{self.config['domain']}/sitemap.xml
-"""
-        with open(self.project_path / "public" / "robots.txt", 'w') as f:
-            f.write(content)
-    
-    def create_sitemap(self):
-        content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url>
-    <loc>https://{self.config['domain']}/</loc>
-    <lastmod>{datetime.now().strftime('%Y-%m-%d')}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>1.0</priority>
-  </url>
-</urlset>"""
-        with open(self.project_path / "public" / "sitemap.xml", 'w') as f:
-            f.write(content)
+        content = self.render('robots.txt')
+        self.write_file("public/robots.txt", content)
+    
+    def page_lastmod(self, url, data):
+        """lastmod uit de content hash: ongewijzigde pagina's houden hun datum"""
+        digest = content_hash(data)
+        previous = self.previous_manifest.get('pages', {}).get(url)
+        lastmod = previous['lastmod'] if previous and previous['hash'] == digest else self.build_date
+        self.pages[url] = {'hash': digest, 'lastmod': lastmod}
+        return lastmod
+    
+    def sitemap_entries(self):
+        """Alle gegenereerde pagina's als (url, lastmod)"""
+        for relative_path, data in sorted(self.site_files().items()):
+            if relative_path.endswith('.html') and relative_path.rsplit('/', 1)[-1] not in SITEMAP_EXCLUDE:
+                url = page_url(relative_path)
+                yield url, self.page_lastmod(url, data)
+    
+    @profiled
+    def create_sitemap(self, entries=None):
+        """Streamt de sitemap naar gzipped shards met een sitemap index"""
+        print("🗺️  Genereren sitemap...")
+        
+        def open_file(name):
+            return TreeFile(self, f"public/{name}", f"dist/{name}")
+        
+        if entries is None:
+            entries = itertools.chain(self.sitemap_entries(), *(
+                self.collection_sitemap_entries(c) for c in self.config.get('collections', [])))
+        
+        writer = SitemapWriter(f"https://{self.config['domain']}", open_file, self.build_mtime())
+        for url, lastmod in entries:
+            writer.add(url, lastmod, 'weekly', '1.0' if url == '/' else '0.8')
+        index = writer.close()
+        self.write_file(f"public/{SITEMAP_INDEX}", index)
+        self.write_file(f"dist/{SITEMAP_INDEX}", index)
+        
+        print(f"   ✅ {writer.urls} URLs in {len(writer.shards)} shard(s)")
     
+    @profiled
     def create_manifest(self):
         manifest = {
             "name": self.config['business_name'],
@@ -252,118 +3620,117 @@ Sitemap: https://{self.config['domain']}/sitemap.xml
                 }
             ]
         }
-        with open(self.project_path / "public" / "manifest.json", 'w') as f:
-            json.dump(manifest, f, indent=2)
+        self.write_file("public/manifest.json", json.dumps(manifest, indent=2))
     
+    @profiled
     def create_htaccess(self):
-        content = """# .htaccess - Apache configuratie
-# Force HTTPS
-RewriteEngine On
-RewriteCond %{HTTPS} off
-RewriteRule ^(.*)$ https://%{HTTP_HOST}%{REQUEST_URI} [L,R=301]
-
-# Error pages
-ErrorDocument 404 /404.html
-
-# Security Headers
-<IfModule mod_headers.c>
-    Header always set X-Frame-Options "SAMEORIGIN"
-    Header always set X-XSS-Protection "1; mode=block"
-    Header always set X-Content-Type-Options "nosniff"
-</IfModule>
-
-# Caching
-<IfModule mod_expires.c>
-    ExpiresActive On
-    ExpiresByType image/jpg "access plus 1 month"
-    ExpiresByType image/jpeg "access plus 1 month"
-    ExpiresByType image/png "access plus 1 month"
-    ExpiresByType text/css "access plus 1 month"
-    ExpiresByType application/javascript "access plus 1 month"
-</IfModule>
-"""
-        with open(self.project_path / "public" / ".htaccess", 'w') as f:
-            f.write(content)
+        content = self.render('htaccess', compression=apache_compression(),
+                              cache_rules=apache_cache_rules(self.cache_policy(), self.preload_links()))
+        self.write_file("public/.htaccess", content)
+        self.write_file("dist/.htaccess", content)
+    
+    def cache_policy(self):
+        return self.config.get('cache_policy', CACHE_POLICY)
+    
+    def preload_links(self, asset_map=None):
+        """Link header met de gehashte preload assets (na de productie build)
+        
+        Met prune_css linkt elke pagina zijn eigen gesnoeide kopie en preloadt die
+        al in de HTML; de volledige stylesheet in de header zou elke HTML response
+        beide laten downloaden. Stylesheets blijven dan uit de header.
+        """
+        fonts = [font['url'] for font in self.fonts if font['preload']]
+        assets = self.config.get('preload', PRELOAD_ASSETS) + fonts
+        if self.config.get('prune_css', True):
+            assets = [asset for asset in assets if not asset.endswith('.css')]
+        return preload_links(self.asset_map if asset_map is None else asset_map, assets)
+    
+    @profiled
+    def create_server_config(self):
+        """Netlify, Apache en nginx config uit één cache policy"""
+        print("🛰️  Genereren server configuratie...")
+        policy = self.cache_policy()
+        links = self.preload_links()
+        self.write_file("netlify.toml", self.render('netlify.toml',
+                                                    cache_headers=netlify_cache_headers(policy, links)))
+        self.create_htaccess()
+        self.write_file("config/nginx.conf", self.render('nginx.conf',
+                                                         preload_links=links,
+                                                         contact=self.contact_settings(),
+                                                         compression=nginx_compression(),
+                                                         cache_locations=nginx_cache_locations(policy)))
     
+    def check_server_config(self):
+        """Verschillen tussen de geëmitteerde configs en de cache policy"""
+        def read(relative_path):
+            path = self.project_path / relative_path
+            return path.read_text(encoding='utf-8') if path.is_file() else None
+        
+        dist = self.project_path / 'dist'
+        urls = ['/'] + sorted('/' + p.relative_to(dist).as_posix()
+                              for p in dist.rglob('*') if p.is_file())
+        asset_map = dict(self.asset_map)
+        if not asset_map:
+            # Losse check zonder build: gehashte namen terugvinden in dist/ (alleen
+            # voor deze check, de generator state blijft ongemoeid)
+            for url in urls:
+                match = re.match(rf'^(/assets/.+)\.[0-9a-f]{{{ASSET_HASH_LENGTH}}}(\.\w+)$', url)
+                if match:
+                    asset_map[match.group(1) + match.group(2)] = url
+        return check_server_config(urls, self.cache_policy(),
+                                   links=self.preload_links(asset_map),
+                                   netlify=read('netlify.toml'),
+                                   htaccess=read('public/.htaccess'),
+                                   nginx=read('config/nginx.conf'))
+    
+    def precache_entries(self, files):
+        """Precache lijst met revisie hash, afgeleid van de echte output"""
+        entries = []
+        for relative_path in sorted(files):
+            name = relative_path.rsplit('/', 1)[-1]
+            if (relative_path.startswith('.') or name in SW_PRECACHE_EXCLUDE
+                    or not name.endswith(SW_PRECACHE_EXTENSIONS)):
+                continue
+            # Alleen top-level pagina's; diepere pagina's cachet de HTML route
+            if name.endswith('.html') and '/' in relative_path:
+                continue
+            # Responsive varianten: de browser kiest er één, runtime cache-first
+            if relative_path.startswith('assets/images/'):
+                continue
+            revision = content_hash(files[relative_path])
+            if relative_path == 'index.html':
+                entries.append({'url': '/', 'revision': revision})
+            entries.append({'url': '/' + relative_path, 'revision': revision})
+        return entries
+    
+    def render_service_worker(self, files, indent=2):
+        """Rendert de service worker voor een output tree ({pad: bytes})"""
+        precache = self.precache_entries(files)
+        build = content_hash(json.dumps(precache, sort_keys=True).encode('utf-8'))
+        return self.render('service-worker.js',
+                           cache_prefix=f"{self.project_name}-",
+                           cache_name=f"{self.project_name}-{build}",
+                           offline_url=SW_OFFLINE_URL,
+                           precache=json.dumps(precache, indent=indent),
+                           routes=json.dumps(self.config.get('sw_routes', SW_ROUTES), indent=indent))
+    
+    @profiled
     def create_service_worker(self):
-        content = """// Service Worker voor Progressive Web App
-const CACHE_NAME = 'v1';
-
-self.addEventListener('install', event => {
-  event.waitUntil(
-    caches.open(CACHE_NAME).then(cache => {
-      return cache.addAll([
-        '/',
-        '/index.html',
-        '/assets/css/main.css',
-        '/assets/js/main.js'
-      ]);
-    })
-  );
-});
-
-self.addEventListener('fetch', event => {
-  event.respondWith(
-    caches.match(event.request).then(response => {
-      return response || fetch(event.request);
-    })
-  );
-});
-"""
-        with open(self.project_path / "public" / "service-worker.js", 'w') as f:
-            f.write(content)
+        """Genereert de service worker voor de development tree (src + public)"""
+        content = self.render_service_worker(self.site_files())
+        self.write_file("public/service-worker.js", content)
     
+    @profiled
     def create_404_page(self):
-        content = f"""<!DOCTYPE html>
-<html lang="nl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>404 - Pagina niet gevonden | {self.config['business_name']}</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            min-height: 100vh;
-            margin: 0;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            text-align: center;
-        }}
-        h1 {{ font-size: 6rem; margin: 0; }}
-        p {{ font-size: 1.5rem; }}
-        a {{ color: white; text-decoration: underline; }}
-    </style>
-</head>
-<body>
-    <div>
-        <h1>404</h1>
-        <p>Pagina niet gevonden</p>
-        <a href="/">Terug naar home</a>
-    </div>
-</body>
-</html>"""
-        with open(self.project_path / "src" / "404.html", 'w') as f:
-            f.write(content)
+        content = self.render('404.html')
+        self.write_file("src/404.html", content)
     
+    @profiled
     def create_offline_page(self):
-        content = """<!DOCTYPE html>
-<html lang="nl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Offline</title>
-</head>
-<body>
-    <h1>Geen internetverbinding</h1>
-    <p>U bent momenteel offline. Controleer uw internetverbinding.</p>
-</body>
-</html>"""
-        with open(self.project_path / "src" / "offline.html", 'w') as f:
-            f.write(content)
+        content = self.render('offline.html')
+        self.write_file("src/offline.html", content)
     
+    @profiled
     def create_structured_data(self):
         data = {
             "@context": "https://schema.org",
@@ -372,472 +3739,903 @@ self.addEventListener('fetch', event => {
             "url": f"https://{self.config['domain']}",
             "description": self.config['description']
         }
-        with open(self.project_path / "public" / "structured-data.json", 'w') as f:
-            json.dump(data, f, indent=2)
+        self.write_file("public/structured-data.json", json.dumps(data, indent=2))
     
+    @profiled
     def create_security_txt(self):
-        content = f"""Contact: mailto:security@{self.config['domain']}
-Expires: 2026-12-31T23:59:59.000Z
-Preferred-Languages: nl, en
-"""
-        with open(self.project_path / "public" / ".well-known" / "security.txt", 'w') as f:
-            f.write(content)
+        content = self.render('security.txt')
+        self.write_file("public/.well-known/security.txt", content)
     
+    @profiled
     def create_humans_txt(self):
-        content = f"""/* TEAM */
-    Bedrijf: {self.config['business_name']}
-    Website: {self.config['domain']}
-    
-/* WEBSITE */
-    Laatste update: {datetime.now().strftime('%Y/%m/%d')}
-    Taal: Nederlands
-    Doctype: HTML5
-    
-    Gemaakt met Ultra Professional Website Generator
-"""
-        with open(self.project_path / "public" / "humans.txt", 'w') as f:
-            f.write(content)
+        content = self.render('humans.txt', update_date=self.build_date.replace('-', '/'))
+        self.write_file("public/humans.txt", content)
     
+    @profiled
     def create_gitignore(self):
-        content = """# Dependencies
-node_modules/
-vendor/
-
-# Build output
-dist/
-build/
-
-# Environment
-.env
-.env.local
-
-# IDE
-.vscode/
-.idea/
-
-# OS
-.DS_Store
-Thumbs.db
-
-# Logs
-*.log
-"""
-        with open(self.project_path / ".gitignore", 'w') as f:
-            f.write(content)
+        content = self.render('gitignore')
+        self.write_file(".gitignore", content)
     
+    @profiled
     def create_html_templates(self):
         """Genereert HTML templates"""
         print("🎨 Genereren HTML templates...")
         
         # Hoofdpagina index.html
-        html = f"""<!DOCTYPE html>
-<html lang="nl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{self.config['business_name']} - {self.config['description']}</title>
-    <meta name="description" content="{self.config['description']}">
-    <meta name="keywords" content="{self.config['keywords']}">
-    
-    <!-- Favicon -->
-    <link rel="icon" href="/favicon.ico">
-    <link rel="manifest" href="/manifest.json">
-    <meta name="theme-color" content="#667eea">
-    
-    <!-- Stylesheets -->
-    <link rel="stylesheet" href="/assets/css/main.css">
-    
-    <!-- Google Analytics (indien geconfigureerd) -->
-    {self.get_analytics_script()}
-</head>
-<body>
-    <!-- Header -->
-    <header class="header">
-        <nav class="nav">
-            <div class="container">
-                <a href="/" class="logo">{self.config['business_name']}</a>
-                <ul class="nav-menu">
-                    <li><a href="#home">Home</a></li>
-                    <li><a href="#diensten">Diensten</a></li>
-                    <li><a href="#contact">Contact</a></li>
-                </ul>
-            </div>
-        </nav>
-    </header>
-
-    <!-- Hero Section -->
-    <section class="hero" id="home">
-        <div class="container">
-            <h1>{self.config['business_name']}</h1>
-            <p>{self.config['description']}</p>
-            <a href="#contact" class="btn">Neem Contact Op</a>
-        </div>
-    </section>
-
-    <!-- Diensten Section -->
-    <section class="diensten" id="diensten">
-        <div class="container">
-            <h2>Onze Diensten</h2>
-            <div class="diensten-grid">
-                {self.generate_service_cards()}
-            </div>
-        </div>
-    </section>
-
-    <!-- Contact Section -->
-    <section class="contact" id="contact">
-        <div class="container">
-            <h2>Contact</h2>
-            <form action="/api/contact" method="POST" class="contact-form">
-                <input type="text" name="name" placeholder="Naam" required>
-                <input type="email" name="email" placeholder="E-mail" required>
-                <textarea name="message" placeholder="Bericht" required></textarea>
-                <button type="submit" class="btn">Verstuur</button>
-            </form>
-        </div>
-    </section>
-
-    <!-- Footer -->
-    <footer class="footer">
-        <div class="container">
-            <p>&copy; 2025 {self.config['business_name']}. Alle rechten voorbehouden.</p>
-        </div>
-    </footer>
-
-    <!-- Scripts -->
-    <script src="/assets/js/main.js"></script>
-</body>
-</html>"""
-        
-        with open(self.project_path / "src" / "index.html", 'w') as f:
-            f.write(html)
+        html = self.render('index.html',
+                           analytics=self.get_analytics_script(),
+                           service_cards=self.generate_service_cards(),
+                           hero_image=self.hero_image(),
+                           contact=self.contact_settings())
+        
+        self.write_file("src/index.html", self.responsive_images(html))
         
         print("   ✅ HTML templates gegenereerd")
     
-    def get_analytics_script(self):
-        if not self.config.get('ga_tracking_id'):
+    def image_source_dir(self):
+        return Path(self.config.get('image_dir') or self.project_path / 'src' / 'assets' / 'images')
+    
+    @profiled
+    def create_images(self):
+        """Zet bron afbeeldingen om naar responsive AVIF/WebP/JPEG varianten"""
+        source_dir = self.image_source_dir()
+        sources = sorted(p for p in source_dir.glob('*') if p.suffix.lower() in IMAGE_EXTENSIONS) \
+            if source_dir.is_dir() else []
+        if not sources:
+            return
+        
+        print("🖼️  Verwerken afbeeldingen...")
+        if Image is None:
+            print("   ⚠️  Pillow niet beschikbaar, afbeeldingen overgeslagen")
+            return
+        
+        requested = self.config.get('image_formats', IMAGE_FORMATS)
+        formats = available_image_formats(requested)
+        if not formats:
+            # Bijv. alleen avif zonder AVIF support in deze Pillow
+            formats = available_image_formats(['jpeg'])
+            print(f"   ⚠️  {', '.join(requested)} niet beschikbaar in Pillow, terugvallen op jpeg")
+            if not formats:
+                return
+        breakpoints = self.config.get('image_breakpoints', IMAGE_BREAKPOINTS)
+        with self.build_cache(IMAGE_CACHE_DIR) as cache_dir:
+            # Alleen afbeeldingen zonder complete cache entry gaan naar de pool
+            jobs = {}
+            metas = {}
+            for source in sources:
+                settings = json.dumps([formats, breakpoints, IMAGE_QUALITY], sort_keys=True).encode('utf-8')
+                digest = hashlib.sha256(source.read_bytes() + settings).hexdigest()[:16]
+                meta_path = cache_dir / f"{digest}.json"
+                if meta_path.exists():
+                    meta = json.loads(meta_path.read_text(encoding='utf-8'))
+                    if all((cache_dir / v['cache']).exists() for v in meta['variants']):
+                        metas[source] = meta
+                        continue
+                jobs[source] = digest
+            
+            if jobs:
+                arguments = [(str(source), digest, str(cache_dir), breakpoints, formats)
+                             for source, digest in jobs.items()]
+                if self.workers() > 1 and len(jobs) > 1:
+                    with process_pool(min(self.workers(), len(jobs))) as pool:
+                        results = pool.map(_encode_image, *zip(*arguments))
+                        metas.update(zip(jobs, results))
+                else:
+                    metas.update((source, _encode_image(*args)) for source, args in zip(jobs, arguments))
+            
+            for source in sources:
+                meta = metas[source]
+                for variant in meta['variants']:
+                    data = (cache_dir / variant['cache']).read_bytes()
+                    name = f"{source.stem}-{variant['width']}.{content_hash(data)}.{IMAGE_FILE_EXTENSIONS[variant['format']]}"
+                    self.write_file(f"public/assets/images/{name}", data)
+                    variant['url'] = f"/assets/images/{name}"
+                self.images[f"/assets/images/{source.name}"] = meta
+        
+        print(f"   ✅ {len(sources)} afbeeldingen, {len(jobs)} opnieuw ge-encodeerd "
+              f"({', '.join(formats)})")
+    
+    @contextlib.contextmanager
+    def build_cache(self, relative_dir):
+        """Cache directory voor ge-encodeerde afbeeldingen en font subsets
+        
+        config['cache_dir'] wint; anders project_path/.cache voor builds naar
+        project_path. Archive en DictSink builds raken project_path niet aan en
+        krijgen een tijdelijke directory.
+        """
+        if self.config.get('cache_dir'):
+            cache_dir = Path(self.config['cache_dir']) / Path(relative_dir).name
+        elif self.cache_on_disk:
+            cache_dir = self.project_path / relative_dir
+        else:
+            with tempfile.TemporaryDirectory(prefix='generator-cache-') as scratch:
+                yield Path(scratch)
+            return
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        yield cache_dir
+    
+    def font_source_dir(self):
+        return Path(self.config.get('font_dir') or self.project_path / 'src' / 'assets' / 'fonts')
+    
+    def font_characters(self):
+        """Tekens die de pagina's kunnen bevatten: basis set, templates en config"""
+        registry = self.templates
+        documents = [registry.resolve(name).read_text(encoding='utf-8', errors='replace')
+                     for name in sorted(registry.template_names())]
+        documents.append(json.dumps(self.config, ensure_ascii=False))
+        # Collectie records renderen later: extra tekens via config['font_characters']
+        return set(FONT_BASE_CHARACTERS) | set(self.config.get('font_characters', '')) \
+            | used_characters(documents)
+    
+    def font_stack(self):
+        families = list(dict.fromkeys(font['family'] for font in self.fonts))
+        return ', '.join([f"'{family}'" for family in families] + [FONT_FALLBACK_STACK])
+    
+    @profiled
+    def create_fonts(self):
+        """Subset self-hosted fonts naar WOFF2 met alleen de gebruikte tekens"""
+        source_dir = self.font_source_dir()
+        sources = sorted(p for p in source_dir.glob('*') if p.suffix.lower() in FONT_EXTENSIONS) \
+            if source_dir.is_dir() else []
+        self.fonts = []
+        if not sources:
+            return
+        
+        print("🔤 Subsetten fonts...")
+        if not can_subset_fonts():
+            print("   ⚠️  fontTools/brotli niet beschikbaar: alleen .woff2 bronnen, zonder subset")
+        characters = self.font_characters()
+        preload = self.config.get('font_preload')
+        
+        cached = 0
+        with self.build_cache(FONT_CACHE_DIR) as cache_dir:
+            subsets = [(source, subset_font(source, characters, cache_dir)) for source in sources]
+        for source, (data, from_cache) in subsets:
+            if data is None:
+                print(f"   ⚠️  {source.name} overgeslagen")
+                continue
+            cached += from_cache
+            font = font_metadata(source)
+            name = f"{slugify(font['family'])}-{font['weight']}"
+            if font['style'] == 'italic':
+                name += '-italic'
+            font['url'] = f"/assets/fonts/{name}.{content_hash(data)}.woff2"
+            # Standaard alleen het regular gewicht preloaden; de rest laadt bij gebruik
+            font['preload'] = (source.name in preload if preload is not None
+                               else font['weight'] == 400 and font['style'] == 'normal')
+            self.write_file(f"public{font['url']}", data)
+            self.fonts.append(font)
+            print(f"   ✅ {source.name} -> {font['url']} ({source.stat().st_size} -> {len(data)} bytes)")
+        print(f"   ✅ {len(self.fonts)} fonts, {len(characters)} tekens, {cached} uit cache")
+    
+    def responsive_images(self, document):
+        return responsive_images(document, self.images, self.config.get('image_sizes', '100vw'))
+    
+    def hero_image(self):
+        """Optionele hero afbeelding (config['hero_image'] = bestandsnaam in de image dir)"""
+        name = self.config.get('hero_image')
+        image = self.images.get(f"/assets/images/{name}") if name else None
+        if not image:
             return ''
+        markup = picture_markup(image, self.config['business_name'],
+                                self.config.get('image_sizes', '100vw'), ' fetchpriority="high"')
+        return f"\n            {markup}"
+    
+    def analytics_mode(self):
+        mode = self.config.get('analytics_mode', ANALYTICS_DEFAULT_MODE)
+        if mode not in ANALYTICS_MODES:
+            raise ValueError(f"Onbekende analytics modus '{mode}', kies uit {', '.join(ANALYTICS_MODES)}")
+        # Zonder Partytown lib terugvallen op idle
+        return 'idle' if mode == 'worker' and not self.partytown else mode
+    
+    def partytown_lib(self):
+        return Path(self.config.get('partytown_lib') or self.project_path / PARTYTOWN_LIB)
+    
+    @profiled
+    def create_analytics(self):
+        """Kopieert Partytown naar public/ als de tags in een web worker moeten draaien"""
+        self.partytown = None
+        if self.config.get('analytics_mode') != 'worker' or not analytics_tags(self.config)[1]:
+            return
+        
+        lib = self.partytown_lib()
+        if not (lib / 'partytown.js').is_file():
+            print(f"   ⚠️  Partytown niet gevonden in {lib} (npm i @builder.io/partytown): analytics_mode 'idle'")
+            return
+        for source in sorted(lib.glob('*.js')):
+            self.write_file(f"public{PARTYTOWN_URL}{source.name}", source.read_bytes())
+        self.partytown = (lib / 'partytown.js').read_text(encoding='utf-8').strip()
+    
+    def get_analytics_script(self):
+        """GA/GTM loader volgens analytics_mode plus de Web Vitals meting"""
+        lines, scripts = analytics_tags(self.config)
+        markup = self.web_vitals_script(bool(scripts))
+        if not scripts:
+            return markup
         
-        return f"""
-    <script async src="https://www.googletagmanager.com/gtag/js?id={self.config['ga_tracking_id']}"></script>
-    <script>
-        window.dataLayer = window.dataLayer || [];
-        function gtag(){{dataLayer.push(arguments);}}
-        gtag('js', new Date());
-        gtag('config', '{self.config['ga_tracking_id']}');
-    </script>"""
+        mode = self.analytics_mode()
+        gtm_start = [GTM_START] if self.config.get('gtm_id') else []
+        if mode == 'worker':
+            return markup + self.render('partials/analytics-worker.html',
+                                        lib=PARTYTOWN_URL, snippet=self.partytown,
+                                        tags=indent_lines(lines), gtm_start=indent_lines(gtm_start),
+                                        scripts='\n'.join(f'    <script type="text/partytown" src="{src}"></script>'
+                                                           for src in scripts))
+        consent = mode == 'consent'
+        trigger = (self.render('partials/analytics-consent.js') if consent
+                   else indent_lines([ANALYTICS_TRIGGERS[mode]]))
+        return markup + self.render('partials/analytics.html',
+                                    deferred='' if mode == 'eager' else ' data-deferred',
+                                    banner=self.render('partials/consent-banner.html') if consent else '',
+                                    consent_defaults=indent_lines([CONSENT_DEFAULTS] if consent else []),
+                                    tags=indent_lines(lines),
+                                    gtm_start=indent_lines(gtm_start, 12),
+                                    scripts=', '.join(json.dumps(src) for src in scripts),
+                                    trigger=trigger)
+    
+    def web_vitals_script(self, analytics=False):
+        """Web Vitals hooks (standaard aan zodra er analytics is), inclusief analytics_TBT"""
+        if not self.config.get('web_vitals', analytics):
+            return ''
+        report = []
+        if self.config.get('vitals_endpoint'):
+            report.append(f"navigator.sendBeacon({json.dumps(self.config['vitals_endpoint'])}, "
+                          f"JSON.stringify(vitals));")
+        if analytics:
+            report += ["if (window.gtag) Object.keys(vitals.metrics).forEach(function (name) {",
+                       "    gtag('event', 'web_vitals', {metric_name: name, value: vitals.metrics[name],",
+                       "                                 analytics_mode: vitals.mode, transport_type: 'beacon'});",
+                       "});"]
+        mode = self.analytics_mode() if analytics else 'none'
+        return self.render('partials/web-vitals.html', mode=mode, report=indent_lines(report, 16))
     
     def generate_service_cards(self):
-        cards = ""
-        for service in self.config['services']:
-            cards += f"""
-                <div class="service-card">
-                    <h3>{service}</h3>
-                    <p>Professionele {service.lower()} diensten.</p>
-                </div>"""
-        return cards
+        return ''.join(self.render('partials/service-card.html', service=service)
+                       for service in self.config['services'])
     
+    @profiled
     def create_assets(self):
         """Genereert CSS en JavaScript"""
         print("💅 Genereren CSS en JavaScript...")
         
         # Main CSS
-        css = """/* Main Stylesheet */
-:root {
-    --primary: #667eea;
-    --secondary: #764ba2;
-    --text: #333;
-    --bg: #fff;
-}
-
-* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-body {
-    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-    line-height: 1.6;
-    color: var(--text);
-}
-
-.container {
-    max-width: 1200px;
-    margin: 0 auto;
-    padding: 0 20px;
-}
-
-/* Header */
-.header {
-    background: white;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    position: sticky;
-    top: 0;
-    z-index: 1000;
-}
-
-.nav {
-    padding: 1rem 0;
-}
-
-.nav .container {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-}
-
-.logo {
-    font-size: 1.5rem;
-    font-weight: bold;
-    color: var(--primary);
-    text-decoration: none;
-}
-
-.nav-menu {
-    display: flex;
-    list-style: none;
-    gap: 2rem;
-}
-
-.nav-menu a {
-    text-decoration: none;
-    color: var(--text);
-    transition: color 0.3s;
-}
-
-.nav-menu a:hover {
-    color: var(--primary);
-}
-
-/* Hero */
-.hero {
-    background: linear-gradient(135deg, var(--primary), var(--secondary));
-    color: white;
-    padding: 6rem 0;
-    text-align: center;
-}
-
-.hero h1 {
-    font-size: 3rem;
-    margin-bottom: 1rem;
-}
-
-.hero p {
-    font-size: 1.25rem;
-    margin-bottom: 2rem;
-}
-
-/* Button */
-.btn {
-    display: inline-block;
-    background: white;
-    color: var(--primary);
-    padding: 1rem 2rem;
-    border-radius: 5px;
-    text-decoration: none;
-    font-weight: bold;
-    transition: transform 0.3s;
-}
-
-.btn:hover {
-    transform: translateY(-2px);
-}
-
-/* Diensten */
-.diensten {
-    padding: 4rem 0;
-}
-
-.diensten h2 {
-    text-align: center;
-    margin-bottom: 3rem;
-}
-
-.diensten-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-    gap: 2rem;
-}
-
-.service-card {
-    padding: 2rem;
-    border: 1px solid #eee;
-    border-radius: 10px;
-    text-align: center;
-}
-
-.service-card h3 {
-    color: var(--primary);
-    margin-bottom: 1rem;
-}
-
-/* Contact */
-.contact {
-    background: #f5f5f5;
-    padding: 4rem 0;
-}
-
-.contact h2 {
-    text-align: center;
-    margin-bottom: 3rem;
-}
-
-.contact-form {
-    max-width: 600px;
-    margin: 0 auto;
-    display: flex;
-    flex-direction: column;
-    gap: 1rem;
-}
-
-.contact-form input,
-.contact-form textarea {
-    padding: 1rem;
-    border: 1px solid #ddd;
-    border-radius: 5px;
-    font-family: inherit;
-}
-
-.contact-form button {
-    cursor: pointer;
-}
-
-/* Footer */
-.footer {
-    background: var(--text);
-    color: white;
-    text-align: center;
-    padding: 2rem 0;
-}
-
-/* Responsive */
-@media (max-width: 768px) {
-    .nav-menu {
-        gap: 1rem;
-    }
-    
-    .hero h1 {
-        font-size: 2rem;
-    }
-}
-"""
-        with open(self.project_path / "src" / "assets" / "css" / "main.css", 'w') as f:
-            f.write(css)
+        css = self.render('main.css', font_face=font_face_css(self.fonts, self.config.get('font_display', FONT_DISPLAY)),
+                          font_stack=self.font_stack())
+        self.write_file("src/assets/css/main.css", css)
         
         # Main JavaScript
-        js = """// Main JavaScript
-console.log('Website loaded successfully!');
-
-// Service Worker registratie
-if ('serviceWorker' in navigator) {
-    navigator.serviceWorker.register('/service-worker.js')
-        .then(reg => console.log('Service Worker geregistreerd'))
-        .catch(err => console.log('Service Worker registratie mislukt'));
-}
-
-// Smooth scrolling
-document.querySelectorAll('a[href^="#"]').forEach(anchor => {
-    anchor.addEventListener('click', function (e) {
-        e.preventDefault();
-        const target = document.querySelector(this.getAttribute('href'));
-        if (target) {
-            target.scrollIntoView({ behavior: 'smooth' });
-        }
-    });
-});
-"""
-        with open(self.project_path / "src" / "assets" / "js" / "main.js", 'w') as f:
-            f.write(js)
+        js = self.render('main.js')
+        self.write_file("src/assets/js/main.js", js)
         
         print("   ✅ CSS en JavaScript gegenereerd")
     
+    def site_files(self):
+        """public/ en src/ samengevoegd zoals ze op de server staan"""
+        files = {}
+        for root in ('public/', 'src/'):
+            for relative_path, data in sorted(self.vfs.files.items()):
+                if relative_path.startswith(root):
+                    files[relative_path[len(root):]] = data
+        return files
+    
+    @profiled
+    def create_production_build(self):
+        """Bouwt dist/ met geminificeerde, content-gehashte assets en critical CSS"""
+        print("📦 Productie build genereren...")
+        
+        files = self.site_files()
+        self.html_sizes = {}
+        # <style> blokken die op meerdere pagina's staan: één keer downloaden en cachen
+        self.shared_styles = shared_style_blocks(
+            [data.decode('utf-8') for relative_path, data in files.items() if relative_path.endswith('.html')],
+            self.config.get('shared_style_min_pages', 2))
+        if self.shared_styles:
+            files[SHARED_STYLESHEET] = '\n'.join(self.shared_styles).encode('utf-8')
+        files, self.asset_map = build_assets(files)
+        
+        # Critical CSS inline, volledige stylesheet async
+        self.stylesheets = {hashed: files[hashed.lstrip('/')].decode('utf-8')
+                            for hashed in self.asset_map.values() if hashed.endswith('.css')}
+        # Per pagina alleen de regels die markup, scripts of safelist gebruiken
+        self.pruned_stylesheets = {}
+        self.pruned_sent = set()
+        self.script_tokens = frozenset(
+            safelist_tokens(PRUNE_SAFELIST | set(self.config.get('css_safelist', [])))
+            | collect_js_tokens('\n'.join(data.decode('utf-8') for relative_path, data in files.items()
+                                          if relative_path.startswith('assets/') and relative_path.endswith('.js'))))
+        # Navigatie graaf over alle pagina's: de meest gelinkte pagina's prefetchen
+        self.link_ranks = navigation_ranks({relative_path: data.decode('utf-8')
+                                            for relative_path, data in files.items()
+                                            if relative_path.endswith('.html')})
+        for relative_path, data in files.items():
+            if relative_path.endswith('.html'):
+                optimized = self.optimize_page(data.decode('utf-8'), page_url(relative_path))
+                files[relative_path] = self.minified(relative_path, optimized).encode('utf-8')
+        for href, (source, css) in self.new_stylesheets().items():
+            files[href.lstrip('/')] = css.encode('utf-8')
+        
+        # Service worker opnieuw, nu met de gehashte productie bestanden
+        files['service-worker.js'] = minify_js(self.render_service_worker(files, indent=None)).encode('utf-8')
+        
+        for relative_path, data in files.items():
+            self.write_dist(relative_path, data)
+        
+        for original, hashed in self.asset_map.items():
+            print(f"   ✅ {original} -> {hashed}")
+        for relative_path, (before, after) in sorted(self.html_sizes.items()):
+            print(f"   ✅ {relative_path}: {before} -> {after} bytes (-{(before - after) / before:.1%})")
+        for href, (source, css) in sorted(self.pruned_stylesheets.items()):
+            before = len(self.stylesheets[source].encode('utf-8'))
+            after = len(css.encode('utf-8'))
+            print(f"   ✂️  {source} -> {href}: {before} -> {after} bytes (-{(before - after) / before:.1%})")
+    
+    def optimize_page(self, html, page='/'):
+        """Productie versie van een pagina: gehashte assets, transforms, gesnoeide en critical CSS, resource hints"""
+        html = extract_shared_styles(html, self.shared_styles)
+        html = rewrite_references(html, self.asset_map)
+        html, tokens = self.transform_page(html, page)
+        stylesheets = self.stylesheets
+        if self.config.get('prune_css', True):
+            html = prune_stylesheets(html, self.stylesheets, self.script_tokens, self.pruned_stylesheets,
+                                     tokens.tokens)
+            stylesheets = dict(stylesheets, **{href: css for href, (source, css) in self.pruned_stylesheets.items()})
+        roots = self.config.get('critical_selectors', CRITICAL_SELECTORS)
+        html = inline_critical_css(html, stylesheets, roots, tokens.critical)
+        if self.config.get('resource_hints', True):
+            html = add_resource_hints(html, page, self.link_ranks, self.config.get('hint_limits'),
+                                      self.first_party_origins(),
+                                      self.config.get('speculation_rules', SPECULATION_RULES))
+        return html
+    
+    def transform_page(self, html, page='/'):
+        """Draait de HTML transforms uit config['html_transforms'] in één pass
+        
+        Geeft (html, PageTokens) terug: de tokens gaan naar snoeien en critical CSS.
+        """
+        names = self.config.get('html_transforms', DEFAULT_HTML_TRANSFORMS)
+        context = {'page': page, 'config': self.config, 'first_party': self.first_party_origins()}
+        tokens = PageTokens(context)
+        html = transform_html(html, [resolve_transform(name)(context) for name in names] + [tokens])
+        return html, tokens
+    
+    def new_stylesheets(self):
+        """Gesnoeide stylesheets die nog niet naar dist/ (of vanuit een worker terug) gingen"""
+        fresh = {href: entry for href, entry in self.pruned_stylesheets.items() if href not in self.pruned_sent}
+        self.pruned_sent.update(fresh)
+        return fresh
+    
+    def write_stylesheets(self, stylesheets):
+        """Schrijft gesnoeide stylesheets die deze run nog niet in dist/ zetten
+        
+        Elke worker houdt zijn eigen administratie bij en stuurt dezelfde varianten
+        dus opnieuw terug; hier in het hoofdproces valt de dubbele weg.
+        """
+        for href, (source, css) in stylesheets.items():
+            if f"dist/{href.lstrip('/')}" not in self.emitted:
+                self.write_dist(href.lstrip('/'), css.encode('utf-8'))
+    
+    def minify_page(self, html):
+        return minify_html(html) if self.config.get('minify_html', True) else html
+    
+    def minified(self, relative_path, optimized):
+        """minify_page plus registratie van de besparing in html_sizes"""
+        minified = self.minify_page(optimized)
+        self.html_sizes[relative_path] = (len(optimized.encode('utf-8')), len(minified.encode('utf-8')))
+        return minified
+    
+    def first_party_origins(self):
+        domain = self.config['domain']
+        return {f"https://{domain}", f"https://www.{domain}"}
+    
+    def workers(self):
+        return self.config.get('workers') or os.cpu_count() or 1
+    
+    def collection_records(self, collection):
+        """Genormaliseerde records met unieke slugs, bij elke doorloop in dezelfde volgorde
+        
+        Een lege slug wordt het volgnummer van het record; een slug die al
+        bestaat krijgt -2, -3, ... erachter, zodat geen pagina een andere
+        overschrijft. 'page' is van de paginering (/naam/page/2/).
+        """
+        taken = {'page'}
+        for index, raw in enumerate(iter_records(collection['source'], collection.get('table')), 1):
+            record = self.collection_record(collection, raw, index)
+            slug = record['slug']
+            suffix = 2
+            while slug in taken:
+                slug = f"{record['slug']}-{suffix}"
+                suffix += 1
+            taken.add(slug)
+            record.update(slug=slug, url=f"/{collection['name']}/{slug}/")
+            yield record
+    
+    def collection_record(self, collection, raw, index=1):
+        """Normaliseert een bron record naar de velden die de templates gebruiken"""
+        title = raw.get(collection.get('title_field', 'title')) or raw.get('name') or ''
+        # Ook een expliciete slug gaat door slugify: geen '/', '..' of lege paden
+        slug = slugify(raw.get(collection.get('slug_field', 'slug')) or title) or str(index)
+        return {
+            'slug': slug,
+            'url': f"/{collection['name']}/{slug}/",
+            'title': str(title),
+            'description': str(raw.get('description') or ''),
+            'body': str(raw.get('body') or ''),
+            'lastmod': raw.get('lastmod') or raw.get('updated'),
+        }
+    
+    def render_collection_page(self, collection, record):
+        """Rendert één detail pagina
+        
+        Geeft (record, src html, dist html, bytes voor minify, nieuwe gesnoeide
+        stylesheets) terug; die laatste schrijft het hoofd proces naar dist/.
+        """
+        document = self.render(collection.get('template', 'page.html'),
+                               title=record['title'],
+                               description=record['description'],
+                               url=record['url'],
+                               content=f"<p>{html.escape(record['body'])}</p>",
+                               collection_url=f"/{collection['name']}/",
+                               collection_title=collection.get('title', collection['name'].title()),
+                               analytics=self.get_analytics_script())
+        document = self.responsive_images(document)
+        optimized = self.optimize_page(document, record['url'])
+        return (record, document, self.minify_page(optimized), len(optimized.encode('utf-8')),
+                self.new_stylesheets())
+    
+    def render_collection(self, collection):
+        """Rendert alle records parallel; streaming met een begrensd aantal taken"""
+        records = self.collection_records(collection)
+        workers = self.workers()
+        if workers <= 1:
+            for record in records:
+                yield self.render_collection_page(collection, record)
+            return
+        
+        with process_pool(workers, initializer=_init_page_worker,
+                          initargs=(self.worker_state(),)) as pool:
+            pending = deque()
+            for chunk in chunked(records, PAGE_CHUNK_SIZE):
+                pending.append(pool.submit(_render_page_chunk, collection, chunk))
+                # Maximaal twee taken per worker in de lucht: geheugen blijft begrensd
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    
+    def listing_url(self, collection, page):
+        return f"/{collection['name']}/" if page == 1 else f"/{collection['name']}/page/{page}/"
+    
+    def write_listing(self, collection, page, items, has_next):
+        """Schrijft één overzichtspagina met vorige/volgende links"""
+        cards = ''.join(self.render('partials/listing-item.html', **item) for item in items)
+        previous = (f'<a href="{self.listing_url(collection, page - 1)}" rel="prev">Vorige</a>'
+                    if page > 1 else '')
+        following = (f'<a href="{self.listing_url(collection, page + 1)}" rel="next">Volgende</a>'
+                     if has_next else '')
+        pagination = self.render('partials/pagination.html', previous=previous, next=following, page=page)
+        title = collection.get('title', collection['name'].title())
+        url = self.listing_url(collection, page)
+        document = self.render(collection.get('listing_template', 'page.html'),
+                               title=title if page == 1 else f"{title} - pagina {page}",
+                               description=collection.get('description', ''),
+                               url=url,
+                               content=f'<div class="diensten-grid">{cards}\n            </div>{pagination}',
+                               collection_url=f"/{collection['name']}/",
+                               collection_title=title,
+                               analytics=self.get_analytics_script())
+        path = url.strip('/') + '/index.html'
+        self.write_file(f"src/{path}", document)
+        self.write_dist(path, self.minified(path, self.optimize_page(document, url)))
+        self.write_stylesheets(self.new_stylesheets())
+    
+    @profiled
+    def create_collection(self, collection):
+        """Eén pagina per record plus gepagineerde overzichtspagina's"""
+        per_page = int(collection.get('per_page', LISTING_PER_PAGE))
+        # Detail pagina's renderen in workers: daar ziet track_template ze niet
+        self.track_template(collection.get('template', 'page.html'))
+        items = []
+        page = 1
+        count = 0
+        for record, src_html, dist_html, size, stylesheets in self.render_collection(collection):
+            path = f"{collection['name']}/{record['slug']}/index.html"
+            self.write_file(f"src/{path}", src_html)
+            self.write_dist(path, dist_html)
+            self.write_stylesheets(stylesheets)
+            self.html_sizes[path] = (size, len(dist_html.encode('utf-8')))
+            count += 1
+            if len(items) == per_page:
+                self.write_listing(collection, page, items, has_next=True)
+                page += 1
+                items = []
+            items.append({k: record[k] for k in ('url', 'title', 'description')})
+        self.write_listing(collection, page, items, has_next=False)
+        self.collection_counts[collection['name']] = count
+        return count
+    
+    @profiled
+    def create_collections(self):
+        """Data gedreven pagina's voor alle geconfigureerde collecties"""
+        # Opnieuw aanbieden wat eerder gesnoeid werd: write_stylesheets slaat over wat
+        # deze run al schreef, een watch rebuild zonder asset stap schrijft ze zo opnieuw
+        self.pruned_sent = set()
+        for collection in self.config.get('collections', []):
+            print(f"📚 Genereren collectie '{collection['name']}'...")
+            started = time.perf_counter()
+            count = self.create_collection(collection)
+            elapsed = time.perf_counter() - started
+            print(f"   ✅ {count} pagina's in {elapsed:.2f}s")
+            sizes = [size for path, size in self.html_sizes.items()
+                     if path.startswith(f"{collection['name']}/")]
+            if sizes:
+                before, after = map(sum, zip(*sizes))
+                print(f"   ✅ HTML {before} -> {after} bytes (-{(before - after) / before:.1%})")
+    
+    def collection_sitemap_entries(self, collection):
+        """Sitemap entries van een collectie; leest de bron opnieuw i.p.v. alles te bewaren"""
+        source_date = datetime.fromtimestamp(Path(collection['source']).stat().st_mtime,
+                                             timezone.utc).strftime('%Y-%m-%d')
+        per_page = int(collection.get('per_page', LISTING_PER_PAGE))
+        count = self.collection_counts.get(collection['name'], 0)
+        for page in range(1, max(1, -(-count // per_page)) + 1):
+            yield self.listing_url(collection, page), source_date
+        for record in self.collection_records(collection):
+            yield record['url'], str(record['lastmod'] or source_date)[:10]
+    
+    @profiled
+    def audit_output(self):
+        """Audit van dist/ tegen de performance budgets, met historie per build"""
+        print("🔎 Auditen productie build...")
+        report = audit_site(self.project_path / 'dist', self.first_party_origins())
+        self.budget_violations = check_budgets(report, self.config.get('budgets'))
+        diff = record_audit(self.project_path / AUDIT_HISTORY, report, self.build_date)
+        print_audit(report, self.budget_violations, diff)
+        self.audit_report = dict(report, violations=self.budget_violations, diff=diff)
+    
+    @profiled
+    def check_output_links(self):
+        """Ontbrekende doelen, redirect ketens en niet gerefereerde bestanden in dist/"""
+        def read(path):
+            return path.read_text(encoding='utf-8') if path.is_file() else None
+        
+        dist = self.project_path / 'dist'
+        rules = redirect_rules(read(self.project_path / 'netlify.toml'), read(dist / '_redirects'))
+        self.link_report = check_links(dist, self.first_party_origins(), rules)
+        print_link_report(self.link_report)
+    
+    @profiled
     def init_git_repository(self):
-        """Initialiseert Git repository"""
+        """Initialiseert Git repository zonder git subprocess of os.chdir"""
+        mode = self.config.get('git', 'commit')
+        if mode not in GIT_MODES:
+            raise ValueError(f"Onbekende git modus '{mode}', kies uit {', '.join(GIT_MODES)}")
+        if mode == 'skip':
+            return
+        
         print("🔧 Initialiseren Git repository...")
         
-        try:
-            os.chdir(self.project_path)
-            subprocess.run(['git', 'init'], check=True, capture_output=True)
-            subprocess.run(['git', 'add', '.'], check=True, capture_output=True)
-            subprocess.run(['git', 'commit', '-m', 'feat: initial project setup'], 
-                         check=True, capture_output=True)
-            print("   ✅ Git repository geïnitialiseerd")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("   ⚠️  Git niet beschikbaar, overgeslagen")
+        writer = GitWriter(self.project_path)
+        writer.init()
+        if mode == 'init':
+            print("   ✅ Git repository geïnitialiseerd (commit uitgesteld)")
+            return
+        
+        gitignore = self.project_path / '.gitignore'
+        ignored = gitignore_matcher(gitignore.read_text(encoding='utf-8') if gitignore.exists() else '')
+        entries = writer.add_all(ignored)
+        tree = writer.write_tree({path: (mode, sha) for path, (mode, sha, _) in entries.items()})
+        
+        author = self.config.get('git_author') or f"Website Generator <generator@{self.config['domain']}>"
+        message = 'chore: regenerate project' if writer.head() else 'feat: initial project setup'
+        commit = writer.commit(tree, message, author, self.build_mtime())
+        writer.write_index(entries)
+        
+        if commit:
+            print(f"   ✅ Git repository geïnitialiseerd ({commit[:7]}, {len(entries)} bestanden)")
+        else:
+            print("   ✅ Git repository ongewijzigd")
     
+    @profiled
     def create_readme(self):
         """Genereert README.md"""
-        content = f"""# {self.config['business_name']}
-
-> {self.config['description']}
-
-## 🚀 Quick Start
-
-```bash
-# Installeer dependencies
-npm install
-
-# Start development server
-npm run dev
-
-# Build voor productie
-npm run build
-
-# Deploy naar Netlify
-npm run deploy
-```
-
-## 📁 Project Structuur
-
-```
-{self.project_name}/
-├── src/                    # Source code
-│   ├── assets/            # CSS, JS, images
-│   ├── components/        # Herbruikbare componenten
-│   └── index.html         # Hoofdpagina
-├── public/                # Static files
-│   ├── robots.txt
-│   ├── sitemap.xml
-│   └── manifest.json
-├── api/                   # API endpoints
-└── dist/                  # Build output
-```
-
-## ✨ Features
+        content = self.render('README.md', port=self.contact_settings()['port'])
+        self.write_file("README.md", content)
+        
+        print("   ✅ README.md gegenereerd")
 
-- ✅ Modern responsive design
-- ✅ Progressive Web App (PWA)
-- ✅ SEO geoptimaliseerd
-- ✅ Google Analytics integratie
-- ✅ Performance optimized
-- ✅ VS Code + Git + Netlify workflow
+def load_manifest(manifest_path):
+    """Leest een CSV of JSONL manifest met project configuraties"""
+    manifest_path = Path(manifest_path)
+    entries = []
+    
+    with open(manifest_path, newline='', encoding='utf-8') as f:
+        if manifest_path.suffix.lower() == '.csv':
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        
+        for row in rows:
+            entry = {}
+            for key, value in row.items():
+                if key is None or value in (None, ''):
+                    continue
+                key = MANIFEST_ALIASES.get(key.strip(), key.strip())
+                if key == 'services' and isinstance(value, str):
+                    value = [s.strip() for s in value.replace('|', ';').split(';') if s.strip()]
+                entry[key] = value
+            entry.setdefault('name', '')
+            entries.append(entry)
+    
+    return entries
 
-## 📝 Configuratie
+def generate_site(entry, base_path, trace_memory=False):
+    """Genereert één site uit een manifest regel (draait in een worker proces)"""
+    entry = dict(entry)
+    name = entry.pop('name') or '<zonder naam>'
+    started = time.perf_counter()
+    output = io.StringIO()
+    generator = None
+    
+    try:
+        if name == '<zonder naam>':
+            raise ValueError("manifest regel zonder 'name'")
+        with contextlib.redirect_stdout(output):
+            generator = CompleteWebsiteGenerator(name, base_path)
+            generator.profiler.trace_memory = trace_memory
+            # Fleet mode is al parallel over sites: geen threads per site erbij
+            generator.config['step_workers'] = 1
+            generator.config.update(entry)
+            project_path = generator.run_generator()
+        status = {'name': name, 'status': 'ok', 'path': str(project_path), 'error': None}
+    except Exception as e:
+        status = {'name': name, 'status': 'error', 'path': None,
+                  'error': f"{type(e).__name__}: {e}"}
+    
+    status['duration'] = round(time.perf_counter() - started, 3)
+    status['profile'] = generator.profile_report() if generator else None
+    status['budget_violations'] = generator.budget_violations if generator else []
+    return status
 
-1. Update `package.json` met je project details
-2. Voeg Google Analytics tracking ID toe in `src/index.html`
-3. Pas kleuren aan in `src/assets/css/main.css`
-4. Deploy naar Netlify met `npm run deploy`
+def run_batch(manifest_path, base_path="./projects", workers=None, git=None, trace_memory=False,
+              defaults=None):
+    """Genereert alle sites uit een manifest parallel over een process pool
+    
+    defaults: config sleutels voor elke site die de manifest regel niet zelf zet
+    """
+    entries = load_manifest(manifest_path)
+    defaults = dict(defaults or {})
+    if git:
+        defaults['git'] = git
+    for entry in entries:
+        for key, value in defaults.items():
+            entry.setdefault(key, value)
+    # Absoluut pad: workers mogen niet afhankelijk zijn van de working directory
+    base_path = str(Path(base_path).resolve())
+    workers = workers or os.cpu_count() or 1
+    
+    print(f"\n🚀 Fleet mode: {len(entries)} sites met {workers} workers")
+    print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(generate_site, entry, base_path, trace_memory): entry['name']
+                   for entry in entries}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker proces zelf is omgevallen
+                result = {'name': futures[future], 'status': 'error', 'path': None,
+                          'error': f"{type(e).__name__}: {e}", 'duration': None, 'profile': None,
+                          'budget_violations': []}
+            results.append(result)
+            if result['status'] == 'ok':
+                print(f"   ✅ {result['name']} ({result['duration']}s)")
+                for violation in result['budget_violations']:
+                    print(f"      ⚠️  {violation}")
+            else:
+                print(f"   ❌ {result['name']}: {result['error']}")
+    
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for r in results if r['status'] != 'ok')
+    rate = len(results) / elapsed if elapsed else 0
+    print(f"\n✨ {len(results) - failed}/{len(results)} sites gegenereerd "
+          f"in {elapsed:.2f}s ({rate:.1f} sites/s)")
+    
+    return results
 
-## 🔧 Development
+# Polling interval van watch mode (seconden) en het live reload endpoint
+WATCH_INTERVAL = 0.2
+LIVE_RELOAD_PATH = '/__livereload'
+LIVE_RELOAD_SCRIPT = (f"<script>new EventSource('{LIVE_RELOAD_PATH}')"
+                      ".onmessage=function(){location.reload()}</script>")
 
-- `npm run dev` - Start development server
-- `npm run build` - Build voor productie
-- `npm run preview` - Preview productie build
+def file_snapshot(paths):
+    """{pad: (mtime_ns, grootte)} van alle bestanden onder de gegeven paden"""
+    snapshot = {}
+    for root in paths:
+        root = Path(root)
+        candidates = [root] if root.is_file() else root.rglob('*') if root.is_dir() else []
+        for path in candidates:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
 
-## 📄 License
+class LiveReloadServer:
+    """Dev server (stdlib) die een build directory serveert en reloads pusht via SSE"""
+    
+    def __init__(self, root, port=8000, host='127.0.0.1'):
+        self.root = Path(root)
+        self.version = 0
+        self.changed = threading.Condition()
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def reload(self):
+        """Stuurt een reload event naar alle open browsers"""
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+    
+    def wait(self, version, timeout):
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+    
+    def handler(self):
+        live = self
+        
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=str(live.root), **kwargs)
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def do_GET(self):
+                if self.path == LIVE_RELOAD_PATH:
+                    return self.stream_events()
+                path = Path(self.translate_path(self.path))
+                if path.is_dir():
+                    path = path / 'index.html'
+                if path.suffix != '.html' or not path.is_file():
+                    return super().do_GET()
+                # HTML met het reload script, alleen in de dev server (niet in de build)
+                document = path.read_bytes()
+                marker = document.rfind(b'</body>')
+                script = LIVE_RELOAD_SCRIPT.encode('utf-8')
+                document = (document[:marker] + script + document[marker:]
+                            if marker >= 0 else document + script)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(document)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(document)
+            
+            def stream_events(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                version = live.version
+                try:
+                    while True:
+                        current = live.wait(version, timeout=15)
+                        # Keep-alive comment als er niets veranderde
+                        self.wfile.write(b'data: reload\n\n' if current != version else b': ping\n\n')
+                        self.wfile.flush()
+                        version = current
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+        
+        return Handler
 
-MIT License - {self.config['business_name']}
+def watch(generator, config_path=None, base_config=None, serve=True, port=8000,
+          interval=WATCH_INTERVAL):
+    """Bouwt opnieuw bij wijzigingen in config of templates tot Ctrl+C"""
+    base_config = dict(base_config or generator.config)
+    
+    def load_config():
+        config = dict(base_config)
+        if config_path:
+            config.update(json.loads(Path(config_path).read_text(encoding='utf-8')))
+        return config
+    
+    generator.config = load_config()
+    generator.run_generator()
+    if not generator.vfs.files:
+        # Up-to-date fast path rendert niets; watch mode heeft de boom wel nodig
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.rebuild()
+    
+    server = None
+    if serve:
+        server = LiveReloadServer(generator.project_path / 'dist', port).start()
+        print(f"\n🌐 Live reload server: {server.url}")
+    
+    def watched():
+        return ([Path(config_path)] if config_path else []) + generator.templates.search_path
+    
+    snapshot = file_snapshot(watched())
+    print(f"👀 Watch mode: {len(snapshot)} bestanden (Ctrl+C om te stoppen)")
+    try:
+        while True:
+            time.sleep(interval)
+            current = file_snapshot(watched())
+            if current == snapshot:
+                continue
+            changed = {path for path in current.keys() | snapshot.keys()
+                       if current.get(path) != snapshot.get(path)}
+            snapshot = current
+            started = time.perf_counter()
+            
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if config_path and Path(config_path) in changed:
+                        generator.config = load_config()
+                        sink = generator.rebuild()
+                    else:
+                        registry = generator.templates
+                        registry.invalidate(changed)
+                        names = {registry.template_name(path) for path in changed} - {None}
+                        sink = generator.rebuild(names)
+            except Exception as e:
+                print(f"❌ Rebuild mislukt: {type(e).__name__}: {e}")
+                continue
+            
+            elapsed = (time.perf_counter() - started) * 1000
+            labels = ', '.join(sorted(path.name for path in changed))
+            if sink is None:
+                print(f"⏭️  {labels}: geen outputs geraakt ({elapsed:.1f} ms)")
+                continue
+            print(f"⚡ {labels}: {sink.files_written} bestanden in {elapsed:.1f} ms")
+            if server:
+                server.reload()
+    except KeyboardInterrupt:
+        print("\n👋 Watch mode gestopt")
+    finally:
+        if server:
+            server.stop()
 
----
+def write_profile(path, report):
+    """Schrijft een profiel rapport als JSON"""
+    Path(path).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
 
-*Gegenereerd met Ultra Professional Website Generator*
-"""
-        with open(self.project_path / "README.md", 'w') as f:
-            f.write(content)
-        
-        print("   ✅ README.md gegenereerd")
+def print_profile(report):
+    """Korte tabel van het profiel rapport op stderr"""
+    print(f"\n⏱️  Profiel per stap:", file=sys.stderr)
+    for record in report['steps']:
+        name = ('  ' if record['parent'] else '') + record['name']
+        peak = record['peak_memory']
+        peak = f"{peak / 1048576:7.1f} MB" if peak is not None else '        -'
+        print(f"   {name:32} {record['wall_time'] * 1000:9.1f} ms  cpu {record['cpu_time'] * 1000:9.1f} ms"
+              f"  {record['files_written']:6} files  {record['bytes_written']:10} B  {peak}", file=sys.stderr)
+    schedule = report.get('schedule')
+    if schedule:
+        critical = schedule['critical_path']
+        print(f"   Boom stappen: {schedule['wall_time'] * 1000:.1f} ms met {schedule['workers']} worker(s), "
+              f"critical path {critical['wall_time'] * 1000:.1f} ms: {' → '.join(critical['steps'])}",
+              file=sys.stderr)
 
 def main():
     """Main functie voor CLI gebruik"""
@@ -849,10 +4647,101 @@ def main():
     parser.add_argument('--business', help='Bedrijfsnaam')
     parser.add_argument('--domain', help='Domain naam')
     parser.add_argument('--ga', help='Google Analytics ID')
+    parser.add_argument('--force', action='store_true', help='Negeer het hash manifest en genereer alles opnieuw')
+    parser.add_argument('--archive', metavar='PATH',
+                        help='Schrijf naar een .tar/.tar.gz/.zip archive in plaats van een directory (- = tar op stdout)')
+    parser.add_argument('--theme', help='Theme directory met template overrides')
+    parser.add_argument('--template-stats', action='store_true', help='Toon render tijd per template')
+    parser.add_argument('--profile', metavar='REPORT',
+                        help='Schrijf tijd/CPU/IO/geheugen per stap als JSON rapport (met --batch: geaggregeerd)')
+    parser.add_argument('--profile-dump', metavar='FILE',
+                        help='Schrijf een cProfile dump (.prof, leesbaar met pstats/snakeviz/flameprof)')
+    parser.add_argument('--build-assets', metavar='DIR',
+                        help='Draai de asset pipeline over een bestaande assets directory')
+    parser.add_argument('--html', nargs='*', default=[],
+                        help='HTML bestanden waarin asset verwijzingen worden herschreven (met --build-assets)')
+    parser.add_argument('--out', default='dist', help='Output directory voor --build-assets')
+    parser.add_argument('--data', nargs='*', default=[], metavar='SOURCE',
+                        help='CSV/JSONL/SQLite bron(nen): één pagina per record')
+    parser.add_argument('--git', choices=GIT_MODES,
+                        help="Git: 'commit' (standaard), 'init' (commit uitstellen) of 'skip'")
+    parser.add_argument('--batch', metavar='MANIFEST', help='CSV/JSONL manifest voor fleet mode')
+    parser.add_argument('--workers', type=int, help='Aantal worker processen (fleet mode)')
+    parser.add_argument('--audit', action='store_true',
+                        help='Audit dist/ tegen de performance budgets (faalt bij overschrijding)')
+    parser.add_argument('--budget', action='append', default=[], metavar='METRIC=WAARDE',
+                        help=f"Overschrijf een budget ({', '.join(AUDIT_BUDGETS)}), impliceert --audit")
+    parser.add_argument('--config', metavar='JSON', help='JSON bestand met config sleutels')
+    parser.add_argument('--watch', action='store_true',
+                        help='Bouw incrementeel opnieuw bij wijzigingen in config/templates, met live reload')
+    parser.add_argument('--port', type=int, default=8000, help='Poort van de live reload server (--watch)')
+    parser.add_argument('--no-serve', action='store_true', help='Watch mode zonder dev server')
+    parser.add_argument('--check-config', action='store_true',
+                        help='Vergelijk netlify.toml/.htaccess/nginx.conf van het project met de cache policy')
+    parser.add_argument('--audit-dir', metavar='DIR',
+                        help='Audit een bestaande build directory zonder te genereren')
+    parser.add_argument('--check-links', metavar='DIR',
+                        help='Controleer verwijzingen in een bestaande build directory (faalt bij ontbrekende doelen)')
     
     args = parser.parse_args()
     
+    if args.build_assets:
+        print(f"📦 Asset pipeline: {args.build_assets} -> {args.out}")
+        build_static_assets(args.build_assets, args.html, args.out)
+        return
+    
+    budgets = {}
+    for budget in args.budget:
+        metric, _, value = budget.partition('=')
+        if metric not in AUDIT_BUDGETS:
+            parser.error(f"onbekend budget '{metric}'")
+        if not value.isdigit():
+            parser.error(f"budget '{metric}' verwacht een geheel getal, niet '{value}'")
+        budgets[metric] = int(value)
+    
+    if args.audit_dir:
+        first_party = {f"https://{args.domain}", f"https://www.{args.domain}"} if args.domain else ()
+        report = audit_site(args.audit_dir, first_party)
+        violations = check_budgets(report, budgets)
+        # Historie naast de build (zoals project_path/dist), nooit erin: die wordt gedeployed
+        history = Path(args.audit_dir).resolve().parent / AUDIT_HISTORY
+        print_audit(report, violations, record_audit(history, report))
+        sys.exit(1 if violations else 0)
+    
+    if args.check_links:
+        first_party = {f"https://{args.domain}", f"https://www.{args.domain}"} if args.domain else ()
+        root = Path(args.check_links)
+        netlify, redirects = root.parent / 'netlify.toml', root / '_redirects'
+        rules = redirect_rules(netlify.read_text(encoding='utf-8') if netlify.is_file() else None,
+                               redirects.read_text(encoding='utf-8') if redirects.is_file() else None)
+        report = check_links(root, first_party, rules)
+        print_link_report(report)
+        sys.exit(1 if report['missing'] or report['redirect_chains'] else 0)
+    
+    audit_config = {}
+    if args.audit or budgets:
+        audit_config = {'audit': True, 'budgets': budgets}
+    
+    if args.batch:
+        results = run_batch(args.batch, args.path, args.workers, args.git, bool(args.profile),
+                            audit_config)
+        if args.profile:
+            reports = [r['profile'] for r in results if r['profile']]
+            write_profile(args.profile, dict(aggregate_profiles(reports), reports=reports))
+        sys.exit(1 if any(r['status'] != 'ok' or r['budget_violations'] for r in results) else 0)
+    
     generator = CompleteWebsiteGenerator(args.name, args.path)
+    generator.force = args.force
+    if args.theme:
+        generator.config['theme_dir'] = args.theme
+    if args.workers:
+        generator.config['workers'] = args.workers
+    if args.git:
+        generator.config['git'] = args.git
+    generator.config.update(audit_config)
+    for source in args.data:
+        generator.config.setdefault('collections', []).append(
+            {'name': slugify(Path(source).stem), 'source': source})
     
     # Optionele configuratie
     if args.business:
@@ -862,7 +4751,49 @@ def main():
     if args.ga:
         generator.config['ga_tracking_id'] = args.ga
     
-    generator.run_generator()
+    if args.check_config:
+        differences = generator.check_server_config()
+        for difference in differences:
+            print(f"   ❌ {difference}")
+        print(f"{'❌' if differences else '✅'} {len(differences)} verschillen met de cache policy")
+        sys.exit(1 if differences else 0)
+    
+    if args.watch:
+        watch(generator, args.config, serve=not args.no_serve, port=args.port)
+        return
+    if args.config:
+        generator.config.update(json.loads(Path(args.config).read_text(encoding='utf-8')))
+    
+    generator.profiler.trace_memory = bool(args.profile)
+    profile = cProfile.Profile() if args.profile_dump else None
+    if profile:
+        # cProfile ziet alleen de hoofd thread: stappen dan niet parallel
+        generator.config['step_workers'] = 1
+        profile.enable()
+    
+    if args.archive:
+        # Voortgang naar stderr zodat stdout vrij blijft voor het archive
+        sink = make_sink(args.archive, args.name)
+        with contextlib.redirect_stdout(sys.stderr):
+            generator.run_generator(sink)
+    else:
+        generator.run_generator()
+    
+    if profile:
+        profile.disable()
+        profile.dump_stats(args.profile_dump)
+    if args.profile:
+        write_profile(args.profile, generator.profile_report())
+        print_profile(generator.profile_report())
+    
+    if args.template_stats:
+        print(f"\n⏱️  Template render tijden:", file=sys.stderr)
+        for name, stats in generator.template_stats().items():
+            print(f"   {name:32} {stats['renders']:6}x  {stats['seconds'] * 1000:8.3f} ms"
+                  f"  ({stats['average'] * 1e6:.1f} µs/render)", file=sys.stderr)
+    
+    if generator.budget_violations:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -7,23 +7,13 @@ class PerformanceOptimizer {
     constructor() {
         this.init();
         this.setupLazyLoading();
-        this.setupResourceHints();
-        this.setupCriticalResourcesPreload();
         this.setupIntersectionObserver();
         this.setupWebVitalsTracking();
     }
 
     init() {
-        // DNS prefetch voor externe resources
-        this.addDNSPrefetch([
-            '//fonts.googleapis.com',
-            '//fonts.gstatic.com',
-            '//www.google-analytics.com',
-            '//www.googletagmanager.com'
-        ]);
-
-        // Resource hints
-        this.addResourceHints();
+        // dns-prefetch/preconnect/preload/prefetch staan statisch in <head>
+        // (gegenereerd tijdens de build); na load injecteren heeft geen zin
         
         // Critical CSS laden
         this.loadCriticalCSS();
@@ -41,37 +31,6 @@ class PerformanceOptimizer {
         this.monitorPerformance();
     }
 
-    addDNSPrefetch(domains) {
-        domains.forEach(domain => {
-            const link = document.createElement('link');
-            link.rel = 'dns-prefetch';
-            link.href = domain;
-            document.head.appendChild(link);
-        });
-    }
-
-    addResourceHints() {
-        const hints = [
-            { rel: 'preconnect', href: 'https://fonts.googleapis.com', crossorigin: true },
-            { rel: 'preconnect', href: 'https://fonts.gstatic.com', crossorigin: true },
-            { rel: 'preload', href: '/fonts/main.woff2', as: 'font', type: 'font/woff2', crossorigin: true },
-            { rel: 'preload', href: '/css/critical.css', as: 'style' },
-            { rel: 'prefetch', href: '/js/non-critical.js' }
-        ];
-
-        hints.forEach(hint => {
-            const link = document.createElement('link');
-            Object.keys(hint).forEach(key => {
-                if (key === 'crossorigin' && hint[key]) {
-                    link.setAttribute('crossorigin', '');
-                } else {
-                    link[key] = hint[key];
-                }
-            });
-            document.head.appendChild(link);
-        });
-    }
-
     loadCriticalCSS() {
         // Critical CSS wordt inline geladen in <style> tag
         // Dit gebeurt al in de HTML head
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# Contactformulier endpoint voor {{ config.business_name }} ({{ config.domain }})
+"""
+POST /api/contact als asyncio server zonder dependencies, bedoeld achter nginx
+(zie config/nginx.conf). De Netlify variant staat in .netlify/functions/contact.mjs.
+
+- validatie: verplichte velden, max lengte, e-mail, honeypot en spam woorden
+- rate limiting per client met een in-memory token bucket
+- begrensde wachtrij: vol = 503 met Retry-After in plaats van onbegrensd geheugen
+- één schrijver die alles wat klaarstaat in één batch opslaat (SQLite of JSONL);
+  een request krijgt pas antwoord als zijn batch op disk staat (group commit)
+
+    python3 api/contact/handler.py                       # 127.0.0.1, poort uit SETTINGS
+    python3 api/contact/handler.py --store data/contact.jsonl
+
+Gegenereerd door de website generator; instellingen via config['contact'].
+"""
+
+import os
+import re
+import json
+import time
+import math
+import signal
+import sqlite3
+import asyncio
+import argparse
+import contextlib
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs
+
+SETTINGS = {{ settings }}
+
+# Project root: relatieve store paden gelden vanaf hier
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+ROUTE = '/api/contact'
+HEALTH_ROUTE = '/api/contact/health'
+
+# Verbinding sluiten na zoveel seconden zonder request (keep-alive)
+IDLE_TIMEOUT = 15
+
+EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+LINK = re.compile(r'https?://', re.IGNORECASE)
+
+THANKS = 'Bedankt voor uw bericht! We nemen binnen 24 uur contact met u op.'
+
+class HttpError(Exception):
+    """Request dat niet verder verwerkt kan worden; de verbinding gaat daarna dicht"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def parse_form(content_type, body):
+    """Velden uit een urlencoded of JSON body; None bij een ander content type"""
+    if content_type.startswith('application/x-www-form-urlencoded'):
+        fields = parse_qs(body.decode('utf-8', 'replace'), keep_blank_values=True)
+        return {name: values[0] for name, values in fields.items()}
+    if content_type.startswith('application/json'):
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise HttpError(400, 'Ongeldige JSON.')
+        return data if isinstance(data, dict) else None
+    return None
+
+def validate(form, settings=SETTINGS):
+    """Genormaliseerd record plus een lijst fouten (leeg = geldig)"""
+    record, errors = {}, []
+    for field, limit in settings['fields'].items():
+        value = str(form.get(field) or '').strip()
+        if not value:
+            if field in settings['required']:
+                errors.append(f"Het veld '{field}' is verplicht.")
+            continue
+        if len(value) > limit:
+            errors.append(f"Het veld '{field}' mag maximaal {limit} tekens bevatten.")
+        record[field] = value
+    if 'email' in record and not EMAIL.match(record['email']):
+        errors.append('Voer een geldig e-mailadres in.')
+    message = record.get('message', '').lower()
+    if (any(keyword in message for keyword in settings['spam_keywords'])
+            or len(LINK.findall(message)) > settings['max_links']):
+        errors.append('Uw bericht werd gedetecteerd als spam.')
+    return record, errors
+
+class TokenBucket:
+    """Per client `burst` tokens, aangevuld met `rate` tokens per seconde"""
+
+    def __init__(self, burst, rate, max_clients):
+        self.burst = burst
+        self.rate = rate
+        self.max_clients = max_clients
+        self.limit = max_clients
+        self.buckets = {}
+
+    def allow(self, key, now=None):
+        """(toegestaan, seconden tot het volgende token)"""
+        now = time.monotonic() if now is None else now
+        tokens, last = self.buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < 1:
+            self.buckets[key] = (tokens, now)
+            return False, (1 - tokens) / self.rate
+        self.buckets[key] = (tokens - 1, now)
+        if len(self.buckets) > self.limit:
+            self.prune(now)
+        return True, 0.0
+
+    def prune(self, now):
+        """Vergeet clients waarvan de bucket inmiddels weer vol zou zijn"""
+        refill = self.burst / self.rate
+        self.buckets = {key: state for key, state in self.buckets.items() if now - state[1] < refill}
+        # Allemaal actief: pas bij het dubbele opnieuw opruimen, geen pruning per request
+        self.limit = max(self.max_clients, 2 * len(self.buckets))
+
+class SqliteStore:
+    """Eén transactie per batch; WAL zodat lezers de schrijver niet blokkeren"""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Alleen de schrijf taak gebruikt de verbinding, wel vanuit wisselende executor threads
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS submissions '
+                        '(id INTEGER PRIMARY KEY, received REAL, client TEXT, data TEXT)')
+
+    def write(self, records):
+        with self.db:
+            self.db.executemany('INSERT INTO submissions (received, client, data) VALUES (?, ?, ?)',
+                                [(r['received'], r['client'], json.dumps(r['data'], ensure_ascii=False))
+                                 for r in records])
+
+    def count(self):
+        return self.db.execute('SELECT COUNT(*) FROM submissions').fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+class JsonlStore:
+    """Eén append plus fsync per batch"""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, records):
+        self.file.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def count(self):
+        with open(self.path, encoding='utf-8') as f:
+            return sum(1 for _ in f)
+
+    def close(self):
+        self.file.close()
+
+def open_store(path):
+    """JSONL voor *.jsonl, anders SQLite"""
+    path = Path(path)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    return JsonlStore(path) if path.suffix == '.jsonl' else SqliteStore(path)
+
+async def read_request(reader, max_body):
+    """(method, path, headers, body), of None als de client de verbinding sloot"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HttpError(400, 'Onvolledig request.')
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(431, 'Headers te groot.')
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, _ = lines[0].split(' ', 2)
+    except ValueError:
+        raise HttpError(400, 'Ongeldige request regel.')
+    headers = {}
+    for line in lines[1:]:
+        name, separator, value = line.partition(':')
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HttpError(411, 'Content-Length is verplicht.')
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HttpError(400, 'Ongeldige Content-Length.')
+    if length > max_body:
+        raise HttpError(413, f'Maximaal {max_body} bytes.')
+    body = await reader.readexactly(length) if length > 0 else b''
+    return method, target.split('?', 1)[0], headers, body
+
+def response(status, body, headers=None, keep_alive=True):
+    payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+    lines = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}',
+             'Content-Type: application/json; charset=utf-8',
+             f'Content-Length: {len(payload)}',
+             'Cache-Control: no-store',
+             'X-Content-Type-Options: nosniff',
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload
+
+class ContactEndpoint:
+    """HTTP afhandeling, rate limiting en de batch schrijver rond één store"""
+
+    def __init__(self, store, settings=SETTINGS):
+        self.store = store
+        self.settings = settings
+        self.buckets = TokenBucket(settings['burst'], settings['refill_per_minute'] / 60,
+                                   settings['max_clients'])
+        self.queue = None
+        self.writer = None
+        self.server = None
+        self.stats = {'stored': 0, 'batches': 0, 'largest_batch': 0, 'queue_peak': 0,
+                      'rate_limited': 0, 'overloaded': 0, 'invalid': 0, 'honeypot': 0}
+
+    async def start(self, host='127.0.0.1', port=None):
+        self.queue = asyncio.Queue(self.settings['queue_size'])
+        self.writer = asyncio.create_task(self.write_batches())
+        self.server = await asyncio.start_server(self.handle_connection, host,
+                                                 self.settings['port'] if port is None else port,
+                                                 backlog=1024)
+        return self.server
+
+    async def stop(self):
+        """Geen nieuwe verbindingen meer, wachtrij leeg schrijven, store sluiten"""
+        self.server.close()
+        await self.queue.join()
+        self.writer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.writer
+        self.store.close()
+
+    def client_key(self, peer, headers):
+        """Achter een proxy op dezelfde host (nginx) telt X-Forwarded-For, anders het peer adres"""
+        forwarded = headers.get('x-forwarded-for')
+        if forwarded and peer in ('127.0.0.1', '::1'):
+            return forwarded.rsplit(',', 1)[-1].strip()
+        return peer
+
+    async def write_batches(self):
+        """Enige schrijver: pakt alles wat klaarstaat (tot batch_size) en slaat het in één keer op"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.settings['batch_size'] and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await loop.run_in_executor(None, self.store.write, [record for record, _ in batch])
+            except Exception as error:
+                for _, done in batch:
+                    if not done.done():
+                        done.set_exception(error)
+            else:
+                for _, done in batch:
+                    if not done.done():
+                        done.set_result(None)
+                self.stats['stored'] += len(batch)
+                self.stats['batches'] += 1
+                self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def submit(self, client, headers, body):
+        """(status, body, headers) voor één POST"""
+        allowed, retry = self.buckets.allow(client)
+        if not allowed:
+            self.stats['rate_limited'] += 1
+            return 429, {'error': 'Te veel aanvragen. Probeer het later opnieuw.'}, \
+                {'Retry-After': str(math.ceil(retry))}
+
+        form = parse_form(headers.get('content-type', ''), body)
+        if form is None:
+            return 415, {'error': 'Verstuur het formulier als urlencoded of JSON.'}, None
+        if form.get(self.settings['honeypot']):
+            # Bots krijgen hetzelfde antwoord, maar er wordt niets opgeslagen
+            self.stats['honeypot'] += 1
+            return 200, {'success': True, 'message': THANKS}, None
+        record, errors = validate(form, self.settings)
+        if errors:
+            self.stats['invalid'] += 1
+            return 422, {'error': errors}, None
+
+        done = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait(({'received': time.time(), 'client': client, 'data': record}, done))
+        except asyncio.QueueFull:
+            self.stats['overloaded'] += 1
+            return 503, {'error': 'Het is even erg druk. Probeer het over enkele seconden opnieuw.'}, \
+                {'Retry-After': '5'}
+        self.stats['queue_peak'] = max(self.stats['queue_peak'], self.queue.qsize())
+        try:
+            await done
+        except Exception:
+            return 500, {'error': 'Er is een probleem opgetreden. Probeer het opnieuw of bel ons direct.'}, None
+        return 200, {'success': True, 'message': THANKS}, None
+
+    async def route(self, peer, method, path, headers, body):
+        if path == ROUTE:
+            if method != 'POST':
+                return 405, {'error': 'Alleen POST.'}, {'Allow': 'POST'}
+            return await self.submit(self.client_key(peer, headers), headers, body)
+        if path == HEALTH_ROUTE and method == 'GET':
+            return 200, dict(self.stats, queued=self.queue.qsize()), None
+        return 404, {'error': 'Niet gevonden.'}, None
+
+    async def handle_connection(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        peer = peer[0] if peer else 'onbekend'
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader, self.settings['max_body']),
+                                                     IDLE_TIMEOUT)
+                    if request is None:
+                        break
+                    status, body, headers = await self.route(peer, *request)
+                except HttpError as error:
+                    writer.write(response(error.status, {'error': str(error)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                keep_alive = request[2].get('connection', '').lower() != 'close'
+                writer.write(response(status, body, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host, port, store_path):
+    endpoint = ContactEndpoint(open_store(store_path))
+    await endpoint.start(host, port)
+    print(f"📮 Contact endpoint op http://{host}:{port}{ROUTE} (store: {store_path})")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):  # Windows
+            loop.add_signal_handler(signum, stop.set)
+    await stop.wait()
+    await endpoint.stop()
+    print(f"   ✅ {endpoint.stats['stored']} submissions opgeslagen in {endpoint.stats['batches']} batches")
+
+def main():
+    parser = argparse.ArgumentParser(description='Contactformulier endpoint (POST /api/contact)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=SETTINGS['port'])
+    parser.add_argument('--store', default=SETTINGS['store'], help='*.sqlite3 of *.jsonl')
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.store))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+// Contactformulier als Netlify Function voor {{ config.business_name }} (POST /api/contact)
+// Zelfde regels als api/contact/handler.py, beide gegenereerd uit config['contact'].
+//
+// Rate limits en wachtrij leven per warme function instance: een koude start
+// begint leeg en parallelle instances delen niets. Opslag is JSONL in
+// CONTACT_STORE; /tmp is vluchtig op Netlify, zet daar een persistente locatie
+// (of vervang storeBatch door een externe store) voor productie.
+import { appendFile } from 'node:fs/promises';
+
+const SETTINGS = {{ settings }};
+const STORE = process.env.CONTACT_STORE || '/tmp/contact.jsonl';
+const EMAIL = /^[^@\s]+@[^@\s]+\.[^@\s]+$/;
+const LINK = /https?:\/\//gi;
+const THANKS = 'Bedankt voor uw bericht! We nemen binnen 24 uur contact met u op.';
+
+// Token bucket per client: [tokens, laatste update in seconden]
+const buckets = new Map();
+const refillRate = SETTINGS.refill_per_minute / 60;
+let pruneLimit = SETTINGS.max_clients;
+
+function allow(key, now = Date.now() / 1000) {
+    const [stored, last] = buckets.get(key) || [SETTINGS.burst, now];
+    const tokens = Math.min(SETTINGS.burst, stored + (now - last) * refillRate);
+    if (tokens < 1) {
+        buckets.set(key, [tokens, now]);
+        return [false, (1 - tokens) / refillRate];
+    }
+    buckets.set(key, [tokens - 1, now]);
+    if (buckets.size > pruneLimit) {
+        // Clients met een inmiddels weer volle bucket vergeten
+        const refill = SETTINGS.burst / refillRate;
+        for (const [client, [, updated]] of buckets) {
+            if (now - updated >= refill) buckets.delete(client);
+        }
+        pruneLimit = Math.max(SETTINGS.max_clients, 2 * buckets.size);
+    }
+    return [true, 0];
+}
+
+// Begrensde wachtrij met één schrijver: alles wat klaarstaat gaat in één append
+const queue = [];
+let draining = null;
+
+async function storeBatch(records) {
+    await appendFile(STORE, records.map(record => JSON.stringify(record) + '\n').join(''));
+}
+
+async function drain() {
+    while (queue.length) {
+        const batch = queue.splice(0, SETTINGS.batch_size);
+        try {
+            await storeBatch(batch.map(item => item.record));
+            batch.forEach(item => item.resolve());
+        } catch (error) {
+            batch.forEach(item => item.reject(error));
+        }
+    }
+    draining = null;
+}
+
+function enqueue(record) {
+    if (queue.length >= SETTINGS.queue_size) return null;
+    const done = new Promise((resolve, reject) => queue.push({ record, resolve, reject }));
+    draining ??= drain();
+    return done;
+}
+
+function validate(form) {
+    const record = {};
+    const errors = [];
+    for (const [field, limit] of Object.entries(SETTINGS.fields)) {
+        const value = String(form[field] ?? '').trim();
+        if (!value) {
+            if (SETTINGS.required.includes(field)) errors.push(`Het veld '${field}' is verplicht.`);
+            continue;
+        }
+        if (value.length > limit) errors.push(`Het veld '${field}' mag maximaal ${limit} tekens bevatten.`);
+        record[field] = value;
+    }
+    if (record.email && !EMAIL.test(record.email)) errors.push('Voer een geldig e-mailadres in.');
+    const message = (record.message || '').toLowerCase();
+    if (SETTINGS.spam_keywords.some(keyword => message.includes(keyword))
+            || (message.match(LINK) || []).length > SETTINGS.max_links) {
+        errors.push('Uw bericht werd gedetecteerd als spam.');
+    }
+    return [record, errors];
+}
+
+function parseForm(type, text) {
+    if (type.startsWith('application/x-www-form-urlencoded')) {
+        const form = {};
+        for (const [name, value] of new URLSearchParams(text)) {
+            if (!(name in form)) form[name] = value;
+        }
+        return form;
+    }
+    if (type.startsWith('application/json')) {
+        const data = JSON.parse(text || '{}');
+        return data && typeof data === 'object' && !Array.isArray(data) ? data : null;
+    }
+    return null;
+}
+
+const json = (status, body, headers = {}) => new Response(JSON.stringify(body), {
+    status,
+    headers: {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Cache-Control': 'no-store',
+        'X-Content-Type-Options': 'nosniff',
+        ...headers,
+    },
+});
+
+export default async (req, context) => {
+    if (req.method !== 'POST') return json(405, { error: 'Alleen POST.' }, { Allow: 'POST' });
+
+    const [allowed, retry] = allow(context.ip || 'onbekend');
+    if (!allowed) {
+        return json(429, { error: 'Te veel aanvragen. Probeer het later opnieuw.' },
+                    { 'Retry-After': String(Math.ceil(retry)) });
+    }
+
+    const text = await req.text();
+    if (Buffer.byteLength(text) > SETTINGS.max_body) {
+        return json(413, { error: `Maximaal ${SETTINGS.max_body} bytes.` });
+    }
+    let form;
+    try {
+        form = parseForm(req.headers.get('content-type') || '', text);
+    } catch {
+        return json(400, { error: 'Ongeldige JSON.' });
+    }
+    if (!form) return json(415, { error: 'Verstuur het formulier als urlencoded of JSON.' });
+    // Bots krijgen hetzelfde antwoord, maar er wordt niets opgeslagen
+    if (form[SETTINGS.honeypot]) return json(200, { success: true, message: THANKS });
+
+    const [record, errors] = validate(form);
+    if (errors.length) return json(422, { error: errors });
+
+    const done = enqueue({ received: Date.now() / 1000, client: context.ip, data: record });
+    if (!done) {
+        return json(503, { error: 'Het is even erg druk. Probeer het over enkele seconden opnieuw.' },
+                    { 'Retry-After': '5' });
+    }
+    try {
+        await done;
+    } catch {
+        return json(500, { error: 'Er is een probleem opgetreden. Probeer het opnieuw of bel ons direct.' });
+    }
+    return json(200, { success: true, message: THANKS });
+};
+
+export const config = { path: '/api/contact' };
@@ -0,0 +1,20 @@
+// Main JavaScript
+console.log('Website loaded successfully!');
+
+// Service Worker registratie
+if ('serviceWorker' in navigator) {
+    navigator.serviceWorker.register('/service-worker.js')
+        .then(reg => console.log('Service Worker geregistreerd'))
+        .catch(err => console.log('Service Worker registratie mislukt'));
+}
+
+// Smooth scrolling
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        const target = document.querySelector(this.getAttribute('href'));
+        if (target) {
+            target.scrollIntoView({ behavior: 'smooth' });
+        }
+    });
+});
@@ -0,0 +1,15 @@
+        function analyticsConsent() {
+            try { return localStorage.getItem('analytics-consent'); } catch (e) { return null; }
+        }
+        window.setAnalyticsConsent = function (granted) {
+            try { localStorage.setItem('analytics-consent', granted ? 'granted' : 'denied'); } catch (e) {}
+            gtag('consent', 'update', {analytics_storage: granted ? 'granted' : 'denied'});
+            document.querySelector('.consent-banner').hidden = true;
+            if (granted) loadAnalytics();
+        };
+        document.addEventListener('click', function (event) {
+            var button = event.target.closest('[data-analytics-consent]');
+            if (button) setAnalyticsConsent(button.dataset.analyticsConsent === 'granted');
+        });
+        if (analyticsConsent() === 'granted') setAnalyticsConsent(true);
+        else if (!analyticsConsent()) document.querySelector('.consent-banner').hidden = false;
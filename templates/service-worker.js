@@ -0,0 +1,71 @@
+// Service Worker voor Progressive Web App
+// Gegenereerd uit de output tree: precache en cache naam wijzigen per build
+const CACHE_PREFIX = '{{ cache_prefix }}';
+const CACHE_NAME = '{{ cache_name }}';
+const OFFLINE_URL = '{{ offline_url }}';
+const PRECACHE = {{ precache }};
+const ROUTES = {{ routes }};
+
+self.addEventListener('install', event => {
+  event.waitUntil(
+    caches.open(CACHE_NAME)
+      .then(cache => cache.addAll(PRECACHE.map(entry => new Request(entry.url, { cache: 'reload' }))))
+      .then(() => self.skipWaiting())
+  );
+});
+
+// Oude caches van vorige builds opruimen
+self.addEventListener('activate', event => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys
+        .filter(key => key.startsWith(CACHE_PREFIX) && key !== CACHE_NAME)
+        .map(key => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+function fetchAndCache(request) {
+  return fetch(request).then(response => {
+    if (response.ok) {
+      const copy = response.clone();
+      caches.open(CACHE_NAME).then(cache => cache.put(request, copy));
+    }
+    return response;
+  });
+}
+
+const STRATEGIES = {
+  'cache-first': request =>
+    caches.match(request).then(cached => cached || fetchAndCache(request)),
+  'network-first': request =>
+    fetchAndCache(request).catch(() => caches.match(request)),
+  'stale-while-revalidate': request =>
+    caches.match(request).then(cached => {
+      const network = fetchAndCache(request).catch(() => cached);
+      return cached || network;
+    }),
+  'network-only': request => fetch(request)
+};
+
+function strategyFor(url) {
+  const route = ROUTES.find(route => new RegExp(route.pattern).test(url.pathname));
+  return route ? route.strategy : 'network-first';
+}
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (request.method !== 'GET' || url.origin !== self.location.origin) {
+    return;
+  }
+
+  let response = STRATEGIES[strategyFor(url)](request);
+  if (request.mode === 'navigate') {
+    // Offline fallback voor navigaties
+    response = response
+      .then(result => result || caches.match(OFFLINE_URL))
+      .catch(() => caches.match(OFFLINE_URL));
+  }
+  event.respondWith(response.then(result => result || Response.error()));
+});
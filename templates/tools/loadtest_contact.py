@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Load test voor het contactformulier endpoint van {{ config.business_name }}
+"""
+Vuurt een piek formulier posts af en meet doorvoer, latency en status codes
+
+Zonder --url draait de asyncio handler uit api/contact als lokale stand-in in
+hetzelfde proces, met een tijdelijke store. Na afloop controleert het script
+dat elke geaccepteerde submission ook echt is opgeslagen. Met --burst,
+--queue-size en --batch-size zijn andere instellingen te proberen voordat ze
+in config['contact'] terechtkomen. Clients worden gesimuleerd met
+X-Forwarded-For, dat de handler alleen vanaf localhost accepteert.
+
+    python3 tools/loadtest_contact.py --requests 5000 --concurrency 200 --clients 2000
+    python3 tools/loadtest_contact.py --url http://127.0.0.1:{{ port }}/api/contact
+"""
+
+import re
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import importlib.util
+from pathlib import Path
+from collections import Counter
+from urllib.parse import urlencode, urlsplit
+
+HANDLER = Path(__file__).resolve().parent.parent / 'api' / 'contact' / 'handler.py'
+
+CONTENT_LENGTH = re.compile(rb'(?im)^content-length:\s*(\d+)')
+
+def load_handler():
+    spec = importlib.util.spec_from_file_location('contact_handler', HANDLER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def percentile(samples, pct):
+    """Nearest-rank percentiel"""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def form_body(index):
+    return urlencode({
+        'name': f'Bezoeker {index}',
+        'email': f'bezoeker{index}@example.com',
+        'message': f'Graag een offerte voor project {index}.',
+    }).encode('ascii')
+
+async def post(reader, writer, host, path, body, client):
+    """Eén POST over een keep-alive verbinding: (status, verbinding nog bruikbaar)"""
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/x-www-form-urlencoded\r\n"
+                  f"Content-Length: {len(body)}\r\nX-Forwarded-For: {client}\r\n\r\n")
+                 .encode('latin-1') + body)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = CONTENT_LENGTH.search(head)
+    await reader.readexactly(int(length.group(1)) if length else 0)
+    return int(head.split(b' ', 2)[1]), b'connection: close' not in head.lower()
+
+async def run_load(url, requests, concurrency, clients):
+    """Statuses, latencies en de totale duur van `requests` posts"""
+    target = urlsplit(url)
+    statuses, latencies = Counter(), []
+    counter = iter(range(requests))
+
+    async def worker():
+        reader = writer = None
+        for index in counter:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(target.hostname, target.port or 80)
+            client = index % clients
+            started = time.perf_counter()
+            try:
+                status, reusable = await post(reader, writer, target.netloc, target.path or '/', form_body(index),
+                                              f'10.{client >> 16 & 255}.{client >> 8 & 255}.{client & 255}')
+            except (ConnectionError, asyncio.IncompleteReadError):
+                status, reusable = 'verbinding', False
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+            if not reusable:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses, latencies, time.perf_counter() - started
+
+async def run_standin(args):
+    """Handler in dit proces met een tijdelijke store; geeft ook de opgeslagen aantallen"""
+    handler = load_handler()
+    settings = dict(handler.SETTINGS)
+    for key in ('burst', 'queue_size', 'batch_size'):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+
+    with tempfile.TemporaryDirectory(prefix='contact-loadtest-') as scratch:
+        store = handler.open_store(Path(scratch) / f'contact.{args.store}')
+        endpoint = handler.ContactEndpoint(store, settings)
+        server = await endpoint.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        result = await run_load(f'http://127.0.0.1:{port}{handler.ROUTE}',
+                                args.requests, args.concurrency, args.clients)
+        await endpoint.queue.join()
+        stored = store.count()
+        stats = dict(endpoint.stats)
+        await endpoint.stop()
+    return result, stored, stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test voor POST /api/contact')
+    parser.add_argument('--url', help='Bestaand endpoint; zonder: lokale stand-in')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=100, help='Gelijktijdige verbindingen')
+    parser.add_argument('--clients', type=int, default=1000, help='Verschillende client adressen')
+    parser.add_argument('--store', choices=['sqlite3', 'jsonl'], default='sqlite3', help='Store van de stand-in')
+    parser.add_argument('--burst', type=int, help='Token bucket capaciteit (stand-in)')
+    parser.add_argument('--queue-size', type=int, help='Wachtrij grootte (stand-in)')
+    parser.add_argument('--batch-size', type=int, help='Max records per batch (stand-in)')
+    args = parser.parse_args()
+
+    stored = stats = None
+    if args.url:
+        statuses, latencies, elapsed = asyncio.run(
+            run_load(args.url, args.requests, args.concurrency, args.clients))
+    else:
+        (statuses, latencies, elapsed), stored, stats = asyncio.run(run_standin(args))
+
+    print(f"📮 {args.requests} posts, {args.concurrency} verbindingen, {args.clients} clients: "
+          f"{args.requests / elapsed:.0f} req/s in {elapsed:.2f} s")
+    print(f"   latency p50 {percentile(latencies, 50) * 1000:.1f} ms  p90 {percentile(latencies, 90) * 1000:.1f} ms"
+          f"  p99 {percentile(latencies, 99) * 1000:.1f} ms")
+    print("   status " + '  '.join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)))
+    if stats is None:
+        return
+
+    print(f"   {stats['stored']} opgeslagen in {stats['batches']} batches "
+          f"(grootste {stats['largest_batch']}), wachtrij piek {stats['queue_peak']}")
+    if stored != statuses[200]:
+        print(f"   ❌ {statuses[200]} geaccepteerd maar {stored} in de store")
+        sys.exit(1)
+    print(f"   ✅ Elke geaccepteerde submission staat in de store")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import io
+import sys
+import contextlib
+from pathlib import Path
+
+import pytest
+
+# Tests importeren de generator als module vanuit de repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from final_python_generator import CompleteWebsiteGenerator
+
+# Zonder git en met een vaste datum: twee builds van dezelfde inputs zijn identiek
+TEST_CONFIG = {'git': 'skip', 'build_date': '2025-01-01'}
+
+@pytest.fixture
+def make_generator(tmp_path):
+    """Generator voor project 'site' onder base_path (standaard tmp_path), config over TEST_CONFIG"""
+    def make_generator(base_path=None, **config):
+        generator = CompleteWebsiteGenerator('site', tmp_path if base_path is None else base_path)
+        generator.config.update(TEST_CONFIG, **config)
+        return generator
+    return make_generator
+
+@pytest.fixture
+def run_build():
+    """Draait een volledige build zonder voortgang op stdout (standaard naar project_path)"""
+    def run_build(generator, sink=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.run_generator(sink)
+        return generator
+    return run_build
+
+@pytest.fixture
+def build(make_generator, run_build):
+    """build(base_path=None, **config): nieuwe generator, gebouwd"""
+    def build(base_path=None, **config):
+        return run_build(make_generator(base_path, **config))
+    return build
+
+@pytest.fixture
+def tree():
+    """{relatief pad: bytes} van alle bestanden onder root"""
+    def tree(root):
+        return {p.relative_to(root).as_posix(): p.read_bytes()
+                for p in sorted(Path(root).rglob('*')) if p.is_file()}
+    return tree
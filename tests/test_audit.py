@@ -0,0 +1,35 @@
+import sys
+import shutil
+import subprocess
+from pathlib import Path
+
+from final_python_generator import AUDIT_HISTORY
+
+GENERATOR = Path(__file__).resolve().parent.parent / 'final_python_generator.py'
+
+def cli(*args):
+    return subprocess.run([sys.executable, str(GENERATOR), *args], capture_output=True, text=True)
+
+def test_failed_budget_stays_failed_on_up_to_date_run(build):
+    first = build(budgets={'bytes': 100})
+    second = build(budgets={'bytes': 100})
+    
+    assert first.budget_violations
+    assert second.budget_violations == first.budget_violations
+
+def test_audit_dir_keeps_history_out_of_the_build(tmp_path, build):
+    dist = tmp_path / 'kopie' / 'dist'
+    shutil.copytree(build().project_path / 'dist', dist)
+    
+    result = cli('--audit-dir', str(dist), '--budget', 'bytes=100')
+    
+    assert result.returncode == 1
+    assert not (dist / AUDIT_HISTORY).exists()
+    assert (dist.parent / AUDIT_HISTORY).is_file()
+
+def test_non_numeric_budget_is_a_usage_error(tmp_path):
+    result = cli('--audit-dir', str(tmp_path), '--budget', 'bytes=abc')
+    
+    assert result.returncode == 2
+    assert "budget 'bytes' verwacht een geheel getal" in result.stderr
+    assert 'Traceback' not in result.stderr
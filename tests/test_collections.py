@@ -0,0 +1,20 @@
+import gzip
+import re
+
+def test_slugs_are_safe_and_unique(tmp_path, build):
+    items = tmp_path / 'items.csv'
+    items.write_text('title,slug\nFoo Bar,\nfoo-bar,\n!!!,\nOntsnapt,../../etc\nPaginering,page\nFoo Bar,\n',
+                     encoding='utf-8')
+    generator = build(collections=[{'name': 'items', 'source': str(items)}])
+    dist = generator.project_path / 'dist'
+    
+    details = sorted(p.parent.name for p in (dist / 'items').glob('*/index.html'))
+    assert details == ['3', 'etc', 'foo-bar', 'foo-bar-2', 'foo-bar-3', 'page-2']
+    assert not (dist / 'items' / 'index.html').read_text(encoding='utf-8').count('/items//')
+    assert not any(p for p in generator.project_path.parent.rglob('etc') if 'items' not in p.parts)
+    
+    listing = (dist / 'items' / 'index.html').read_text(encoding='utf-8')
+    assert len(set(re.findall(r'href="/items/([^"/]+)/"', listing))) == 6
+    sitemap = b''.join(gzip.decompress(p.read_bytes()) for p in dist.glob('sitemap-*.xml.gz')).decode('utf-8')
+    urls = re.findall(r'<loc>https://[^/]+(/items/[^<]*)</loc>', sitemap)
+    assert sorted(urls) == sorted(['/items/'] + [f'/items/{slug}/' for slug in details])
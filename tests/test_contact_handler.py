@@ -0,0 +1,104 @@
+import io
+import json
+import asyncio
+import contextlib
+import importlib.util
+
+import pytest
+
+from final_python_generator import CompleteWebsiteGenerator
+
+@pytest.fixture(scope='module')
+def handler(tmp_path_factory):
+    """api/contact/handler.py zoals de generator hem rendert"""
+    generator = CompleteWebsiteGenerator('site', tmp_path_factory.mktemp('site'))
+    generator.config['contact'] = {'burst': 3, 'refill_per_minute': 60}
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.create_contact_handler()
+    path = tmp_path_factory.mktemp('api') / 'handler.py'
+    path.write_text(generator.vfs.read_text('api/contact/handler.py'), encoding='utf-8')
+    spec = importlib.util.spec_from_file_location('contact_handler', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+VALID = {'name': 'Jan', 'email': 'jan@example.com', 'message': 'Graag een offerte.'}
+
+def test_settings_come_from_config(handler):
+    assert handler.SETTINGS['burst'] == 3
+    assert handler.SETTINGS['required'] == ['name', 'email', 'message']
+
+def test_validate_accepts_and_normalizes(handler):
+    record, errors = handler.validate(dict(VALID, name='  Jan  ', phone=''))
+    
+    assert errors == []
+    assert record == dict(VALID)
+
+@pytest.mark.parametrize('form, error', [
+    ({'email': 'jan@example.com', 'message': 'Hoi'}, "Het veld 'name' is verplicht."),
+    (dict(VALID, email='geen-adres'), 'Voer een geldig e-mailadres in.'),
+    (dict(VALID, name='x' * 101), "Het veld 'name' mag maximaal 100 tekens bevatten."),
+    (dict(VALID, message='FREE MONEY voor u'), 'Uw bericht werd gedetecteerd als spam.'),
+    (dict(VALID, message='http://a http://b https://c'), 'Uw bericht werd gedetecteerd als spam.'),
+])
+def test_validate_rejects(handler, form, error):
+    record, errors = handler.validate(form)
+    
+    assert error in errors
+
+def test_token_bucket_limits_and_refills(handler):
+    bucket = handler.TokenBucket(burst=2, rate=0.5, max_clients=10)
+    
+    assert bucket.allow('a', now=0) == (True, 0.0)
+    assert bucket.allow('a', now=0) == (True, 0.0)
+    allowed, retry = bucket.allow('a', now=0)
+    assert not allowed and retry == pytest.approx(2.0)
+    # Andere clients hebben hun eigen bucket
+    assert bucket.allow('b', now=0)[0]
+    assert bucket.allow('a', now=2)[0]
+    assert not bucket.allow('a', now=2)[0]
+
+def test_token_bucket_prunes_full_buckets(handler):
+    bucket = handler.TokenBucket(burst=1, rate=1.0, max_clients=2)
+    bucket.allow('a', now=0)
+    bucket.allow('b', now=0)
+    bucket.allow('c', now=5)
+    
+    assert set(bucket.buckets) == {'c'}
+    # Allemaal actief: niets op te ruimen, de grens schuift op
+    bucket.allow('d', now=5)
+    bucket.allow('e', now=5)
+    assert set(bucket.buckets) == {'c', 'd', 'e'} and bucket.limit == 6
+
+def test_endpoint_stores_valid_posts_and_rate_limits(handler, tmp_path):
+    async def run():
+        store = handler.open_store(tmp_path / 'contact.jsonl')
+        endpoint = handler.ContactEndpoint(store, handler.SETTINGS)
+        await endpoint.start('127.0.0.1', 0)
+        form = {'content-type': 'application/json'}
+        results = [
+            await endpoint.route('1.1.1.1', 'POST', handler.ROUTE, form, json.dumps(VALID).encode()),
+            await endpoint.route('1.1.1.1', 'POST', handler.ROUTE, form, b'{"name": "Jan"}'),
+            await endpoint.route('1.1.1.1', 'POST', handler.ROUTE, form,
+                                 json.dumps(dict(VALID, website_url='spam')).encode()),
+            await endpoint.route('1.1.1.1', 'POST', handler.ROUTE, form, json.dumps(VALID).encode()),
+            await endpoint.route('2.2.2.2', 'POST', handler.ROUTE, {'content-type': 'text/plain'}, b'x'),
+            await endpoint.route('2.2.2.2', 'GET', handler.ROUTE, {}, b''),
+        ]
+        await endpoint.stop()
+        return results, endpoint.stats
+    
+    results, stats = asyncio.run(run())
+    
+    assert [status for status, body, headers in results] == [200, 422, 200, 429, 415, 405]
+    assert results[3][2] == {'Retry-After': '1'}
+    lines = (tmp_path / 'contact.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['data'] for line in lines] == [VALID]
+    assert stats['honeypot'] == 1 and stats['rate_limited'] == 1 and stats['stored'] == 1
+
+def test_forwarded_for_only_trusted_from_localhost(handler):
+    endpoint = handler.ContactEndpoint(None, handler.SETTINGS)
+    headers = {'x-forwarded-for': '10.0.0.1, 10.0.0.2'}
+    
+    assert endpoint.client_key('127.0.0.1', headers) == '10.0.0.2'
+    assert endpoint.client_key('8.8.8.8', headers) == '8.8.8.8'
@@ -0,0 +1,22 @@
+import final_python_generator
+from final_python_generator import font_metadata
+
+def test_woff2_without_brotli_uses_the_filename(tmp_path, monkeypatch):
+    monkeypatch.setattr(final_python_generator, 'brotli', None)
+    font = tmp_path / 'Inter-SemiBoldItalic.woff2'
+    # Zou fontTools zonder brotli niet kunnen openen
+    font.write_bytes(b'wOF2' + b'\0' * 44)
+    
+    assert font_metadata(font) == {'family': 'Inter', 'weight': 600, 'style': 'italic'}
+
+def test_woff2_source_is_used_unchanged_without_brotli(tmp_path, monkeypatch, build):
+    monkeypatch.setattr(final_python_generator, 'brotli', None)
+    fonts = tmp_path / 'fonts'
+    fonts.mkdir()
+    (fonts / 'Inter-Regular.woff2').write_bytes(b'wOF2' + b'\0' * 44)
+    
+    generator = build(font_dir=str(fonts))
+    
+    [font] = generator.fonts
+    assert font['family'] == 'Inter' and font['weight'] == 400 and font['preload']
+    assert (generator.project_path / 'public' / font['url'].lstrip('/')).read_bytes().startswith(b'wOF2')
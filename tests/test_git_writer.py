@@ -0,0 +1,44 @@
+import shutil
+import subprocess
+
+import pytest
+
+from final_python_generator import GitWriter, gitignore_matcher
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git niet geïnstalleerd')
+
+def git(root, *args):
+    return subprocess.run(['git', '-C', str(root), *args], check=True, capture_output=True, text=True).stdout
+
+def test_written_repository_passes_fsck(tmp_path):
+    # Namen waarvoor git's tree volgorde afwijkt van een gewone sortering
+    for path in ('a.txt', 'a/b.txt', 'a-b/c.txt', 'ab', 'run.sh'):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(path, encoding='utf-8')
+    (tmp_path / 'run.sh').chmod(0o755)
+    writer = GitWriter(tmp_path)
+    writer.init()
+    entries = writer.add_all(gitignore_matcher(''))
+    writer.write_index(entries)
+    tree = writer.write_tree({path: (mode, sha) for path, (mode, sha, _) in entries.items()})
+    first = writer.commit(tree, 'eerste', 'Test <test@example.com>', 1700000000)
+    
+    (tmp_path / 'a' / 'b.txt').write_text('gewijzigd', encoding='utf-8')
+    entries = writer.add_all(gitignore_matcher(''))
+    writer.write_index(entries)
+    tree = writer.write_tree({path: (mode, sha) for path, (mode, sha, _) in entries.items()})
+    second = writer.commit(tree, 'tweede', 'Test <test@example.com>', 1700000060)
+    
+    git(tmp_path, 'fsck', '--strict', '--full', '--no-dangling')
+    assert git(tmp_path, 'rev-parse', 'HEAD').strip() == second
+    assert git(tmp_path, 'rev-parse', 'HEAD^').strip() == first
+    assert git(tmp_path, 'status', '--porcelain') == ''
+    assert '100755 blob' in git(tmp_path, 'ls-tree', 'HEAD', 'run.sh')
+    assert writer.commit(tree, 'niets', 'Test <test@example.com>', 1700000120) is None
+
+def test_generated_project_repository_passes_fsck(build):
+    root = build(git='commit').project_path
+    
+    git(root, 'fsck', '--strict', '--full', '--no-dangling')
+    assert git(root, 'status', '--porcelain') == ''
+    assert git(root, 'log', '--format=%s') == 'feat: initial project setup\n'
@@ -0,0 +1,32 @@
+import pytest
+from PIL import Image
+
+from final_python_generator import DictSink, picture_markup
+
+@pytest.fixture
+def images(tmp_path):
+    directory = tmp_path / 'images'
+    directory.mkdir()
+    Image.new('RGB', (500, 300), 'red').save(directory / 'rood.png')
+    return directory
+
+def test_unwritable_formats_fall_back_to_jpeg(images, build):
+    generator = build(image_dir=str(images), image_formats=['heic'], hero_image='rood.png')
+    [meta] = generator.images.values()
+    
+    assert {variant['format'] for variant in meta['variants']} == {'jpeg'}
+    assert '<img src="/assets/images/rood-500.' in picture_markup(meta)
+
+def test_dict_sink_build_leaves_project_path_alone(tmp_path, images, make_generator, run_build):
+    generator = make_generator(image_dir=str(images), image_formats=['jpeg'])
+    sink = DictSink()
+    run_build(generator, sink)
+    
+    assert any(path.startswith('public/assets/images/rood-') for path in sink.files)
+    assert not generator.project_path.exists()
+
+def test_cache_dir_option_moves_the_cache(tmp_path, images, build):
+    generator = build(image_dir=str(images), image_formats=['jpeg'], cache_dir=str(tmp_path / 'cache'))
+    
+    assert list((tmp_path / 'cache' / 'images').glob('*.json'))
+    assert not (generator.project_path / '.cache' / 'images').exists()
@@ -0,0 +1,68 @@
+import io
+import shutil
+import contextlib
+
+from PIL import Image
+
+from final_python_generator import TEMPLATE_DIR
+
+def collection_config(theme, items):
+    return {
+        'theme_dir': str(theme),
+        'workers': 1,
+        'collections': [{'name': 'items', 'source': str(items), 'per_page': 2}],
+    }
+
+def test_incremental_build_matches_fresh_build(tmp_path, build, tree):
+    theme = tmp_path / 'theme'
+    theme.mkdir()
+    items = tmp_path / 'items.csv'
+    items.write_text('title,description\nEen,a\nTwee,b\nDrie,c\nVier,d\n', encoding='utf-8')
+    build(tmp_path / 'incremental', **collection_config(theme, items))
+    
+    # Inputs wijzigen: andere CSS (nieuwe asset hash) en een record minder
+    css = (TEMPLATE_DIR / 'main.css').read_text(encoding='utf-8')
+    (theme / 'main.css').write_text(css.replace('#ddd', '#ccc'), encoding='utf-8')
+    items.write_text('title,description\nEen,a\nTwee,b\nDrie,c\n', encoding='utf-8')
+    incremental = build(tmp_path / 'incremental', **collection_config(theme, items)).project_path
+    fresh = build(tmp_path / 'fresh', **collection_config(theme, items)).project_path
+    
+    incremental_files, fresh_files = tree(incremental), tree(fresh)
+    assert sorted(incremental_files) == sorted(fresh_files)
+    assert incremental_files == fresh_files
+    assert not (incremental / 'dist' / 'items' / 'vier').exists()
+
+def test_unchanged_inputs_keep_outputs(tmp_path, build, tree):
+    theme = tmp_path / 'theme'
+    theme.mkdir()
+    items = tmp_path / 'items.csv'
+    items.write_text('title\nEen\n', encoding='utf-8')
+    first = tree(build(**collection_config(theme, items)).project_path)
+    shutil.rmtree(tmp_path / 'site' / 'dist' / 'items')
+    # Ontbrekende output: geen fast path, maar dezelfde boom als eerst
+    assert tree(build(**collection_config(theme, items)).project_path) == first
+
+def test_hand_edited_output_of_same_size_is_restored(tmp_path, build, tree):
+    first = tree(build().project_path)
+    index = tmp_path / 'site' / 'dist' / 'index.html'
+    original = index.read_bytes()
+    index.write_bytes(original.replace(b'<html', b'<HTML', 1))
+    assert index.stat().st_size == len(original)
+    
+    # Zelfde grootte, andere inhoud: geen fast path en het bestand wordt herschreven
+    assert tree(build().project_path) == first
+
+def test_full_rebuild_drops_outputs_of_removed_sources(tmp_path, build, tree):
+    images = tmp_path / 'images'
+    images.mkdir()
+    Image.new('RGB', (500, 300), 'red').save(images / 'rood.png')
+    generator = build(image_dir=str(images), image_formats=['jpeg'], workers=1)
+    dist = generator.project_path / 'dist'
+    assert list(dist.glob('assets/images/rood-*.jpg'))
+    
+    (images / 'rood.png').unlink()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.rebuild(None)
+    
+    assert not list(generator.project_path.rglob('rood-*'))
+    assert tree(dist) == tree(build(tmp_path / 'fresh', image_dir=str(images), workers=1).project_path / 'dist')
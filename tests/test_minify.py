@@ -0,0 +1,25 @@
+from final_python_generator import minify_css, minify_js
+
+def test_division_after_postfix_increment_is_not_a_regex():
+    assert minify_js('var half = count++ / 2 + total / 4;') == 'var half=count++/2+total/4;\n'
+    assert minify_js('var rest = left-- / 3;  // / geen regex') == 'var rest=left--/3;\n'
+
+def test_regex_literals_stay_untouched():
+    source = 'var r = /[/] \\/ x/g.test(s); // c / d\nreturn /a b/.test(y)'
+    
+    assert minify_js(source) == 'var r=/[/] \\/ x/g.test(s);\nreturn/a b/.test(y)\n'
+
+def test_strings_templates_and_unary_operators_survive():
+    source = 'let t = `a  /* blijft */  b`;\nx = a - -b + +c;\ns = "// geen commentaar";'
+    
+    assert minify_js(source) == 'let t=`a  /* blijft */  b`;\nx=a- -b+ +c;\ns="// geen commentaar";\n'
+
+def test_minify_js_keeps_newlines_for_asi():
+    assert minify_js('a = b\n(function () {})()') == 'a=b\n(function(){})()\n'
+
+def test_minify_css_edge_cases():
+    source = ('/* kop */\n.a  >  .b , .c {\n  content: "/* geen commentaar */";\n  margin: 0 auto ;\n}\n'
+              '@media screen and (min-width: 40em) {\n  .a :hover { color: red; }\n}\n.d::before{content:"  "}')
+    
+    assert minify_css(source) == ('.a>.b,.c{content:"/* geen commentaar */";margin:0 auto}'
+                                  '@media screen and (min-width:40em){.a :hover{color:red}}.d::before{content:"  "}')
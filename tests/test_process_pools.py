@@ -0,0 +1,35 @@
+import threading
+
+from PIL import Image
+
+from final_python_generator import process_pool
+
+def test_process_pool_does_not_fork():
+    with process_pool(1) as pool:
+        assert pool._mp_context.get_start_method() in ('forkserver', 'spawn')
+
+def test_parallel_build_matches_serial_build(tmp_path, build, tree):
+    images = tmp_path / 'images'
+    images.mkdir()
+    for name, color in (('rood', 'red'), ('blauw', 'blue')):
+        Image.new('RGB', (900, 600), color).save(images / f'{name}.png')
+    items = tmp_path / 'items.csv'
+    items.write_text('title\n' + ''.join(f'Item {i}\n' for i in range(150)), encoding='utf-8')
+    config = {
+        'image_dir': str(images),
+        'image_formats': ['jpeg'],
+        'collections': [{'name': 'items', 'source': str(items), 'per_page': 10}],
+    }
+    
+    # Een extra thread zoals de live reload server in --watch
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait, daemon=True)
+    thread.start()
+    try:
+        parallel = tree(build(tmp_path / 'parallel', workers=2, **config).project_path / 'dist')
+    finally:
+        stop.set()
+    serial = tree(build(tmp_path / 'serial', workers=1, **config).project_path / 'dist')
+    
+    assert any(name.startswith('assets/images/rood-') for name in parallel)
+    assert parallel == serial
@@ -0,0 +1,25 @@
+def flush_record(report):
+    return next(record for record in report['steps'] if record['name'] == 'flush')
+
+def test_flush_step_counts_sink_writes(build):
+    generator = build()
+    report = generator.profile_report()
+    flush = flush_record(report)
+    
+    assert flush['files_written'] > 0
+    assert flush['bytes_written'] > 0
+    assert flush['files_written'] <= report['sink']['files_written']
+    assert report['total']['files_written'] >= flush['files_written']
+
+def test_flush_step_skips_unchanged_files(build):
+    generator = build()
+    generator.rebuild()
+    report = generator.profile_report()
+    
+    assert flush_record(report)['files_written'] == 0
+    assert report['total']['files_written'] > 0
+
+def test_steps_report_rss_growth_not_process_maximum(build):
+    for record in build().profile_report()['steps']:
+        assert 'max_rss_kb' not in record
+        assert record['rss_growth_kb'] is None or record['rss_growth_kb'] >= 0
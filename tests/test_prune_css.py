@@ -0,0 +1,55 @@
+from collections import Counter
+
+from final_python_generator import (PRUNE_KEEP_AT, filter_css, parse_css, prune_stylesheets, safelist_tokens,
+                                    serialize_css)
+
+CSS = ('.card{color:red}.lazy{opacity:0}.card .title,.unused{margin:0}'
+       '@media (min-width:40em){.card{padding:1em}.unused{padding:0}}'
+       '@font-face{font-family:x}@keyframes fade{to{opacity:1}}')
+
+def test_filter_css_keeps_safelisted_runtime_classes():
+    used = frozenset({'.card', '.title'} | safelist_tokens({'lazy'}))
+    
+    kept = serialize_css(filter_css(parse_css(CSS), used, PRUNE_KEEP_AT))
+    
+    assert '.lazy{opacity:0}' in kept
+    assert '.card .title{margin:0}' in kept
+    assert '@media (min-width:40em){.card{padding:1em}}' in kept
+    assert '@font-face{font-family:x}' in kept and '@keyframes fade' in kept
+    assert '.unused' not in kept
+
+def test_filter_css_drops_unlisted_runtime_classes():
+    kept = serialize_css(filter_css(parse_css(CSS), frozenset({'.card'})))
+    
+    assert '.lazy' not in kept and '.title' not in kept
+    assert '@keyframes' not in kept
+
+def test_prune_stylesheets_shares_copies_between_pages():
+    stylesheets = {'/main.0123456789.css': CSS}
+    pruned = {}
+    page = '<link rel="stylesheet" href="/main.0123456789.css"><div class="card">{}</div>'
+    
+    first = prune_stylesheets(page.format('Een'), stylesheets, frozenset(), pruned)
+    second = prune_stylesheets(page.format('Twee'), stylesheets, frozenset(), pruned)
+    
+    [(href, (source, css))] = pruned.items()
+    assert source == '/main.0123456789.css' and f'href="{href}"' in first and f'href="{href}"' in second
+    assert '.card{color:red}' in css and '.unused' not in css
+
+def test_parallel_collection_writes_each_stylesheet_once(tmp_path, make_generator, run_build):
+    items = tmp_path / 'items.csv'
+    items.write_text('title\n' + ''.join(f'Item {i}\n' for i in range(150)), encoding='utf-8')
+    generator = make_generator(workers=4, collections=[{'name': 'items', 'source': str(items), 'per_page': 10}])
+    writes = Counter()
+    write_file = generator.write_file
+    
+    def counting_write_file(relative_path, content):
+        writes[relative_path] += 1
+        return write_file(relative_path, content)
+    
+    generator.write_file = counting_write_file
+    run_build(generator)
+    
+    assert any(path.endswith('.css') and path.count('.') == 3 for path in writes)
+    assert [path for path, count in writes.items() if count > 1] == []
+    assert sum(writes.values()) == len(generator.outputs)
@@ -0,0 +1,33 @@
+import pytest
+
+from final_python_generator import add_resource_hints
+
+@pytest.fixture
+def build_index(build):
+    def build_index(mode):
+        generator = build(ga_tracking_id='G-TEST', analytics_mode=mode)
+        return (generator.project_path / 'dist' / 'index.html').read_text(encoding='utf-8')
+    return build_index
+
+@pytest.mark.parametrize('mode', ['consent', 'idle', 'interaction'])
+def test_deferred_analytics_emit_no_third_party_hint(build_index, mode):
+    html = build_index(mode)
+    
+    assert 'googletagmanager.com/gtag/js' in html
+    assert 'rel="preconnect" href="https://www.googletagmanager.com"' not in html
+    assert 'rel="dns-prefetch" href="https://www.googletagmanager.com"' not in html
+
+def test_eager_analytics_keep_preconnect(build_index):
+    html = build_index('eager')
+    
+    assert 'rel="preconnect" href="https://www.googletagmanager.com"' in html
+
+def test_deferred_loader_origin_still_counts_when_used_eagerly():
+    document = ('<html><head><title>t</title>'
+                '<script src="https://cdn.example.com/app.js"></script></head><body>'
+                '<script data-deferred>load("https://cdn.example.com/late.js");'
+                'load("https://late.example.com/x.js")</script></body></html>')
+    html = add_resource_hints(document, '/')
+    
+    assert '<link rel="preconnect" href="https://cdn.example.com">' in html
+    assert 'late.example.com"' not in html.split('</title>', 1)[1].split('<script', 1)[0]
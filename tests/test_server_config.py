@@ -0,0 +1,35 @@
+import re
+
+import pytest
+
+from final_python_generator import CompleteWebsiteGenerator
+
+def test_standalone_check_leaves_asset_map_alone(tmp_path, build):
+    build()
+    
+    # Zoals --check-config: nieuwe generator zonder build
+    checker = CompleteWebsiteGenerator('site', tmp_path)
+    
+    assert checker.check_server_config() == []
+    assert checker.asset_map == {}
+    assert checker.check_server_config() == []
+
+def linked_stylesheets(dist):
+    return {href for page in dist.rglob('*.html')
+            for href in re.findall(r'<link rel="stylesheet" href="([^"]+)"', page.read_text(encoding='utf-8'))}
+
+def preloaded(root):
+    texts = [(root / name).read_text(encoding='utf-8') for name in ('netlify.toml', 'public/.htaccess',
+                                                                     'config/nginx.conf')]
+    return [set(re.findall(r'<([^>]+)>; rel=preload; as=style', text)) for text in texts]
+
+@pytest.mark.parametrize('prune_css', [True, False])
+def test_link_header_only_preloads_linked_stylesheets(tmp_path, build, prune_css):
+    items = tmp_path / 'items.csv'
+    items.write_text('title\nEen\nTwee\n', encoding='utf-8')
+    root = build(prune_css=prune_css, collections=[{'name': 'items', 'source': str(items)}]).project_path
+    linked = linked_stylesheets(root / 'dist')
+    
+    for hrefs in preloaded(root):
+        assert hrefs <= linked
+        assert bool(hrefs) == (not prune_css)
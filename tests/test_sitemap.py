@@ -0,0 +1,64 @@
+import io
+import gzip
+import xml.etree.ElementTree as ET
+
+from final_python_generator import SitemapWriter
+
+NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+class ShardFile(io.BytesIO):
+    def __init__(self, files, name):
+        super().__init__()
+        self.files = files
+        self.name = name
+    
+    def close(self):
+        self.files[self.name] = gzip.decompress(self.getvalue())
+        super().close()
+
+def write_sitemap(count, **limits):
+    files = {}
+    writer = SitemapWriter('https://example.com/', lambda name: ShardFile(files, name), **limits)
+    for i in range(count):
+        writer.add(f'/pagina-{i}/', lastmod=f'2025-01-{i % 28 + 1:02d}')
+    index = writer.close()
+    return files, index
+
+def locs(data):
+    return [loc.text for loc in ET.fromstring(data).iter(f'{NS}loc')]
+
+def test_shards_split_exactly_at_max_urls():
+    files, index = write_sitemap(7, max_urls=3)
+    
+    assert list(files) == ['sitemap-1.xml.gz', 'sitemap-2.xml.gz', 'sitemap-3.xml.gz']
+    assert [len(locs(files[name])) for name in files] == [3, 3, 1]
+    assert locs(index) == [f'https://example.com/{name}' for name in files]
+    assert sum((locs(data) for data in files.values()), []) == [f'https://example.com/pagina-{i}/'
+                                                                 for i in range(7)]
+
+def test_full_last_shard_opens_no_empty_shard():
+    files, index = write_sitemap(6, max_urls=3)
+    
+    assert [len(locs(files[name])) for name in files] == [3, 3]
+    assert len(locs(index)) == 2
+
+def test_no_urls_means_no_shards():
+    files, index = write_sitemap(0)
+    
+    assert files == {}
+    assert locs(index) == []
+
+def test_shards_stay_within_max_bytes():
+    entry = len('  <url>\n    <loc>https://example.com/pagina-0/</loc>\n'
+                '    <lastmod>2025-01-01</lastmod>\n  </url>\n')
+    limit = len(SitemapWriter.HEADER) + 2 * entry + len(SitemapWriter.FOOTER)
+    files, index = write_sitemap(5, max_bytes=limit)
+    
+    assert [len(locs(files[name])) for name in files] == [2, 2, 1]
+    assert all(len(data) <= limit for data in files.values())
+
+def test_index_lastmod_is_newest_per_shard():
+    files, index = write_sitemap(5, max_urls=2)
+    
+    lastmods = [lastmod.text for lastmod in ET.fromstring(index).iter(f'{NS}lastmod')]
+    assert lastmods == ['2025-01-02', '2025-01-04', '2025-01-05']
@@ -0,0 +1,23 @@
+from final_python_generator import TemplateRegistry, TEMPLATE_DIR
+
+def test_template_names_skip_caches_and_binaries(tmp_path):
+    (tmp_path / 'page.html').write_text('<p>{{ project_name }}</p>', encoding='utf-8')
+    (tmp_path / 'gitignore').write_text('dist/\n', encoding='utf-8')
+    (tmp_path / 'api' / '__pycache__').mkdir(parents=True)
+    (tmp_path / 'api' / '__pycache__' / 'handler.cpython-311.pyc').write_bytes(b'\x00\xff\xfe')
+    (tmp_path / '.DS_Store').write_bytes(b'\x00\x01')
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG\r\n')
+    
+    names = TemplateRegistry(tmp_path).template_names()
+    
+    assert {'page.html', 'gitignore'} <= names
+    assert not any('__pycache__' in name or name.startswith('.') or name.endswith('.png') for name in names)
+
+def test_fingerprint_ignores_pycache_next_to_templates(tmp_path):
+    (tmp_path / '__pycache__').mkdir()
+    (tmp_path / '__pycache__' / 'x.pyc').write_bytes(b'\xff' * 16)
+    registry = TemplateRegistry(tmp_path)
+    # Zou met een .pyc in de lijst een UnicodeDecodeError geven
+    assert len(registry.fingerprint(registry.template_names())) == 64
+    assert 'index.html' in registry.template_names()
+    assert TEMPLATE_DIR in registry.search_path
@@ -0,0 +1,76 @@
+import html
+
+from final_python_generator import HtmlTransform, LazyImages, PageTokens, transform_html
+
+class Recorder(HtmlTransform):
+    """Onthoudt per start tag de namen van de open voorouders"""
+    
+    def __init__(self):
+        super().__init__({})
+        self.stacks = {}
+    
+    def start_tag(self, tag, stack):
+        self.stacks.setdefault(tag.get('id', tag.name), [parent.name for parent in stack])
+
+def lazy(document):
+    return transform_html(document, [LazyImages({'config': {'eager_images': 0}})])
+
+def test_untouched_tags_pass_through_byte_for_byte():
+    document = ('<!DOCTYPE html>\n<html lang=nl><HEAD><meta  charset = "utf-8" >'
+                "<link rel='stylesheet' href=/a.css></HEAD><body data-x = 'a&amp;b' >"
+                '<!-- <img src=c.jpg> --><p>tekst &amp; meer<br/></p></body></html>')
+    
+    assert transform_html(document, [Recorder()]) == document
+    assert lazy(document) == document
+
+def test_rewritten_attributes_round_trip_entities():
+    document = '<p><img src="a.jpg?x=1&amp;y=2" alt="Tom &amp; &quot;Jerry&quot; &lt;3"></p>'
+    result = lazy(document)
+    
+    assert 'loading="lazy"' in result
+    assert 'src="a.jpg?x=1&amp;y=2"' in result
+    assert 'alt="Tom &amp; &quot;Jerry&quot; &lt;3"' in result
+    assert html.unescape(result).count('Tom & "Jerry" <3') == 1
+
+def test_raw_text_elements_are_not_tokenized():
+    document = ('<script>if (a<b) document.write("<img src=x.jpg>")</script>'
+                '<style>a::after{content:"<img>"}</style>'
+                '<textarea><img src=y.jpg></textarea><pre><img src=z.jpg></pre>')
+    recorder = Recorder()
+    
+    assert lazy(document) == document
+    assert transform_html(document, [recorder]) == document
+    assert 'img' not in recorder.stacks
+
+def test_unbalanced_end_tags_are_ignored():
+    document = ('</div></span><header id=header><nav id=nav></div></span></nav></header>'
+                '<main id=main><p id=text></p></main></section>')
+    recorder = Recorder()
+    
+    assert transform_html(document, [recorder]) == document
+    assert recorder.stacks['nav'] == ['header']
+    assert recorder.stacks['main'] == []
+    assert recorder.stacks['text'] == ['main']
+
+def test_optional_end_tags_close_implicitly():
+    items = ''.join(f'<li>item {n}<p>tekst' for n in range(40))
+    document = (f'<header><ul>{items}</ul><dl><dt>a<dd>b<dt id=term>c</dl></header>'
+                '<table><tr><td>1<td id=cell>2<tr id=row><td>3</table>'
+                '<main id=main><p class="body-copy">inhoud</main>')
+    recorder = Recorder()
+    transform_html(document, [recorder])
+    
+    assert recorder.stacks['term'] == ['header', 'dl']
+    assert recorder.stacks['cell'] == ['table', 'tr']
+    assert recorder.stacks['row'] == ['table']
+    assert recorder.stacks['main'] == []
+
+def test_critical_tokens_stop_after_deeply_unclosed_header():
+    items = ''.join(f'<li class="nav-item">item {n}' for n in range(20))
+    document = f'<header><ul>{items}</ul></header><main><p class="body-copy">inhoud</p></main>'
+    tokens = PageTokens({'config': {'critical_selectors': ['header']}})
+    transform_html(document, [tokens])
+    
+    assert '.nav-item' in tokens.critical
+    assert '.body-copy' in tokens.tokens
+    assert '.body-copy' not in tokens.critical